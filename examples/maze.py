@@ -57,7 +57,7 @@ def ai_path(start, maze):
 	# traverse the maze, using selector() as your heuristic
 	for node in maze.heuristic_traversal(start, selector):
 		# take all the steps between dead ends
-		distance += maze.get_shortest_paths(previous)[node][0]
+		distance += maze.get_shortest_path(previous, node)[0]
 		# and end if you're at the end
 		if node.name == "END": return distance
 		previous = node
@@ -288,6 +288,24 @@ And for edges:
 	...
 	Edge(name=CA)
 
+Searches scan every element unless an index has been created for
+one of the attributes being searched on. Indexes are kept up to
+date as elements are added, removed and modified:
+
+	>>> G.create_index("edges", "weight", ordered=True)
+	>>> for edge in G.search_range("edges", "weight", 5, 10):
+	... 	print(edge)
+
+Conditions other than equality are written with where(), and can
+be combined with & (and), | (or) and ~ (not). Graph.query returns
+the search itself, which can be limited and will explain how it
+is going to use the indexes:
+
+	>>> for edge in G.query("edges", (where("weight") > 5) | (where("color") == "red")):
+	... 	print(edge)
+	>>> G.query("edges", where("weight") > 5).limit(10).explain()
+	'index lookup on weight > 5, filter on weight > 5, limit 10'
+
 In addition to the datawise and unordered views of graphs,
 several methods for ordering based on structural properties
 are provided. The most important of these are traversals
@@ -341,6 +359,13 @@ And traverse the graph:
 	Node(name=C)
 	Node(name=B)
 
+Since sorting the whole frontier at every step is slow, when
+the choice can be expressed as a key, priority_traversal keeps
+the frontier in a heap instead and visits the lowest key first:
+
+	>>> for node in G.priority_traversal("A", lambda n: -get_popularity(n)):
+	>>> 	print(node)
+
 Note, again, that names and elements can be used interchangably.
 
 In contrast to the traversals, walks can visit a node or edge
@@ -391,11 +416,25 @@ of the given graph.
 verticies.
 
 .get_strongly_connected() returns a list of sets of strongly
-connected components.
+connected components, and .strongly_connected_traversal() yields
+them one at a time as they are found.
+
+.get_shortest_paths(source) returns a ShortestPathTree, which
+maps nodes to a (length, [path]) pair, where path is a sequence of
+edges connecting the given endpoints.
 
-.get_shortest_paths(source) returns a mapping of nodes to
-a (length, [path]) pair, where path is a sequence of edges
-connecting the given endpoints.
+Storage Backends
+----------------
+
+By default, every Node and Edge is a full Python object. For very
+large graphs, a compact backend that interns names to integer ids
+and keeps the structure in arrays can be selected instead:
+
+	>>> big = Graph(backend="compact")
+
+Compact graphs hand out lightweight Node and Edge views that are
+created on demand; they support the same API as the default ones,
+but two views of the same element need not be the same object.
 
 Binary Graph Operations
 -----------------------
@@ -439,17 +478,144 @@ individual docstrings.
 # along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
 
 
-from collections import deque, namedtuple, defaultdict
+from collections import deque, namedtuple, defaultdict, OrderedDict
+from array import array
 import heapq
-import copy
-from itertools import chain, count
+import bisect
+import gc
+import sys
+import weakref
+from contextlib import contextmanager
+from itertools import chain, count, islice
+
+# marks absent attribute values
+_missing = object()
+
+@contextmanager
+def _bulk():
+	"""Pauses the cyclic garbage collector while many elements are created.
+
+	Every new element would otherwise count towards the next collection,
+	and repeated full collections come to dominate bulk construction.
+	"""
+	enabled = gc.isenabled()
+	gc.disable()
+	try: yield
+	finally:
+		if enabled: gc.enable()
+
+def _shared_names(a, b):
+	"""Returns the names in both of the given name-keyed mappings.
 
-class GraphElement:
+	Only the smaller of the two is walked.
+	"""
+	if len(b) < len(a): a, b = b, a
+	return [name for name in a if name in b]
+
+def _same_ends(a, b):
+	"""Returns True if the two edges join the same nodes the same way."""
+	return (a._start._name == b._start._name and a._end._name == b._end._name
+		and bool(a._directed) == bool(b._directed))
+
+def _undo_attribute(element, name, old):
+	"""Returns a callable giving the element's attribute its old value back.
+
+	old may be _missing, for attributes that didn't exist.
+	"""
+	def undo():
+		if old is _missing: delattr(element, name)
+		else: setattr(element, name, old)
+	return undo
+
+def _replace_data(element, data):
+	"""Gives the element exactly the given data attributes."""
+	current = element.data
+	for key in [key for key in current if key not in data]:
+		delattr(element, key)
+	for key, value in data.items():
+		if current.get(key, _missing) is not value:
+			setattr(element, key, value)
+
+# read-only view of an element's data attributes
+try:
+	from types import MappingProxyType as DataView
+except ImportError:
+	from collections import Mapping
+
+	class DataView(Mapping):
+		"""Read-only view of a dictionary, for Pythons without MappingProxyType."""
+
+		__slots__ = ("_mapping",)
+
+		def __init__(self, mapping):
+			self._mapping = mapping
+
+		def __getitem__(self, key):
+			return self._mapping[key]
+
+		def __iter__(self):
+			return iter(self._mapping)
+
+		def __len__(self):
+			return len(self._mapping)
+
+		def __repr__(self):
+			return "DataView(%r)" % (self._mapping,)
+
+# shared by every element without data attributes, and never modified
+_no_data = {}
+
+# insertion-ordered mapping used for adjacency tracking. Plain dicts
+# preserve insertion order from Python 3.7 onwards and are much
+# lighter than OrderedDict.
+if sys.version_info >= (3, 7):
+	AdjacencyDict = dict
+else:
+	AdjacencyDict = OrderedDict
+
+# the adjacency mapping shared by nodes with no edges of a given kind
+_no_edges = AdjacencyDict()
+
+# a node's adjacency slot holds _no_edges, a single edge kept inline, or
+# once a second edge is linked, a mapping of edge names to edges. Most
+# nodes of sparse graphs never need a mapping, which would cost them
+# several times as much as the edge itself.
+
+def _slot_edges(slot):
+	"""Returns the edges held in one of a node's adjacency slots."""
+	if isinstance(slot, Edge): return (slot,)
+	return slot.values()
+
+def _slot_len(slot):
+	"""Returns the number of edges held in one of a node's adjacency slots."""
+	if isinstance(slot, Edge): return 1
+	return len(slot)
+
+def _slot_add(slot, edge):
+	"""Returns the contents of an adjacency slot once edge is added to it."""
+	if slot is _no_edges: return edge
+	if isinstance(slot, Edge): slot = AdjacencyDict(((slot._name, slot),))
+	slot[edge._name] = edge
+	return slot
+
+def _slot_remove(slot, name):
+	"""Returns the contents of an adjacency slot once the named edge is removed from it."""
+	if isinstance(slot, Edge): return _no_edges
+	del slot[name]
+	return slot
+
+class GraphElement(object):
 	"""Base class for Nodes and Edges.
 
 	A GraphElement.data property is provided to give easier
 	access to all of the element's non-structural member
-	variables. It returns a dictionary.
+	variables. It returns a read-only mapping.
+
+	Elements keep their structure in slots, and their data attributes
+	in a dictionary that is only allocated once the first one is set.
+	Elements have no instance dictionary or weak reference slot, which
+	together would cost nearly half again as much as the rest of a bare
+	element, so data attributes are looked up by __getattr__.
 
 	In addition, a GraphElement.name property is provided
 	to allow property access to the object's name.
@@ -460,6 +626,11 @@ class GraphElement:
 	Graph elements compare based on names.
 	"""
 
+	# _graph is the graph the element belongs to, if any, _attributes
+	# holds its data attributes, or is None until it has some, and
+	# _private holds any private attributes, once one is set
+	__slots__ = ("_name", "_graph", "_attributes", "_private")
+
 	def __repr__(self):
 		"""Pretty prints this element."""
 		classname = type(self).__name__
@@ -472,6 +643,65 @@ class GraphElement:
 		"""Arbitrary comparison for sorting."""
 		return id(self) < id(other)
 
+	def __getattr__(self, name):
+		"""Looks up data attributes, and private ones, which are kept apart."""
+		if name[0] != "_":
+			attributes = self._attributes
+			if attributes is not None and name in attributes: return attributes[name]
+		elif name != "_private":
+			private = getattr(self, "_private", None)
+			if private is not None and name in private: return private[name]
+		raise AttributeError("%s has no attribute %s" % (type(self).__name__, name))
+
+	def __setattr__(self, name, value):
+		"""Sets an attribute, keeping its graph's indexes up to date."""
+		# structure, and anything the class defines, such as properties
+		if hasattr(type(self), name):
+			object.__setattr__(self, name, value)
+			return
+		if name[0] == "_":
+			private = getattr(self, "_private", None)
+			if private is None:
+				private = {}
+				_set_private(self, private)
+			private[name] = value
+			return
+		graph = self._graph
+		if graph is not None and graph._sharing is not None:
+			graph._write()
+		attributes = self._attributes
+		if attributes is None:
+			attributes = {}
+			_set_attributes(self, attributes)
+		if graph is not None and graph._journal is not None:
+			graph._record(self._kind, _undo_attribute(self, name, attributes.get(name, _missing)))
+		if graph is not None and graph._indexes[self._kind]:
+			graph._reindex(self._kind, self._name, name, attributes.get(name, _missing), value)
+		attributes[name] = value
+
+	def __delattr__(self, name):
+		"""Deletes an attribute, keeping its graph's indexes up to date."""
+		if hasattr(type(self), name):
+			object.__delattr__(self, name)
+			return
+		if name[0] == "_":
+			private = getattr(self, "_private", None)
+			if private is None or name not in private:
+				raise AttributeError("%s has no attribute %s" % (type(self).__name__, name))
+			del private[name]
+			return
+		attributes = self._attributes
+		if attributes is None or name not in attributes:
+			raise AttributeError("%s has no attribute %s" % (type(self).__name__, name))
+		graph = self._graph
+		if graph is not None and graph._sharing is not None:
+			graph._write()
+		if graph is not None and graph._journal is not None:
+			graph._record(self._kind, _undo_attribute(self, name, attributes[name]))
+		if graph is not None and graph._indexes[self._kind]:
+			graph._reindex(self._kind, self._name, name, attributes[name], _missing)
+		del attributes[name]
+
 	def __hash__(self):
 		"""Returns the hash of this object's name."""
 		return hash(self._name)
@@ -492,35 +722,129 @@ class GraphElement:
 
 	@property
 	def data(self):
-		"""Returns a dictionary representing the data values of this element.
+		"""Returns a read-only mapping of the data values of this element.
 
 		Note that elements which are marked private- ie, start with a single
-		underscore- will not appear in this dictionary.
+		underscore- will not appear in this mapping. It is a view rather
+		than a copy, so it is cheap to get; use dict() on it to keep the
+		current values.
 		"""
-		d = {}
-		for k, v in self.__dict__.items():
-			if not k.startswith("_"):
-				d[k] = v
-		return d
+		attributes = self._attributes
+		return DataView(_no_data if attributes is None else attributes)
+
+
+class EdgeView(object):
+	"""A read-only view of some of a node's incident edges.
+
+	Views chain the node's adjacency mappings together without copying
+	them, so they are cheap to create and always reflect the current
+	state of the graph. They support len(), iteration, membership tests,
+	indexing and comparison against other sequences.
+
+	Note that indexing walks the view, and so is O(index). If you need
+	an independent copy, for instance to modify the graph while iterating,
+	use list(view).
+	"""
+
+	__slots__ = ("_node", "_kinds")
+
+	# views compare like sequences, and so are not hashable
+	__hash__ = None
+
+	def __init__(self, node, *kinds):
+		"""Creates a view of the adjacency mappings named by kinds."""
+		self._node = node
+		self._kinds = kinds
+
+	def _tables(self):
+		"""Returns the adjacency mappings this view chains together."""
+		node = self._node
+		return [getattr(node, kind) for kind in self._kinds]
+
+	def __len__(self):
+		return sum(_slot_len(table) for table in self._tables())
+
+	def __iter__(self):
+		return chain.from_iterable(_slot_edges(table) for table in self._tables())
+
+	def __contains__(self, edge):
+		if not isinstance(edge, Edge): return False
+		name = edge.name
+		for table in self._tables():
+			if isinstance(table, Edge):
+				if table == edge: return True
+			elif table.get(name) == edge: return True
+		return False
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return list(self)[index]
+		if index < 0:
+			index += len(self)
+		if index >= 0:
+			for edge in islice(self, index, None):
+				return edge
+		raise IndexError("edge view index out of range")
+
+	def __eq__(self, other):
+		try: return list(self) == list(other)
+		except TypeError: return False
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __repr__(self):
+		return repr(list(self))
+
+
+class IncidentEdgeView(EdgeView):
+	"""A read-only view of all of a node's incident edges.
+
+	Directed loops are both incoming and outgoing, but only appear once
+	in this view.
+	"""
+
+	__slots__ = ()
+
+	def __init__(self, node):
+		EdgeView.__init__(self, node, "_incoming", "_outgoing", "_bidirectional")
+
+	def __len__(self):
+		return EdgeView.__len__(self) - self._node._loops
+
+	def __iter__(self):
+		node = self._node
+		if not node._loops:
+			return EdgeView.__iter__(self)
+		# skip the outgoing loops, since they are also incoming
+		outgoing = (edge for edge in _slot_edges(node._outgoing) if not edge._end == node)
+		return chain(_slot_edges(node._incoming), outgoing, _slot_edges(node._bidirectional))
 
 
 class Node(GraphElement):
 	"""Base node representation.
 
-	Nodes have seven properties:
+	Nodes have nine properties:
 
-	- incoming, which is a list of all edges coming into this node
-	- outgoing, which is a list of all edges going away from this node
-	- bidirectional, which is a list of all bidirectional edges incident
+	- incoming, which is a view of all edges coming into this node
+	- outgoing, which is a view of all edges going away from this node
+	- bidirectional, which is a view of all bidirectional edges incident
 	  to this node
-	- edges, which is a list of all edges with this node as an endpoint
+	- edges, which is a view of all edges with this node as an endpoint
 	- degree, which is the number of edges incident to this node
-	- data, which is a dictionary of all non-private (ie, user-defined)
-	  attributes of this node
+	- in_degree and out_degree, which are the numbers of incoming and
+	  outgoing edges
+	- data, which is a read-only mapping of all non-private (ie,
+	  user-defined) attributes of this node
 	- and name, which is a unique value optionally passed in
 	  at instantiation time, and used for hashing comparisons.
 	"""
 
+	__slots__ = ("_incoming", "_outgoing", "_bidirectional", "_loops")
+
+	# which of its graph's index tables covers this element
+	_kind = "nodes"
+
 	def __init__(self, name, **kwargs):
 		"""Initializes the Node object.
 
@@ -537,10 +861,18 @@ class Node(GraphElement):
 			5
 		"""
 
-		self._name = name
-		self._incoming = []
-		self._outgoing = []
-		self._bidirectional = []
+		_set_name(self, name)
+		_set_graph(self, None)
+		_set_attributes(self, None)
+		# adjacency is tracked as edge name -> edge mappings, which keep
+		# insertion order but allow O(1) removal. Until an edge is
+		# linked, they are all the same shared empty mapping, and until
+		# a second one is, the edge is kept in place of the mapping.
+		_set_incoming(self, _no_edges)
+		_set_outgoing(self, _no_edges)
+		_set_bidirectional(self, _no_edges)
+		# the number of directed loops, which are both incoming and outgoing
+		_set_loops(self, 0)
 		for k, v in kwargs.items():
 			setattr(self, k, v)
 
@@ -556,17 +888,17 @@ class Node(GraphElement):
 		adjacent = []
 		seen = set()
 		if outgoing:
-			for edge in self._outgoing:
+			for edge in _slot_edges(self._outgoing):
 				if edge.end not in seen:
 					adjacent.append(edge.end)
 					seen.add(edge.end)
 		if incoming:
-			for edge in self._incoming:
+			for edge in _slot_edges(self._incoming):
 				if edge.start not in seen:
 					adjacent.append(edge.start)
 					seen.add(edge.start)
 		if outgoing or incoming:
-			for edge in self._bidirectional:
+			for edge in _slot_edges(self._bidirectional):
 				if edge.other_end(self) not in seen:
 					adjacent.append(edge.other_end(self))
 					seen.add(edge.other_end(self))
@@ -574,46 +906,55 @@ class Node(GraphElement):
 
 	@property
 	def incoming(self):
-		"""Returns a list of all the incoming edges for this node.
+		"""Returns a view of all the incoming edges for this node.
 
-		Note that the list returned is a copy, so modifying it doesn't
-		impact the structure of the graph.
+		Note that the view is read-only and reflects later changes to
+		the graph; use list() on it to get an independent copy.
 		"""
-		return copy.copy(self._incoming + self._bidirectional)
+		return EdgeView(self, "_incoming", "_bidirectional")
 
 	@property
 	def outgoing(self):
-		"""Returns a list of all the outgoing edges for this node.
+		"""Returns a view of all the outgoing edges for this node.
 
-		Note that the list returned is a copy, so modifying it doesn't
-		impact the structure of the graph.
+		Note that the view is read-only and reflects later changes to
+		the graph; use list() on it to get an independent copy.
 		"""
-		return copy.copy(self._outgoing + self._bidirectional)
+		return EdgeView(self, "_outgoing", "_bidirectional")
 
 	@property
 	def bidirectional(self):
-		"""Returns a list of all bidirectional edges for this node.
+		"""Returns a view of all bidirectional edges for this node.
 
-		Note that the list returned is a copy, so modifying it doesn't
-		impact the structure of the graph.
+		Note that the view is read-only and reflects later changes to
+		the graph; use list() on it to get an independent copy.
 		"""
-		return copy.copy(self._bidirectional)
+		return EdgeView(self, "_bidirectional")
 
 	@property
 	def edges(self):
-		"""Returns a list of all edges for this node.
+		"""Returns a view of all edges for this node.
 
-		Note that the list returned is a copy, so modifying it doesn't
-		impact the structure of the graph.
+		Note that the view is read-only and reflects later changes to
+		the graph; use list() on it to get an independent copy.
 		"""
-		# we have to ensure that all these elements are unique, since loops can be
-		# both incoming and outgoing.
-		return copy.copy(list(set(self._incoming + self._outgoing + self._bidirectional)))
+		return IncidentEdgeView(self)
 
 	@property
 	def degree(self):
 		"""Returns the degree of this Node, ie, the number of edges."""
-		return len(self.edges)
+		# loops are counted once, even though they are in two mappings
+		return _slot_len(self._incoming) + _slot_len(self._outgoing) + _slot_len(self._bidirectional) - self._loops
+
+	@property
+	def in_degree(self):
+		"""Returns the number of incoming edges of this Node."""
+		return _slot_len(self._incoming) + _slot_len(self._bidirectional)
+
+	@property
+	def out_degree(self):
+		"""Returns the number of outgoing edges of this Node."""
+		return _slot_len(self._outgoing) + _slot_len(self._bidirectional)
 
 
 class Edge(GraphElement):
@@ -627,10 +968,14 @@ class Edge(GraphElement):
 	- name, which is a unique, non-None value optionally
 	  passed in at instantiation time, and used for hashing
 	  comparisons
-	- data, which is a dictionary of all non-private
+	- data, which is a read-only mapping of all non-private
 	  (ie, user-defined) attributes of this node
 	"""
 
+	__slots__ = ("_start", "_end", "_directed")
+
+	_kind = "edges"
+
 	def __init__(self, start, end, name=None, is_directed=True, **kwargs):
 		"""Initializes the Edge.
 
@@ -651,12 +996,15 @@ class Edge(GraphElement):
 			>>> e.weight
 			5
 		"""
-		if name is not None: self._name = name
-		elif is_directed: self._name = (start.name, end.name)
-		else: self._name = frozenset((start.name, end.name))
-		self._start = start
-		self._end = end
-		self._directed = is_directed
+		if name is None:
+			if is_directed: name = (start.name, end.name)
+			else: name = frozenset((start.name, end.name))
+		_set_name(self, name)
+		_set_graph(self, None)
+		_set_attributes(self, None)
+		_set_start(self, start)
+		_set_end(self, end)
+		_set_directed(self, is_directed)
 		for k, v in kwargs.items():
 			setattr(self, k, v)
 
@@ -708,7 +1056,963 @@ class Edge(GraphElement):
 		return self._directed
 
 
-class Graph:
+# slot setters, which bypass GraphElement's attribute hooks and are
+# noticeably cheaper than object.__setattr__ when building large graphs
+_set_name = GraphElement._name.__set__
+_set_graph = GraphElement._graph.__set__
+_set_attributes = GraphElement._attributes.__set__
+_set_private = GraphElement._private.__set__
+_set_incoming = Node._incoming.__set__
+_set_outgoing = Node._outgoing.__set__
+_set_bidirectional = Node._bidirectional.__set__
+_set_loops = Node._loops.__set__
+_set_start = Edge._start.__set__
+_set_end = Edge._end.__set__
+_set_directed = Edge._directed.__set__
+
+
+class DisjointSet(object):
+	"""A disjoint-set forest over hashable items.
+
+	Uses path compression and union by rank, so any sequence of
+	operations runs in near-linear time.
+
+	Usage:
+		>>> s = DisjointSet([1, 2, 3])
+		>>> s.union(1, 2)
+		True
+		>>> s.find(1) == s.find(2)
+		True
+		>>> sorted(sorted(group) for group in s.groups())
+		[[1, 2], [3]]
+	"""
+
+	def __init__(self, items=()):
+		"""Creates a singleton set for each of the given items."""
+		self._parent = {}
+		self._rank = {}
+		for item in items:
+			self.add(item)
+
+	def __len__(self):
+		"""Returns the number of items in the forest."""
+		return len(self._parent)
+
+	def __contains__(self, item):
+		return item in self._parent
+
+	def add(self, item):
+		"""Adds item as a singleton set, if it isn't already present."""
+		if item not in self._parent:
+			self._parent[item] = item
+			self._rank[item] = 0
+
+	def find(self, item):
+		"""Returns the representative of the set containing item.
+
+		Raises KeyError if item is not in the forest.
+		"""
+		parent = self._parent
+		root = item
+		while parent[root] is not root:
+			root = parent[root]
+		# compress the path behind us
+		while item is not root:
+			item, parent[item] = parent[item], root
+		return root
+
+	def union(self, a, b):
+		"""Merges the sets containing a and b, adding them if needed.
+
+		Returns True if two distinct sets were merged.
+		"""
+		self.add(a)
+		self.add(b)
+		a = self.find(a)
+		b = self.find(b)
+		if a is b: return False
+		rank = self._rank
+		if rank[a] < rank[b]: a, b = b, a
+		self._parent[b] = a
+		if rank[a] == rank[b]: rank[a] += 1
+		return True
+
+	def groups(self):
+		"""Returns a list of the sets in the forest, as lists of items."""
+		groups = defaultdict(list)
+		for item in self._parent:
+			groups[self.find(item)].append(item)
+		return list(groups.values())
+
+
+class HashIndex(object):
+	"""Attribute index mapping values to the names of elements holding them.
+
+	Unhashable values are kept aside and found by comparison.
+	"""
+
+	def __init__(self):
+		self._buckets = {}
+		self._unhashable = {}
+
+	def __len__(self):
+		"""Returns the number of indexed elements."""
+		return sum(len(bucket) for bucket in self._buckets.values()) + len(self._unhashable)
+
+	def add(self, name, value):
+		"""Records that the named element holds value."""
+		try: self._buckets.setdefault(value, set()).add(name)
+		except TypeError: self._unhashable[name] = value
+
+	def update(self, items):
+		"""Records that the named elements hold the values in the (name, value) pairs given."""
+		for name, value in items:
+			self.add(name, value)
+
+	def remove(self, name, value):
+		"""Forgets that the named element holds value."""
+		try: bucket = self._buckets[value]
+		except TypeError:
+			del self._unhashable[name]
+			return
+		bucket.discard(name)
+		if not bucket: del self._buckets[value]
+
+	def find(self, value):
+		"""Returns the set of names of elements holding value."""
+		try: names = set(self._buckets.get(value, ()))
+		except TypeError: names = set()
+		if self._unhashable:
+			names.update(name for name, other in self._unhashable.items() if other == value)
+		return names
+
+	def copy(self):
+		"""Returns an independent copy of the index."""
+		index = HashIndex()
+		index._buckets = dict((value, set(names)) for value, names in self._buckets.items())
+		index._unhashable = dict(self._unhashable)
+		return index
+
+
+class RangeIndex(object):
+	"""Attribute index keeping values in sorted order, for range searches.
+
+	Distinct values are kept in a list of sorted blocks, each value
+	with the set of names holding it, so adding and removing cost
+	O(log n) comparisons plus the shifting of one block. Values that
+	can't be ordered against those already indexed are kept aside,
+	and are only found by equality.
+
+	Usage:
+		>>> index = RangeIndex()
+		>>> for name, weight in (("a", 3), ("b", 1), ("c", 7)):
+		... 	index.add(name, weight)
+		>>> sorted(index.find_range(2, 7))
+		['a', 'c']
+	"""
+
+	# blocks are split in two once they hold twice this many values
+	_load = 512
+
+	def __init__(self):
+		# blocks of distinct values, parallel blocks of the sets of
+		# names holding them, and the last value of each block
+		self._values = []
+		self._names = []
+		self._maxes = []
+		self._size = 0
+		self._unordered = {}
+
+	def __len__(self):
+		"""Returns the number of indexed elements."""
+		return self._size + len(self._unordered)
+
+	def _locate(self, value):
+		"""Returns the block and position where value is or belongs, and whether it is there.
+
+		Raises TypeError if value can't be ordered against the indexed values.
+		"""
+		maxes = self._maxes
+		if not maxes:
+			# a first value must at least be comparable with itself
+			value < value
+			return 0, 0, False
+		block = bisect.bisect_left(maxes, value)
+		if block == len(maxes):
+			return block - 1, len(self._values[-1]), False
+		values = self._values[block]
+		position = bisect.bisect_left(values, value)
+		return block, position, not value < values[position]
+
+	def add(self, name, value):
+		"""Records that the named element holds value."""
+		try: block, position, found = self._locate(value)
+		except TypeError:
+			self._unordered[name] = value
+			return
+		self._size += 1
+		if found:
+			self._names[block][position].add(name)
+			return
+		if not self._maxes:
+			self._values.append([value])
+			self._names.append([set([name])])
+			self._maxes.append(value)
+			return
+		values, names = self._values[block], self._names[block]
+		values.insert(position, value)
+		names.insert(position, set([name]))
+		if position == len(values) - 1: self._maxes[block] = value
+		if len(values) >= 2 * self._load:
+			half = self._load
+			self._values.insert(block + 1, values[half:])
+			self._names.insert(block + 1, names[half:])
+			del values[half:]
+			del names[half:]
+			self._maxes.insert(block, values[-1])
+
+	def update(self, items):
+		"""Records that the named elements hold the values in the (name, value) pairs given.
+
+		An empty index is filled by sorting the values once, rather
+		than inserting them one at a time.
+		"""
+		items = list(items)
+		if self._maxes or not items:
+			for name, value in items: self.add(name, value)
+			return
+		values, names = [], []
+		try:
+			items.sort(key=lambda item: item[1])
+			previous = items[0][1]
+			for name, value in items:
+				# this compares the first value with itself, which
+				# rejects those that can't be ordered at all
+				if previous < value or not values:
+					values.append(value)
+					names.append(set([name]))
+				else:
+					names[-1].add(name)
+				previous = value
+		except TypeError:
+			for name, value in items: self.add(name, value)
+			return
+		load = self._load
+		self._values = [values[i:i + load] for i in range(0, len(values), load)]
+		self._names = [names[i:i + load] for i in range(0, len(names), load)]
+		self._maxes = [block[-1] for block in self._values]
+		self._size = len(items)
+
+	def remove(self, name, value):
+		"""Forgets that the named element holds value."""
+		if self._unordered.pop(name, _missing) is not _missing: return
+		block, position, found = self._locate(value)
+		names = self._names[block][position]
+		names.remove(name)
+		self._size -= 1
+		if names: return
+		values = self._values[block]
+		del values[position]
+		del self._names[block][position]
+		if not values:
+			del self._values[block]
+			del self._names[block]
+			del self._maxes[block]
+		elif position == len(values):
+			self._maxes[block] = values[-1]
+
+	def find(self, value):
+		"""Returns the set of names of elements holding value."""
+		names = set(name for name, other in self._unordered.items() if other == value)
+		try: block, position, found = self._locate(value)
+		except TypeError: found = False
+		if found: names.update(self._names[block][position])
+		return names
+
+	def find_range(self, low=None, high=None):
+		"""Returns the names of elements with values between low and high.
+
+		Both bounds are inclusive, and either may be None to leave the
+		range open on that side. Names are in order of value.
+		"""
+		maxes, values = self._maxes, self._values
+		first, start = 0, 0
+		if low is not None:
+			first = bisect.bisect_left(maxes, low)
+			if first < len(maxes): start = bisect.bisect_left(values[first], low)
+		last, end = len(maxes) - 1, None
+		if high is not None:
+			block = bisect.bisect_left(maxes, high)
+			if block < len(maxes): last, end = block, bisect.bisect_right(values[block], high)
+		names = []
+		for block in range(first, last + 1):
+			groups = self._names[block]
+			if block == last: groups = groups[:end]
+			if block == first: groups = groups[start:]
+			for group in groups:
+				names.extend(group)
+		return names
+
+	def copy(self):
+		"""Returns an independent copy of the index."""
+		index = RangeIndex()
+		index._values = [list(values) for values in self._values]
+		index._names = [[set(names) for names in block] for block in self._names]
+		index._maxes = list(self._maxes)
+		index._size = self._size
+		index._unordered = dict(self._unordered)
+		return index
+
+
+class Predicate(object):
+	"""A condition on the data attributes of nodes or edges.
+
+	Predicates are made with where() and combined with & (and),
+	| (or) and ~ (not). Calling one with an element's data dictionary
+	tells whether the condition holds for it.
+
+	Usage:
+		>>> heavy = where("weight") > 5
+		>>> heavy({"weight": 7})
+		True
+		>>> red_or_blue = where("color").isin(["red", "blue"])
+		>>> (heavy & red_or_blue)({"weight": 7, "color": "green"})
+		False
+	"""
+
+	def __call__(self, data):
+		raise NotImplementedError
+
+	def __and__(self, other):
+		return And(self, other)
+
+	def __or__(self, other):
+		return Or(self, other)
+
+	def __invert__(self):
+		return Not(self)
+
+	def conjuncts(self):
+		"""Returns the predicates which must all hold for this one to."""
+		return [self]
+
+	def lookup(self, indexes):
+		"""Finds the names of the elements that may satisfy this predicate.
+
+		indexes maps attribute names to HashIndex or RangeIndex
+		objects. Returns a (names, exact) pair, where exact tells
+		whether every element named is known to satisfy it, or None if
+		the indexes can't answer it.
+		"""
+		return None
+
+
+class Comparison(Predicate):
+	"""Compares a single attribute against a value.
+
+	Elements lacking the attribute, or whose value can't be compared
+	against the given one, never satisfy the comparison.
+	"""
+
+	_operators = {
+		"==": lambda a, b: a == b,
+		"!=": lambda a, b: a != b,
+		"<": lambda a, b: a < b,
+		"<=": lambda a, b: a <= b,
+		">": lambda a, b: a > b,
+		">=": lambda a, b: a >= b,
+		"in": lambda a, b: a in b,
+		"between": lambda a, b: b[0] <= a <= b[1],
+		"test": lambda a, b: b(a),
+		"exists": lambda a, b: True,
+	}
+
+	def __init__(self, attribute, operator, value):
+		self.attribute = attribute
+		self.operator = operator
+		self.value = value
+		self._compare = self._operators[operator]
+
+	def __repr__(self):
+		if self.operator == "test": return "test(%s)" % (self.attribute,)
+		if self.operator == "exists": return "has %s" % (self.attribute,)
+		return "%s %s %r" % (self.attribute, self.operator, self.value)
+
+	def __call__(self, data):
+		value = data.get(self.attribute, _missing)
+		if value is _missing: return False
+		try: return bool(self._compare(value, self.value))
+		except TypeError: return False
+
+	def lookup(self, indexes):
+		index = indexes.get(self.attribute)
+		if index is None: return None
+		operator, value = self.operator, self.value
+		if operator == "==":
+			return index.find(value), True
+		if operator == "in":
+			names = set()
+			for item in value:
+				names.update(index.find(item))
+			return names, True
+		if not isinstance(index, RangeIndex): return None
+		bounds = {
+			"<": (None, value), "<=": (None, value),
+			">": (value, None), ">=": (value, None),
+			"between": value,
+		}
+		if operator not in bounds: return None
+		# the index reads a None bound as leaving the range open
+		if value is None or (operator == "between" and None in value): return None
+		# strict bounds are inclusive in the index, so recheck them
+		try: return index.find_range(*bounds[operator]), operator not in ("<", ">")
+		except TypeError: return None
+
+
+class And(Predicate):
+	"""Holds when all of its predicates hold."""
+
+	def __init__(self, *predicates):
+		self.predicates = predicates
+
+	def __repr__(self):
+		return "(%s)" % " and ".join(repr(p) for p in self.predicates)
+
+	def __call__(self, data):
+		for predicate in self.predicates:
+			if not predicate(data): return False
+		return True
+
+	def conjuncts(self):
+		conjuncts = []
+		for predicate in self.predicates:
+			conjuncts.extend(predicate.conjuncts())
+		return conjuncts
+
+	def lookup(self, indexes):
+		names, exact = None, True
+		for predicate in self.predicates:
+			found = predicate.lookup(indexes)
+			if found is None:
+				exact = False
+				continue
+			names = set(found[0]) if names is None else names & set(found[0])
+			exact = exact and found[1]
+		if names is None: return None
+		return names, exact
+
+
+class Or(Predicate):
+	"""Holds when any of its predicates hold."""
+
+	def __init__(self, *predicates):
+		self.predicates = predicates
+
+	def __repr__(self):
+		return "(%s)" % " or ".join(repr(p) for p in self.predicates)
+
+	def __call__(self, data):
+		for predicate in self.predicates:
+			if predicate(data): return True
+		return False
+
+	def lookup(self, indexes):
+		# an or can only use the indexes if every branch can
+		names, exact = set(), True
+		for predicate in self.predicates:
+			found = predicate.lookup(indexes)
+			if found is None: return None
+			names.update(found[0])
+			exact = exact and found[1]
+		return names, exact
+
+
+class Not(Predicate):
+	"""Holds when its predicate does not."""
+
+	def __init__(self, predicate):
+		self.predicate = predicate
+
+	def __repr__(self):
+		return "not %r" % (self.predicate,)
+
+	def __call__(self, data):
+		return not self.predicate(data)
+
+
+class Attribute(object):
+	"""Builds predicates on a named data attribute. See where()."""
+
+	def __init__(self, name):
+		self.name = name
+
+	def __eq__(self, value):
+		return Comparison(self.name, "==", value)
+
+	def __ne__(self, value):
+		return Comparison(self.name, "!=", value)
+
+	def __lt__(self, value):
+		return Comparison(self.name, "<", value)
+
+	def __le__(self, value):
+		return Comparison(self.name, "<=", value)
+
+	def __gt__(self, value):
+		return Comparison(self.name, ">", value)
+
+	def __ge__(self, value):
+		return Comparison(self.name, ">=", value)
+
+	__hash__ = None
+
+	def isin(self, values):
+		"""Holds when the attribute equals one of values."""
+		values = list(values)
+		try: values = frozenset(values)
+		except TypeError: values = tuple(values)
+		return Comparison(self.name, "in", values)
+
+	def between(self, low, high):
+		"""Holds when low <= attribute <= high."""
+		return Comparison(self.name, "between", (low, high))
+
+	def exists(self):
+		"""Holds when the element has the attribute at all."""
+		return Comparison(self.name, "exists", None)
+
+	def test(self, function):
+		"""Holds when function(attribute) is true."""
+		return Comparison(self.name, "test", function)
+
+
+def where(attribute):
+	"""Starts a predicate on the given data attribute.
+
+	Usage:
+		>>> g = Graph()
+		>>> e = g.add_edge("a", "b", weight=7, color="red")
+		>>> list(g.query("edges", (where("weight") > 5) & (where("color") != "blue")))
+		[Edge(name=('a', 'b'), weight=7, color=red)]
+	"""
+	return Attribute(attribute)
+
+
+class Query(object):
+	"""A search over the nodes or edges of a graph, made by Graph.query().
+
+	When iterated, a query is compiled into a plan: if any of the
+	conditions it must meet can be answered by the graph's indexes,
+	only the elements they name are examined; otherwise a single pass
+	is made over the elements- or, for edges constrained by start or
+	end, over that node's edges- testing every condition at once. The
+	search stops as soon as the limit is reached.
+
+	Queries are recompiled each time they are iterated, so they
+	always reflect the graph's current contents and indexes.
+	"""
+
+	def __init__(self, graph, kind, predicate=None, structure=None, count=None):
+		self._graph = graph
+		self._kind = kind
+		self._predicate = predicate
+		self._structure = structure or {}
+		self._count = count
+
+	def __iter__(self):
+		candidates, test, plan = self._compile()
+		count = self._count
+		if count is not None and count <= 0: return
+		for element in candidates:
+			if test(element):
+				yield element
+				if count is not None:
+					count -= 1
+					if not count: return
+
+	def __repr__(self):
+		return "Query(%s)" % self.explain()
+
+	def where(self, predicate):
+		"""Returns a query which must also satisfy predicate."""
+		if self._predicate is not None:
+			predicate = And(self._predicate, predicate)
+		return Query(self._graph, self._kind, predicate, self._structure, self._count)
+
+	def limit(self, count):
+		"""Returns a query yielding at most count elements."""
+		return Query(self._graph, self._kind, self._predicate, self._structure, count)
+
+	def first(self, default=None):
+		"""Returns the first matching element, or default if there is none."""
+		for element in self.limit(1):
+			return element
+		return default
+
+	def explain(self):
+		"""Returns a description of how the query will be executed."""
+		return self._compile()[2]
+
+	def _compile(self):
+		"""Returns the candidates, fused test and description of a plan."""
+		graph, kind = self._graph, self._kind
+		elements = graph._nodes if kind == "nodes" else graph._edges
+		structure = self._structure
+		start, end = structure.get("start"), structure.get("end")
+		if start is not None: start = graph.get_element(start)
+		if end is not None: end = graph.get_element(end)
+		is_directed = structure.get("is_directed")
+		conjuncts = self._predicate.conjuncts() if self._predicate is not None else []
+		# choose where the candidates come from
+		names, residual, plan = None, conjuncts, "scan %s" % kind
+		if "name" in structure:
+			element = elements.get(structure["name"])
+			candidates = [element] if element is not None else []
+			plan = "lookup %s by name" % kind[:-1]
+		else:
+			residual, used = [], []
+			for conjunct in conjuncts:
+				found = None if names is not None and not names else conjunct.lookup(graph._indexes[kind])
+				if found is None:
+					residual.append(conjunct)
+					continue
+				found_names, exact = found
+				names = found_names if names is None else set(names) & set(found_names)
+				used.append(conjunct)
+				if not exact: residual.append(conjunct)
+			if names is not None:
+				candidates = [elements[name] for name in names]
+				plan = "index lookup on %s" % ", ".join(repr(p) for p in used)
+			elif start is not None:
+				candidates = start.outgoing
+				plan = "scan edges of %r" % start
+			elif end is not None:
+				candidates = end.incoming
+				plan = "scan edges of %r" % end
+			else:
+				candidates = elements.values()
+		# fuse every remaining check into a single test
+		checks = []
+		if start is not None: checks.append(lambda e: e.start == start)
+		if end is not None: checks.append(lambda e: e.end == end)
+		if is_directed is not None: checks.append(lambda e: e.is_directed == is_directed)
+		if start is not None or end is not None or is_directed is not None:
+			plan += ", check structure"
+		if residual:
+			predicate = residual[0] if len(residual) == 1 else And(*residual)
+			checks.append(lambda e: predicate(e.data))
+			plan += ", filter on %r" % predicate
+		if not checks: test = lambda element: True
+		elif len(checks) == 1: test = checks[0]
+		else:
+			def test(element):
+				for check in checks:
+					if not check(element): return False
+				return True
+		if self._count is not None:
+			plan += ", limit %d" % self._count
+		return candidates, test, plan
+
+
+class ShortestPathTree(object):
+	"""The result of a single-source shortest path search.
+
+	Only the distance and the parent edge of each reachable node are
+	stored; paths are rebuilt from the parent edges when asked for.
+
+	The tree behaves as a read-only mapping from each reachable node
+	to either a (distance, [path]) pair or, if it was built with
+	pretty=True, a subgraph of the path with an additional weight
+	attribute. Either is built on access.
+
+	The distance, path, parent and subgraph methods give direct access
+	to the individual pieces.
+	"""
+
+	# trees compare like mappings, and so are not hashable
+	__hash__ = None
+
+	def __init__(self, graph, source, distances, parents, pretty=False):
+		"""Wraps the distance and node -> (edge, previous node) mappings."""
+		self.graph = graph
+		self.source = source
+		self._distances = distances
+		self._parents = parents
+		self._pretty = pretty
+
+	def __len__(self):
+		return len(self._distances)
+
+	def __iter__(self):
+		return iter(self._distances)
+
+	def __contains__(self, node):
+		return node in self._distances
+
+	def __getitem__(self, node):
+		if self._pretty: return self.subgraph(node)
+		return (self._distances[node], self.path(node))
+
+	def __eq__(self, other):
+		try: return dict(self.items()) == dict(other.items())
+		except AttributeError: return False
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __repr__(self):
+		return "%s(source=%s, reachable=%s)" % (type(self).__name__, self.source, len(self))
+
+	def get(self, node, default=None):
+		if node not in self._distances: return default
+		return self[node]
+
+	def keys(self):
+		return self._distances.keys()
+
+	def values(self):
+		return [self[node] for node in self._distances]
+
+	def items(self):
+		return [(node, self[node]) for node in self._distances]
+
+	def distance(self, node):
+		"""Returns the length of the shortest path to node.
+
+		Raises KeyError if node is not reachable from the source.
+		"""
+		return self._distances[node]
+
+	def parent(self, node):
+		"""Returns the last edge on the shortest path to node.
+
+		Returns None for the source, and raises KeyError if node is not
+		reachable from it.
+		"""
+		if node not in self._distances:
+			raise KeyError("%s is not reachable from %s" % (node, self.source))
+		parent = self._parents.get(node)
+		if parent is None: return None
+		return parent[0]
+
+	def path(self, node):
+		"""Returns the list of edges on the shortest path to node.
+
+		Raises KeyError if node is not reachable from the source.
+		"""
+		if node not in self._distances:
+			raise KeyError("%s is not reachable from %s" % (node, self.source))
+		path = []
+		parent = self._parents.get(node)
+		while parent is not None:
+			edge, node = parent
+			path.append(edge)
+			parent = self._parents.get(node)
+		path.reverse()
+		return path
+
+	def subgraph(self, node):
+		"""Returns the shortest path to node as a graph.
+
+		The graph has an additional weight attribute that gives the
+		total weight of the path.
+		"""
+		g = self.graph.edge_induce_subgraph(*self.path(node))
+		g.weight = self._distances[node]
+		return g
+
+
+class SubgraphView(object):
+	"""A read-only view of the subgraph induced by some of a graph's nodes.
+
+	Creating a view only looks up the chosen nodes, so it is O(|nodes|).
+	Edges are found when asked for by filtering the chosen nodes'
+	adjacency mappings, so they reflect the current state of the parent
+	graph and cost at most the sum of the nodes' degrees to list.
+
+	Use to_graph() to get an independent copy.
+
+	Usage:
+		>>> g = Graph(edges=[("a", "b"), ("b", "c"), ("c", "a")])
+		>>> view = g.subgraph_view("a", "b")
+		>>> view.order, view.size
+		(2, 1)
+		>>> view.edges
+		[Edge(name=('a', 'b'))]
+	"""
+
+	def __init__(self, graph, nodes):
+		"""Creates a view of the given nodes or node names of graph.
+
+		Raises KeyError if any of them is not in the graph.
+		"""
+		graph._claim()
+		self.graph = graph
+		self._nodes = OrderedDict()
+		elements = graph._nodes
+		for node in nodes:
+			name = node.name if isinstance(node, GraphElement) else node
+			if name not in elements:
+				raise KeyError("%s not in %s" % (node, graph))
+			self._nodes[name] = elements[name]
+
+	def __contains__(self, element):
+		"""Returns True if the element, or the named element, is in the view."""
+		if isinstance(element, Node):
+			return element.name in self._nodes
+		name = element.name if isinstance(element, Edge) else element
+		if name in self._nodes:
+			return not isinstance(element, Edge)
+		edge = self.graph._edges.get(name)
+		return edge is not None and edge._start._name in self._nodes and edge._end._name in self._nodes
+
+	def _node(self, node):
+		"""Takes a node or a node name and returns the node in the view."""
+		name = node.name if isinstance(node, GraphElement) else node
+		try: return self._nodes[name]
+		except KeyError: raise KeyError("%s not in view" % (node,))
+
+	@property
+	def nodes(self):
+		"""Returns an iterator over the nodes in the view."""
+		return self._nodes.values()
+
+	@property
+	def edges(self):
+		"""Returns a list of the edges between nodes in the view."""
+		nodes = self._nodes
+		edges = []
+		for name, node in nodes.items():
+			for edge in _slot_edges(node._outgoing):
+				if edge._end._name in nodes:
+					edges.append(edge)
+			for edge in _slot_edges(node._bidirectional):
+				# undirected edges appear at both ends, so only take them at their start
+				if edge._start._name == name and edge._end._name in nodes:
+					edges.append(edge)
+		return edges
+
+	@property
+	def order(self):
+		"""Reports the number of nodes in the view."""
+		return len(self._nodes)
+
+	@property
+	def size(self):
+		"""Reports the number of edges in the view."""
+		return len(self.edges)
+
+	def _within(self, node, edges):
+		"""Returns those of node's edges whose other end is in the view."""
+		nodes = self._nodes
+		name = node.name
+		within = []
+		for edge in edges:
+			start, end = edge._start._name, edge._end._name
+			if (end if start == name else start) in nodes:
+				within.append(edge)
+		return within
+
+	def get_outgoing(self, node):
+		"""Returns a list of the node's outgoing edges within the view."""
+		node = self._node(node)
+		return self._within(node, node.outgoing)
+
+	def get_incoming(self, node):
+		"""Returns a list of the node's incoming edges within the view."""
+		node = self._node(node)
+		return self._within(node, node.incoming)
+
+	def get_adjacent(self, node, outgoing=True, incoming=False):
+		"""Returns a list of the node's adjacent nodes within the view.
+
+		The optional arguments are as for Node.get_adjacent.
+		"""
+		node = self._node(node)
+		nodes = self._nodes
+		return [other for other in node.get_adjacent(outgoing, incoming) if other.name in nodes]
+
+	def to_graph(self):
+		"""Returns a new graph holding copies of the view's nodes and edges.
+
+		This is O(sum of the nodes' degrees), however large the parent is.
+		"""
+		g = self.graph._empty()
+		g._merge(self._nodes, OrderedDict((edge._name, edge) for edge in self.edges))
+		return g
+
+
+class LandmarkHeuristic(object):
+	"""A* heuristic based on distances to and from a few landmark nodes.
+
+	By the triangle inequality, for any landmark L the distance from v
+	to t is at least d(L, t) - d(L, v) and at least d(v, L) - d(t, L).
+	The heuristic returns the largest of these bounds, which is exact
+	whenever a landmark lies behind v or beyond t on the shortest path.
+
+	The tables are computed once, with one forward and one backward
+	Dijkstra search per landmark, and are keyed by node name.
+	"""
+
+	def __init__(self, graph, landmarks=4, get_weight=lambda e: 1):
+		"""Chooses the landmarks and computes their distance tables.
+
+		landmarks is either a number of landmarks to choose, or an
+		iterable of nodes or node names.
+		"""
+		self.landmarks = []
+		# per landmark, name -> distance from and to that landmark
+		self._from = []
+		self._to = []
+		if isinstance(landmarks, int):
+			chosen = self._choose(graph, landmarks)
+		else:
+			chosen = (graph.get_element(landmark) for landmark in landmarks)
+		for landmark in chosen:
+			self._add(graph, landmark, get_weight)
+
+	def _add(self, graph, landmark, get_weight):
+		"""Adds a landmark and computes its distance tables."""
+		tables = []
+		for reverse in (False, True):
+			distances = {}
+			for node in graph._dijkstra(landmark, get_weight, distances, {}, reverse):
+				pass
+			tables.append(dict((node.name, distance) for node, distance in distances.items()))
+		self.landmarks.append(landmark)
+		self._from.append(tables[0])
+		self._to.append(tables[1])
+
+	def _choose(self, graph, number):
+		"""Yields landmarks, each as far as possible from the previous ones."""
+		if not graph.order: return
+		# how far each node is from the nearest landmark so far
+		nearest = dict((node.name, float("inf")) for node in graph.nodes)
+		landmark = next(iter(graph.nodes))
+		for i in range(min(number, graph.order)):
+			yield landmark
+			for name, distance in self._from[-1].items():
+				nearest[name] = min(nearest[name], distance)
+			for name, distance in self._to[-1].items():
+				nearest[name] = min(nearest[name], distance)
+			name = max(nearest, key=nearest.get)
+			if not nearest[name]: return
+			landmark = graph[name]
+
+	def __call__(self, node, target):
+		"""Returns a lower bound on the distance from node to target."""
+		node = node.name
+		target = target.name
+		bound = 0
+		for from_landmark, to_landmark in zip(self._from, self._to):
+			if node in from_landmark and target in from_landmark:
+				bound = max(bound, from_landmark[target] - from_landmark[node])
+			if node in to_landmark and target in to_landmark:
+				bound = max(bound, to_landmark[node] - to_landmark[target])
+		return bound
+
+
+class Graph(object):
 
 	"""A basic graph class, and base for all Graph mixins.
 
@@ -723,15 +2027,56 @@ class Graph:
 
 	Because of its generality, it is suitable as a general-purpose
 	Graph representation.
+
+	The storage engine can be selected at construction time with the
+	backend keyword argument; see Graph.backends for the available
+	engines.
 	"""
 
 	Node = Node
 	Edge = Edge
 
-	def __init__(self, nodes=set(), edges=set()):
+	# maps backend names to the classes implementing them; filled in
+	# once all the storage engines have been defined
+	backends = {}
+
+	# weak references to the graphs sharing this one's storage through
+	# snapshot(), if any, and whether its elements belong to another of them
+	_sharing = None
+	_borrowed = False
+
+	# while in a batch, the undo journal, the indexes put aside until
+	# it ends and the kinds of element it has changed
+	_journal = None
+	_deferred = None
+	_touched = None
+
+	def __new__(cls, *args, **kwargs):
+		"""Selects the storage engine for a new Graph.
+
+		If a backend argument is given, the returned graph is an
+		instance of the class registered under that name in
+		Graph.backends rather than of cls.
+
+		Usage:
+			>>> g = Graph(backend="compact")
+			>>> type(g)
+			<class 'graph.base.CompactGraph'>
+		"""
+		backend = kwargs.get("backend")
+		if len(args) > 2: backend = args[2]
+		if backend is not None:
+			try: cls = Graph.backends[backend]
+			except KeyError: raise ValueError("Unknown graph backend %s" % backend)
+		return object.__new__(cls)
+
+	def __init__(self, nodes=set(), edges=set(), backend=None):
 		"""Base initializer for Graphs.
 
-		Accepts two keyword arguments: nodes and edges.
+		Accepts three keyword arguments: nodes, edges and backend.
+
+		backend names the storage engine to use, and is consumed
+		by __new__.
 
 		Nodes can be either an iterable whose items are valid node
 		names or a mapping of node names to a dictionary of attributes.
@@ -778,13 +2123,222 @@ class Graph:
 		self._edges = {}
 		# the counter is a thread-safe way to track default names
 		self._counter = count()
+		# the incrementally maintained connected components, if any
+		self._components = None
+		# attribute -> index, for each kind of element
+		self._indexes = {"nodes": {}, "edges": {}}
 		# add the nodes and edges specified by kwargs
-		for node in nodes:
-			try: self.add_node(node, **nodes[node])
-			except TypeError: self.add_node(node)
-		for edge in edges:
-			try: self.add_edge(*edge, **edges[edge])
-			except TypeError: self.add_edge(*edge)
+		self.add_nodes_from(nodes)
+		self.add_edges_from(edges)
+
+	def _empty(self):
+		"""Returns a new, empty graph to hold results derived from this one.
+
+		Methods such as union and induce_subgraph build their results
+		with this, so subclasses that can't be constructed without
+		arguments can override it.
+		"""
+		return self.__class__()
+
+	def snapshot(self):
+		"""Returns a copy-on-write clone of this graph.
+
+		The snapshot shares this graph's storage, so taking one is O(1)
+		however large the graph is. The first time either graph is
+		changed afterwards, the snapshot is given a private copy of the
+		storage, and from then on the two are independent. Snapshots
+		of a graph that changes take one copy between them, and go on
+		sharing it until they change in turn.
+
+		On the default backend nodes and edges belong to one graph, so
+		the snapshot also takes its copy, which rebuilds its elements,
+		before it first hands any of them out. The compact backend only
+		copies its arrays, which is many times faster, and hands out
+		views of them straight away; prefer it when snapshots are taken
+		often.
+
+		Usage:
+			>>> g = Graph(edges=[("a", "b"), ("b", "c")])
+			>>> what_if = g.snapshot()
+			>>> e = what_if.remove_edge(("a", "b"))
+			>>> what_if.size, g.size
+			(1, 2)
+		"""
+		snap = self._empty()
+		# share everything but the name counter
+		snap.__dict__.update(self.__dict__)
+		# count objects can't be copied, so give both graphs new ones
+		# starting from where this one had got to
+		start = next(self._counter)
+		self._counter, snap._counter = count(start), count(start)
+		snap._borrowed = True
+		snap._journal = snap._deferred = snap._touched = None
+		if self._deferred is not None:
+			# our indexes are out of date until the batch ends
+			snap._indexes = {"nodes": {}, "edges": {}}
+			for indexes in (self._deferred, self._indexes):
+				for kind, attributes in indexes.items():
+					for attribute, index in attributes.items():
+						snap._indexes[kind][attribute] = snap._build_index(kind, attribute, isinstance(index, RangeIndex))
+		sharing = self._sharing
+		if sharing is None:
+			sharing = self._sharing = [weakref.ref(self)]
+		sharing.append(weakref.ref(snap))
+		snap._sharing = sharing
+		return snap
+
+	def _write(self):
+		"""Makes sure no snapshot sees the changes about to be made to this graph.
+
+		Graphs call this before changing their storage. Snapshots, and
+		other graphs that don't own their elements, take private copies
+		of the storage themselves. The owner keeps its elements, so one
+		of the others takes a copy and the rest go on sharing it, which
+		costs one copy however many snapshots there are.
+		"""
+		sharing = self._sharing
+		if sharing is None: return
+		if self._borrowed:
+			self._unshare()
+			return
+		self._sharing = None
+		others = [ref() for ref in sharing]
+		others = [graph for graph in others if graph is not None and graph is not self]
+		if not others: return
+		heir = others[0]
+		heir._sharing = None
+		heir._copy_storage()
+		heir._borrowed = False
+		if len(others) == 1: return
+		sharing = [weakref.ref(graph) for graph in others]
+		for graph in others:
+			graph._sharing = sharing
+			if graph is not heir:
+				graph._nodes, graph._edges = heir._nodes, heir._edges
+				graph._indexes, graph._components = heir._indexes, heir._components
+
+	def _claim(self):
+		"""Makes sure the elements this graph is about to hand out are its own.
+
+		A snapshot shares its parent's elements until it copies the
+		storage, and changes made through them would reach the parent.
+		"""
+		if self._borrowed: self._unshare()
+
+	def _unshare(self):
+		"""Replaces the storage this graph shares with a private copy."""
+		sharing = self._sharing
+		self._sharing = None
+		# graphs compare by their elements, so look for ourselves by identity
+		others = [ref for ref in sharing if ref() is not None and ref() is not self]
+		sharing[:] = others
+		# the last graph left holds its storage alone
+		if len(others) == 1:
+			others[0]()._sharing = None
+		if others: self._copy_storage()
+		self._borrowed = False
+
+	def _copy_storage(self):
+		"""Rebuilds the graph's elements and indexes from shared ones."""
+		nodes, edges, indexes = self._nodes, self._edges, self._indexes
+		self._nodes, self._edges = {}, {}
+		self._indexes = {"nodes": {}, "edges": {}}
+		self._components = None
+		self._merge(nodes, edges)
+		self._indexes = self._copy_indexes(indexes)
+
+	def _copy_indexes(self, indexes):
+		"""Returns independent copies of the given kind -> attribute -> index mappings."""
+		copies = {}
+		for kind, attributes in indexes.items():
+			copies[kind] = dict((attribute, index.copy()) for attribute, index in attributes.items())
+		return copies
+
+	@contextmanager
+	def batch(self):
+		"""Groups changes to the graph into a transaction.
+
+		Changes made in the block are journaled, and if it raises, they
+		are undone before the exception propagates, restoring the nodes,
+		edges and data attributes the graph had before. Restored
+		elements may come back in a different order.
+
+		Indexes are kept up to date as usual until the batch has made
+		more changes than a quarter of the graph's elements, when their
+		maintenance is put off until the outermost batch ends and the
+		indexes of each kind of element that was changed are rebuilt
+		once, so batches also suit large rewrites. Until then, searches
+		scan the graph instead.
+
+		Batches can be nested; an inner batch that raises only undoes
+		its own changes.
+
+		Usage:
+			>>> g = Graph(edges=[("a", "b")])
+			>>> try:
+			... 	with g.batch():
+			... 		node = g.remove_node("a")
+			... 		raise ValueError
+			... except ValueError:
+			... 	pass
+			>>> g.order, g.size
+			(2, 1)
+		"""
+		outermost = self._journal is None
+		if outermost:
+			self._journal = []
+			self._touched = set()
+		mark = len(self._journal)
+		committed = False
+		try:
+			yield self
+			committed = True
+		finally:
+			if not committed: self._rollback(mark)
+			if outermost: self._end_batch()
+
+	def _record(self, kind, undo):
+		"""Journals a change to the given kind of element, for batch().
+
+		Once the batch has made more changes than a quarter of the
+		graph's elements, rebuilding the indexes when it ends becomes
+		cheaper than maintaining them, so they are put aside.
+		"""
+		journal = self._journal
+		journal.append(undo)
+		self._touched.add(kind)
+		if self._deferred is None and len(journal) > (len(self._nodes) + len(self._edges)) // 4:
+			if self._indexes["nodes"] or self._indexes["edges"]:
+				self._deferred = self._indexes
+				self._indexes = {"nodes": {}, "edges": {}}
+
+	def _rollback(self, mark):
+		"""Undoes the journaled changes made since the journal had mark entries."""
+		journal = self._journal
+		# undoing changes must not journal them again; they keep the
+		# indexes that are in place up to date like any other change
+		self._journal = None
+		try:
+			while len(journal) > mark:
+				journal.pop()()
+		finally:
+			self._journal = journal
+		self._components = None
+
+	def _end_batch(self):
+		"""Puts back any indexes the batch put aside once the outermost one ends."""
+		deferred, touched = self._deferred, self._touched
+		self._journal = self._deferred = self._touched = None
+		if deferred is None: return
+		# those put aside missed the changes made since, and even a
+		# rollback leaves them as they were midway through the batch
+		created, self._indexes = self._indexes, deferred
+		for kind in touched:
+			for attribute, index in deferred[kind].items():
+				deferred[kind][attribute] = self._build_index(kind, attribute, isinstance(index, RangeIndex))
+		# those made since were kept up to date all along
+		for kind, attributes in created.items():
+			deferred[kind].update(attributes)
 
 	#################################################################
 	#			Operators				#
@@ -800,10 +2354,10 @@ class Graph:
 			True
 		"""
 		# if its a node
-		if isinstance(element, self.Node):
+		if isinstance(element, Node):
 			return element.name in self._nodes
 		# if its an edge
-		elif isinstance(element, self.Edge):
+		elif isinstance(element, Edge):
 			return element.name in self._edges
 		# if its a name
 		else:
@@ -815,6 +2369,7 @@ class Graph:
 
 		Raises KeyError if it is not found.
 		"""
+		self._claim()
 		name = self.get_name(name)
 		# get the element if it exists
 		element = self._nodes.get(name, False)
@@ -834,6 +2389,18 @@ class Graph:
 		"""Maps the - operator to the difference operation."""
 		return self.difference(other)
 
+	def __iand__(self, other):
+		"""Maps the &= operator to the intersection_update operation."""
+		return self.intersection_update(other)
+
+	def __ior__(self, other):
+		"""Maps the |= operator to the update operation."""
+		return self.update(other)
+
+	def __isub__(self, other):
+		"""Maps the -= operator to the difference_update operation."""
+		return self.difference_update(other)
+
 	def __eq__(self, other):
 		"""Compares based on node and edge names."""
 		if set(self._nodes.keys()) == set(other._nodes.keys()):
@@ -862,11 +2429,13 @@ class Graph:
 	@property
 	def nodes(self):
 		"""Returns an iterator over all the nodes in the graph."""
+		self._claim()
 		return self._nodes.values()
 
 	@property
 	def edges(self):
 		"""Returns an iterator over all the edges in the graph."""
+		self._claim()
 		return self._edges.values()
 
 	#################################################################
@@ -879,6 +2448,7 @@ class Graph:
 		If no element corresponds to the given name, raises
 		KeyError.
 		"""
+		self._claim()
 		if isinstance(item, GraphElement):
 			element = self._edges.get(item.name, False)
 			element = element or self._nodes.get(item.name, False)
@@ -919,14 +2489,52 @@ class Graph:
 			>>> g.add_node("bob", weight=5)
 			Node(name=bob, weight=5)
 		"""
-		# create the new node
+		return self._add_node(name, kwargs, False)
+
+	def add_nodes_from(self, nodes, unique=False):
+		"""Adds many nodes to the current graph.
+
+		nodes is either an iterable of node names or a mapping of
+		names to dictionaries of attributes, as for the constructor.
+		If unique is true, the caller guarantees that none of the
+		names is repeated or already in the graph, and the checks for
+		overwriting existing nodes are skipped.
+
+		Usage:
+			>>> g = Graph()
+			>>> g.add_nodes_from({"bob": {"weight": 5}, "bill": {}})
+			>>> g["bob"]
+			Node(name=bob, weight=5)
+		"""
+		add = self._add_node
+		with _bulk():
+			if hasattr(nodes, "items"):
+				for name, data in nodes.items():
+					add(name, dict(data) if data else {}, unique)
+			else:
+				for name in nodes:
+					add(name, {}, unique)
+
+	def _add_node(self, name, data, unique):
+		"""Adds a node with the given data, which it takes ownership of.
+
+		Unless unique is true, any existing node of the same name is
+		removed first.
+		"""
+		if self._sharing is not None: self._write()
 		if name is None: name = next(self._counter)
-		node = self.Node(name, **kwargs)
 		# remove any otherwise identical nodes
-		try: self.remove_node(node)
-		except: pass
+		if not unique and name in self._nodes: self.remove_node(name)
+		node = self.Node(name, **data)
 		# add the node to the backing data store
-		self._nodes[node._name] = node
+		self._nodes[name] = node
+		_set_graph(node, self)
+		if self._journal is not None:
+			self._record("nodes", lambda: self.remove_node(name))
+		if self._indexes["nodes"]:
+			self._index_element("nodes", name, data, True)
+		if self._components is not None:
+			self._components.add(name)
 		return node
 
 	def add_edge(self, start, end, name=None, is_directed=True, **kwargs):
@@ -947,28 +2555,85 @@ class Graph:
 			>>> g.add_edge(n1, n2, weight=5)
 			Edge(weight=5)
 		"""
+		return self._add_edge(start, end, name, is_directed, kwargs, False)
+
+	def add_edges_from(self, edges, unique=False):
+		"""Adds many edges to the current graph.
+
+		Each edge is a tuple of (start, end[, name[, is_directed[, data]]]),
+		where the optional items default as for add_edge and data is
+		a dictionary of attributes. Alternatively, edges may be a
+		mapping of such tuples to dictionaries of attributes, as for
+		the constructor. Endpoints that don't exist are created.
+
+		If unique is true, the caller guarantees that none of the edge
+		names is repeated or already in the graph, and the checks for
+		overwriting existing edges are skipped.
+
+		Usage:
+			>>> g = Graph()
+			>>> g.add_edges_from([("a", "b"), ("b", "c", "bc", False, {"weight": 5})])
+			>>> g["bc"]
+			Edge(name=bc, weight=5)
+		"""
+		if hasattr(edges, "items"): items = edges.items()
+		else: items = ((edge, None) for edge in edges)
+		def normalized():
+			for edge, data in items:
+				size = len(edge)
+				name = edge[2] if size > 2 else None
+				is_directed = edge[3] if size > 3 else True
+				if size > 4: data = edge[4]
+				if data:
+					# as with add_edge, the data may supply the name and direction
+					data = dict(data)
+					name = data.pop("name", name)
+					is_directed = data.pop("is_directed", is_directed)
+				else: data = {}
+				yield edge[0], edge[1], name, is_directed, data
+		with _bulk():
+			self._add_edges(normalized(), unique)
+
+	def _add_edges(self, edges, unique):
+		"""Adds (start, end, name, is_directed, data) tuples to the graph.
+
+		Backends can override this to fill their storage in bulk.
+		"""
+		add = self._add_edge
+		for start, end, name, is_directed, data in edges:
+			add(start, end, name, is_directed, data, unique)
+
+	def _add_edge(self, start, end, name, is_directed, data, unique):
+		"""Adds an edge with the given data, which it takes ownership of.
+
+		Unless unique is true, any existing edge of the same name is
+		removed first.
+		"""
+		if self._sharing is not None: self._write()
 		# get the start and end points, and create them if they don't exist
-		try: start = self.get_element(start)
-		except: start = self.add_node(start)
-		try: end = self.get_element(end)
-		except: end = self.add_node(end)
+		nodes = self._nodes
+		if isinstance(start, GraphElement): start = start.name
+		if isinstance(end, GraphElement): end = end.name
+		start_node = nodes.get(start)
+		if start_node is None: start_node = self._add_node(start, {}, True)
+		end_node = nodes.get(end)
+		if end_node is None: end_node = self._add_node(end, {}, True)
 		# build the edge
-		edge = self.Edge(start, end, name, is_directed=is_directed, **kwargs)
+		edge = self.Edge(start_node, end_node, name, is_directed=is_directed, **data)
+		name = edge._name
 		# remove any otherwise identical edges
-		try: self.remove_edge(edge)
-		except: pass
+		if not unique and name in self._edges: self.remove_edge(name)
 		# and add the edge to the backing data store
-		self._edges[edge.name] = edge
+		self._edges[name] = edge
+		_set_graph(edge, self)
+		if self._journal is not None:
+			self._record("edges", lambda: self.remove_edge(name))
+		if self._indexes["edges"]:
+			self._index_element("edges", name, data, True)
 		# now take care of adjacency tracking
-		if is_directed:
-			start._outgoing.append(edge)
-			end._incoming.append(edge)
-		else:
-			start._bidirectional.append(edge)
-			# stops the edge from being added twice if it is an undirected
-			# loop
-			if start is not end:
-				end._bidirectional.append(edge)
+		self._link(edge)
+		if self._components is not None:
+			self._components.union(start_node._name, end_node._name)
 		return edge
 
 	def remove_node(self, node):
@@ -981,13 +2646,20 @@ class Graph:
 			>>> n in g
 			False
 		"""
+		self._write()
 		# get the actual node if a name is passed in
 		node = self.get_element(node)
 		# remove it from adjacency tracking
-		for edge in node.edges:
+		for edge in list(node.edges):
 			self.remove_edge(edge)
 		# remove it from storage
 		n = self._nodes.pop(node.name)
+		n._graph = None
+		if self._journal is not None:
+			self._record("nodes", lambda: self._restore_node(n))
+		if self._indexes["nodes"]:
+			self._index_element("nodes", n.name, n.data, False)
+		self._components = None
 		return n
 
 	def remove_edge(self, edge):
@@ -1001,49 +2673,199 @@ class Graph:
 			>>> e in g
 			False
 		"""
+		self._write()
 		# get the actual edge if a name is passed
 		edge = self.get_element(edge)
 		# remove it from adjacency tracking
-		start = edge.start
-		end = edge.end
-		if edge.is_directed:
-			start._outgoing.remove(edge)
-			end._incoming.remove(edge)
-		else:
-			start._bidirectional.remove(edge)
-			# fix the undirected loop problem
-			if start is not end:
-				end._bidirectional.remove(edge)
+		self._unlink(edge)
 		# remove it from storage
 		e = self._edges.pop(edge.name)
+		e._graph = None
+		if self._journal is not None:
+			self._record("edges", lambda: self._restore_edge(e))
+		if self._indexes["edges"]:
+			self._index_element("edges", e.name, e.data, False)
+		# components can't be split incrementally, so forget them
+		self._components = None
 		return e
 
+	def _restore_node(self, node):
+		"""Puts back a node removed during a batch."""
+		self._write()
+		self._nodes[node._name] = node
+		_set_graph(node, self)
+		if self._indexes["nodes"]:
+			self._index_element("nodes", node._name, node.data, True)
+
+	def _restore_edge(self, edge):
+		"""Puts back an edge removed during a batch, after its endpoints."""
+		self._write()
+		self._edges[edge._name] = edge
+		_set_graph(edge, self)
+		if self._indexes["edges"]:
+			self._index_element("edges", edge._name, edge.data, True)
+		self._link(edge)
+
+	def _link(self, edge):
+		"""Adds the edge to its endpoints' adjacency mappings."""
+		start, end = edge._start, edge._end
+		if edge._directed:
+			_set_outgoing(start, _slot_add(start._outgoing, edge))
+			_set_incoming(end, _slot_add(end._incoming, edge))
+			if start is end:
+				start._loops += 1
+		else:
+			# an undirected loop is only stored once, since both
+			# ends share the same slot
+			_set_bidirectional(start, _slot_add(start._bidirectional, edge))
+			if end is not start:
+				_set_bidirectional(end, _slot_add(end._bidirectional, edge))
+
+	def _unlink(self, edge):
+		"""Removes the edge from its endpoints' adjacency mappings.
+
+		This is O(1) regardless of the endpoints' degrees.
+		"""
+		name, start, end = edge._name, edge._start, edge._end
+		if edge._directed:
+			_set_outgoing(start, _slot_remove(start._outgoing, name))
+			_set_incoming(end, _slot_remove(end._incoming, name))
+			if start is end:
+				start._loops -= 1
+		else:
+			_set_bidirectional(start, _slot_remove(start._bidirectional, name))
+			# undirected loops are only stored once
+			if end is not start:
+				_set_bidirectional(end, _slot_remove(end._bidirectional, name))
+
 	#########################################################################
 	#			Graph Inspection Tools  			#
 	#########################################################################
 
-	def search_nodes(self, **kwargs):
+	def create_index(self, kind, attribute, ordered=False):
+		"""Creates an index over an attribute of the graph's "nodes" or "edges".
+
+		Once created, the index is kept up to date as elements are
+		added, removed and modified, and searches on the attribute use
+		it instead of scanning every element. Ordered indexes keep
+		values sorted, which also speeds up search_range, but require
+		values to be mutually comparable.
+
+		Returns the index.
+
+		Usage:
+			>>> g = Graph()
+			>>> index = g.create_index("nodes", "color")
+			>>> n = g.add_node("bob", color="red")
+			>>> list(g.search_nodes(color="red"))
+			[Node(name=bob, color=red)]
+		"""
+		if kind not in self._indexes:
+			raise ValueError("Can only index nodes or edges, not %s" % kind)
+		self._write()
+		index = self._indexes[kind][attribute] = self._build_index(kind, attribute, ordered)
+		return index
+
+	def _build_index(self, kind, attribute, ordered):
+		"""Returns a new index over the given attribute of "nodes" or "edges"."""
+		index = RangeIndex() if ordered else HashIndex()
+		elements = self._nodes if kind == "nodes" else self._edges
+		items = []
+		for element in elements.values():
+			data = element.data
+			if attribute in data:
+				items.append((element.name, data[attribute]))
+		index.update(items)
+		return index
+
+	def drop_index(self, kind, attribute):
+		"""Removes the index on the given attribute of "nodes" or "edges".
+
+		Raises KeyError if there is no such index.
+		"""
+		self._write()
+		# a batch may have put the index aside
+		deferred = self._deferred
+		if deferred is not None and attribute in deferred[kind]:
+			del deferred[kind][attribute]
+			self._indexes[kind].pop(attribute, None)
+		else:
+			del self._indexes[kind][attribute]
+
+	def _index_element(self, kind, name, data, add):
+		"""Adds an element's data to, or removes it from, the indexes."""
+		for attribute, index in self._indexes[kind].items():
+			if attribute in data:
+				if add: index.add(name, data[attribute])
+				else: index.remove(name, data[attribute])
+
+	def _reindex(self, kind, name, attribute, old, new):
+		"""Updates the indexes when an element's attribute changes.
+
+		Either value may be _missing, for attributes being created or
+		deleted.
+		"""
+		index = self._indexes[kind].get(attribute)
+		if index is None: return
+		if old is not _missing: index.remove(name, old)
+		if new is not _missing: index.add(name, new)
+
+	def query(self, kind, *predicates, **criteria):
+		"""Returns a Query over the graph's "nodes" or "edges".
+
+		The query matches the elements that satisfy every predicate
+		and whose data attributes equal the keyword criteria. For
+		edges, the start, end and is_directed criteria constrain their
+		structure instead, and for either kind name looks the element
+		up directly.
+
+		Usage:
+			>>> g = Graph()
+			>>> e1 = g.add_edge("a", "b", weight=4)
+			>>> e2 = g.add_edge("b", "c", weight=9, color="red")
+			>>> list(g.query("edges", where("weight") > 5, color="red"))
+			[Edge(name=('b', 'c'), weight=9, color=red)]
+			>>> g.query("edges", start="a").first()
+			Edge(name=('a', 'b'), weight=4)
+		"""
+		if kind not in self._indexes:
+			raise ValueError("Can only query nodes or edges, not %s" % kind)
+		self._claim()
+		structural = ("name", "start", "end", "is_directed") if kind == "edges" else ("name",)
+		structure = {}
+		predicates = list(predicates)
+		for attribute, value in criteria.items():
+			if attribute in structural: structure[attribute] = value
+			else: predicates.append(Comparison(attribute, "==", value))
+		predicate = None
+		if len(predicates) == 1: predicate = predicates[0]
+		elif predicates: predicate = And(*predicates)
+		return Query(self, kind, predicate, structure)
+
+	def search_nodes(self, *predicates, **kwargs):
 		""" Convenience function to get nodes based on some properties.
 
+		Accepts the same arguments as query("nodes", ...).
+
 		Usage:
 			>>> g = Graph()
 			>>> n1 = g.add_node("bob")
-			>>> n2 = g.add_node("bill")
+			>>> n2 = g.add_node("bill", age=40)
 			>>> for node in g.search_nodes(name="bob"):
 			... 	print(node)
 			Node(name="bob")
+			>>> for node in g.search_nodes(where("age") >= 18):
+			... 	print(node)
+			Node(name=bill, age=40)
 		"""
-		desired_properties = set(kwargs.items())
-		for node in self.nodes:
-			properties = set(node.data.items())
-			if "name" in kwargs:
-				properties.add(("name", node.name))
-			if properties.issuperset(desired_properties):
-				yield node
+		for node in self.query("nodes", *predicates, **kwargs):
+			yield node
 
-	def search_edges(self, **kwargs):
+	def search_edges(self, *predicates, **kwargs):
 		"""Convenience function to get edges based on some properties.
 
+		Accepts the same arguments as query("edges", ...).
+
 		Usage:
 			>>> g = Graph()
 			>>> n1, n2 = g.add_node(), g.add_node()
@@ -1053,23 +2875,39 @@ class Graph:
 			... 	print(edge)
 			Edge(name=n1->n2, weight=5)
 		"""
-		if "start" in kwargs:
-			kwargs["start"] = self.get_element(kwargs["start"])
-		if "end" in kwargs:
-			kwargs["end"] = self.get_element(kwargs["end"])
-		desired_properties = set(kwargs.items())
-		for edge in self.edges:
-			attrs = set(edge.data.items())
-			if "name" in kwargs:
-				attrs.add(("name", edge.name))
-			if "start" in kwargs:
-				attrs.add(("start", edge.start))
-			if "end" in kwargs:
-				attrs.add(("end", edge.end))
-			if "is_directed" in kwargs:
-				attrs.add(("is_directed", edge.is_directed))
-			if attrs.issuperset(desired_properties):
-				yield edge
+		for edge in self.query("edges", *predicates, **kwargs):
+			yield edge
+
+	def search_range(self, kind, attribute, low=None, high=None):
+		"""Yields the "nodes" or "edges" whose attribute lies between low and high.
+
+		Both bounds are inclusive, and either may be None to leave the
+		range open on that side. If the attribute has an ordered index,
+		elements are yielded in order of value.
+
+		Usage:
+			>>> g = Graph()
+			>>> e = g.add_edge("a", "b", weight=4)
+			>>> list(g.search_range("edges", "weight", 3, 5))
+			[Edge(name=('a', 'b'), weight=4)]
+		"""
+		self._claim()
+		index = self._indexes[kind].get(attribute)
+		elements = self._nodes if kind == "nodes" else self._edges
+		if isinstance(index, RangeIndex):
+			for name in index.find_range(low, high):
+				yield elements[name]
+			return
+		for element in elements.values():
+			value = element.data.get(attribute, _missing)
+			if value is _missing: continue
+			try:
+				if low is not None and value < low: continue
+				if high is not None and value > high: continue
+			except TypeError:
+				# values that can't be compared are out of range
+				continue
+			yield element
 
 	def get_common_edges(self, n1, n2):
 		"""Gets the common edges between the two nodes.
@@ -1208,9 +3046,44 @@ class Graph:
 			w.send(selection)
 			yield selection
 
+	def _traverse(self, start, expand, frontier, push, pop):
+		"""Engine shared by the traversals.
+
+		start is an iterable of the initially discovered elements and
+		expand should return the elements adjacent to a visited one.
+		frontier is the container holding discovered but unvisited
+		elements, which push and pop add to and take from; it decides
+		the order of the traversal. A companion set records every
+		element that has been discovered, so each is visited once.
+		"""
+		seen = set()
+		for item in start:
+			if item not in seen:
+				seen.add(item)
+				push(item)
+		while frontier:
+			item = pop()
+			yield item
+			for adjacent in expand(item):
+				if adjacent not in seen:
+					seen.add(adjacent)
+					push(adjacent)
+
+	def _get_adjacent(self, node):
+		"""Returns the nodes adjacent to node along its outgoing edges."""
+		return node.get_adjacent()
+
+	def _incident_edges(self, edge):
+		"""Returns the edges sharing an endpoint with edge, in either direction."""
+		return chain(edge.start.edges, edge.end.edges)
+
 	def heuristic_traversal(self, root, selector):
 		"""Traverses the graph using selector as a selection filter on the unvisited nodes.
 
+		selector is passed the list of discovered but unvisited nodes,
+		and should remove and return one of them. See priority_traversal
+		for a faster alternative when the choice can be made by key.
+
 		Usage:
 			>>> g = Graph()
 			>>> n1, n2 = g.add_node("A"), g.add_node("B")
@@ -1220,27 +3093,12 @@ class Graph:
 			Node(name="A")
 			Node(name="B")
 		"""
-		# handle the its-a-name case
-		root = self.get_element(root)
 		# stores nodes that are known to the algorithm but not yet visited
 		discovered = []
-		visited = set()
-		discovered.append(root)
-		# while there are unprocessed nodes
-		while discovered:
-			# select the next one
-			next = selector(discovered)
-			yield next
-			# visit it
-			visited.add(next)
-			# get the adjacent nodes
-			adjacent = set(next.get_adjacent())
-			# filter it against those we've already visited
-			not_yet_visited = adjacent - visited
-			# make sure we're not double-adding
-			for node in not_yet_visited:
-				if node not in discovered:
-					discovered.append(node)
+		pop = lambda: selector(discovered)
+		start = [self.get_element(root)]
+		for node in self._traverse(start, self._get_adjacent, discovered, discovered.append, pop):
+			yield node
 
 	def heuristic_edge_traversal(self, root, selector):
 		"""Traverses the graph using selector as a selection filter on the unvisited edges.
@@ -1255,27 +3113,46 @@ class Graph:
 			>>> 	print(edge)
 			Edge(name='ab')
 		"""
-		# handle the its-a-name case
-		root = self.get_element(root)
 		# stores edges that are known to the algorithm but not yet visited
-		discovered = [edge for edge in root.outgoing]
-		visited = set()
-		# while there are unprocessed edges
-		while discovered:
-			# select the next one
-			next = selector(discovered)
-			yield next
-			# visit it
-			visited.add(next)
-			# get the incident edges
-			incident = set([edge for edge in next.start.edges])
-			incident |= set([edge for edge in next.end.edges])
-			# filter it against those we've already visited
-			not_yet_visited = incident - visited
-			# make sure we're not double-adding
-			for edge in not_yet_visited:
-				if edge not in discovered:
-					discovered.append(edge)
+		discovered = []
+		pop = lambda: selector(discovered)
+		start = self.get_element(root).outgoing
+		for edge in self._traverse(start, self._incident_edges, discovered, discovered.append, pop):
+			yield edge
+
+	def priority_traversal(self, root, key):
+		"""Traverses the graph, always visiting the discovered node with the lowest key.
+
+		key should be a callable that accepts a node and returns a
+		value to order it by. It is called once per node, when the
+		node is discovered, and ties are visited in discovery order.
+
+		Usage:
+			>>> g = Graph()
+			>>> e1, e2 = g.add_edge("A", "B"), g.add_edge("A", "C")
+			>>> for node in g.priority_traversal("A", lambda n: -n.degree):
+			>>> 	print(node)
+		"""
+		start = [self.get_element(root)]
+		for node in self._priority_traverse(start, self._get_adjacent, key):
+			yield node
+
+	def priority_edge_traversal(self, root, key):
+		"""Traverses the graph, always visiting the discovered edge with the lowest key.
+
+		Usage is otherwise identical to priority_traversal.
+		"""
+		start = self.get_element(root).outgoing
+		for edge in self._priority_traverse(start, self._incident_edges, key):
+			yield edge
+
+	def _priority_traverse(self, start, expand, key):
+		"""Runs _traverse with a binary heap ordered by key as the frontier."""
+		heap = []
+		tiebreaker = count()
+		push = lambda item: heapq.heappush(heap, (key(item), next(tiebreaker), item))
+		pop = lambda: heapq.heappop(heap)[2]
+		return self._traverse(start, expand, heap, push, pop)
 
 	def depth_first_traversal(self, root):
 		"""Traverses the graph by visiting a node, then a child of that node, and so on.
@@ -1293,7 +3170,11 @@ class Graph:
 			Node(name="D")
 			Node(name="C")
 		"""
-		for node in self.heuristic_traversal(root, lambda s: s.pop()):
+		stack = []
+		# children are pushed in reverse so that the first is visited first
+		expand = lambda node: reversed(node.get_adjacent())
+		start = [self.get_element(root)]
+		for node in self._traverse(start, expand, stack, stack.append, stack.pop):
 			yield node
 
 	def depth_first_edge_traversal(self, root):
@@ -1301,7 +3182,10 @@ class Graph:
 
 		Usage is identical to its node-centric kin.
 		"""
-		for edge in self.heuristic_edge_traversal(root, lambda s: s.pop()):
+		stack = []
+		expand = lambda edge: reversed(list(self._incident_edges(edge)))
+		start = reversed(list(self.get_element(root).outgoing))
+		for edge in self._traverse(start, expand, stack, stack.append, stack.pop):
 			yield edge
 
 	def breadth_first_traversal(self, root):
@@ -1320,7 +3204,9 @@ class Graph:
 			Node(name="C")
 			Node(name="D")
 		"""
-		for node in self.heuristic_traversal(root, lambda s: s.pop(0)):
+		queue = deque()
+		start = [self.get_element(root)]
+		for node in self._traverse(start, self._get_adjacent, queue, queue.append, queue.popleft):
 			yield node
 
 	def breadth_first_edge_traversal(self, root):
@@ -1328,7 +3214,9 @@ class Graph:
 
 		Usage is identical to its node-centric kin.
 		"""
-		for edge in self.heuristic_edge_traversal(root, lambda s: s.pop(0)):
+		queue = deque()
+		start = self.get_element(root).outgoing
+		for edge in self._traverse(start, self._incident_edges, queue, queue.append, queue.popleft):
 			yield edge
 
 	def topological_traversal(self):
@@ -1383,17 +3271,26 @@ class Graph:
 		"""
 		paths = self.get_shortest_paths(root)
 		levels = []
-		for end, path in paths.items():
-			while path.weight >= len(levels):
+		for end in paths:
+			distance = paths.distance(end)
+			while distance >= len(levels):
 				levels.append(set())
-			levels[path.weight].add(end)
+			levels[distance].add(end)
 		for i in levels: yield i
 
-	def get_connected_components(self):
-		"""Gets all the connected components from the graph.
+	def get_connected_components(self, incremental=False):
+		"""Gets all the (weakly) connected components from the graph.
 
 		Returns a list of sets of vertices.
 
+		Components are found with a disjoint-set forest over the node
+		names, in near-linear time.
+
+		If incremental is True, the forest is kept on the graph and
+		updated as nodes and edges are added, so that later calls only
+		pay for grouping the nodes. Removing or moving edges or nodes
+		discards it, and it will be rebuilt by the next incremental call.
+
 		Usage:
 			>>> g = Graph()
 			>>> n1 = g.add_node(group=1)
@@ -1403,36 +3300,16 @@ class Graph:
 			>>> g.get_connected_components()
 			[{Node(group=1), Node(group=1)}, {Node(group=2)}]
 		"""
-		# set of all connected components
-		connected = []
-		# iterate over the nodes
-		for node in self.nodes:
-			# get all the nodes that are reachable from this node
-			discovered = set(self.depth_first_traversal(node))
-			add_this = True
-			for component in connected:
-				# if the newly discovered component is part of
-				# an existing component
-				if discovered.issubset(component):
-					# don't add it
-					add_this = False
-					break
-				# if the existing component is a part of the
-				# newly discovered component
-				elif discovered.issuperset(component):
-					# don't add it
-					add_this = False
-					# but replace the old component with
-					# the new one
-					connected.remove(component)
-					connected.append(discovered)
-					continue
-			# if this component was not a part of an existing
-			# component or vice versa...
-			if add_this:
-				# add it to the components list
-				connected.append(discovered)
-		return connected
+		self._claim()
+		components = self._components
+		if components is None:
+			components = DisjointSet(self._nodes)
+			for edge in self.edges:
+				components.union(edge.start.name, edge.end.name)
+			if incremental:
+				self._components = components
+		nodes = self._nodes
+		return [set(nodes[name] for name in group) for group in components.groups()]
 
 	def get_strongly_connected(self):
 		"""Returns a list of all strongly connected components.
@@ -1441,28 +3318,70 @@ class Graph:
 
 		Usage is identical to get_connected_components.
 		"""
-		# list of all SCCs
-		strongly_connected_components = []
-		# iterate over all connected components
-		for c in self.get_connected_components():
-			# get an arbitrary node
-			arbitrary = c.pop()
-			# get all the nodes visitable from there
-			visited = [node for node in self.depth_first_traversal(arbitrary)]
-			# reverse the direction of the edges in the graph
-			self.transpose()
-			# while there are still elements which aren't reachable
-			while visited:
-				current_component = set()
-				for node in self.depth_first_traversal(visited.pop(0)):
-					current_component.add(node)
-					try:
-						visited.remove(node)
-					except:
-						pass
-			strongly_connected_components.append(current_component)
-			self.transpose()
-		return strongly_connected_components
+		return list(self.strongly_connected_traversal())
+
+	def strongly_connected_traversal(self):
+		"""Traverses the graph, yielding its strongly connected components.
+
+		This is an iterative version of Tarjan's algorithm, so it runs in
+		O(V+E), is not limited by the recursion depth and never modifies
+		the graph. Each component is yielded as a set of nodes as soon as
+		it is found, which is in reverse topological order: no component
+		has an edge to a component yielded after it.
+
+		The graph should not be modified while the traversal is running.
+
+		Usage:
+			>>> g = Graph(edges={('a','b'),('b','a'),('b','c')})
+			>>> for component in g.strongly_connected_traversal():
+			... 	print(component)
+			{Node(name=c)}
+			{Node(name=a), Node(name=b)}
+		"""
+		# discovery indices and lowlinks, keyed by name
+		index = {}
+		lowlink = {}
+		counter = count()
+		# the nodes not yet assigned to a component
+		stack = []
+		on_stack = set()
+		for root in self.nodes:
+			if root.name in index: continue
+			name = root.name
+			index[name] = lowlink[name] = next(counter)
+			stack.append(root)
+			on_stack.add(name)
+			# the explicit call stack holds (node, unvisited successors)
+			frames = [(root, iter(root.get_adjacent()))]
+			while frames:
+				node, successors = frames[-1]
+				name = node.name
+				for successor in successors:
+					successor_name = successor.name
+					if successor_name not in index:
+						# descend into the successor
+						index[successor_name] = lowlink[successor_name] = next(counter)
+						stack.append(successor)
+						on_stack.add(successor_name)
+						frames.append((successor, iter(successor.get_adjacent())))
+						break
+					elif successor_name in on_stack:
+						lowlink[name] = min(lowlink[name], index[successor_name])
+				else:
+					# all successors are done, so return to the parent
+					frames.pop()
+					if frames:
+						parent = frames[-1][0].name
+						lowlink[parent] = min(lowlink[parent], lowlink[name])
+					# and if this node is a root, pop off its component
+					if lowlink[name] == index[name]:
+						component = set()
+						while True:
+							member = stack.pop()
+							on_stack.remove(member.name)
+							component.add(member)
+							if member.name == name: break
+						yield component
 
 	def get_cycles(self):
 		"""Finds and returns a list of cycles in the current graph.
@@ -1511,11 +3430,14 @@ class Graph:
 		"""Finds the shortest path to all connected nodes from source.
 
 		The optional get_weight argument should be a callable that
-		accepts an edge and returns its weight.
+		accepts an edge and returns its (non-negative) weight.
 
-		Returns a dictionary of node -> subgraph mappings.
-		Each subgraph has an additional 'weight' attribute
-		that specifies the total weight of the path.
+		Returns a ShortestPathTree, which maps each reachable node to
+		its path from source. If pretty is True, each path is given as
+		a subgraph with an additional 'weight' attribute that specifies
+		the total weight of the path; otherwise, it is given as a
+		(weight, [edges]) pair. In both cases the path is only built
+		when it is looked up.
 
 		Usage:
 			>>> g = Graph()
@@ -1527,7 +3449,7 @@ class Graph:
 			>>> e2 = g.add_edge(n1, n4, weight=1)
 			>>> e3 = g.add_edge(n2, n3, weight=1)
 			>>> e4 = g.add_edge(n3, n4, weight=1)
-			>>> d = g.get_shortest_paths(n1, get_weight=lambda e: e.weight)
+			>>> d = g.get_shortest_paths(n1, get_weight=lambda e: e.weight, pretty=False)
 			>>> d[n1]
 			(0, [])
 			>>> d[n2]
@@ -1536,52 +3458,217 @@ class Graph:
 			(11, [Edge(weight=10), Edge(weight=1)])
 			>>> d[n4]
 			(1, [Edge(weight=1)])
+			>>> d.distance(n3)
+			11
 		"""
 		# handle the its-a-name case
 		source = self.get_element(source)
-		# create the paths table
-		paths = defaultdict(lambda: (float("inf"), []))
-		paths[source] = (0, [])
-		# create the minimum distance heap
-		unoptomized = [(0, source)]
-		# main loop
-		while unoptomized:
-			# pop the minimum distanced node
-			distance, current = heapq.heappop(unoptomized)
-			# iterate over its outgoing edges
-			for edge in current.outgoing:
-				# get the old path to the endpoint
-				old_weight, old_path = paths[edge.other_end(current)]
-				# get the weight of this path to the edge's end
-				weight, path = paths[current]
-				weight += get_weight(edge)
-				# if the new path is better than the old path
-				if weight < old_weight:
-					# relax it
-					paths[edge.other_end(current)] = (weight, path + [edge])
-					# and put it on the heap
-					heapq.heappush(unoptomized, (weight, edge.other_end(current)))
-		# this preserves compatibility with the old way
-		if not pretty:
-			return paths
+		distances = {}
+		parents = {}
+		for node in self._dijkstra(source, get_weight, distances, parents):
+			pass
+		return ShortestPathTree(self, source, distances, parents, pretty=pretty)
+
+	def get_shortest_path(self, source, target, get_weight=lambda e: 1, bidirectional=False):
+		"""Finds the shortest path from source to target.
+
+		The optional get_weight argument should be a callable that
+		accepts an edge and returns its (non-negative) weight.
+
+		Unlike get_shortest_paths, the search stops as soon as the
+		target's distance is known. If bidirectional is True, it
+		searches forward from source along outgoing edges and backward
+		from target along incoming edges at the same time, which
+		usually visits far fewer nodes on large graphs.
+
+		Returns a (weight, [edges]) pair, and raises ValueError if
+		there is no path from source to target.
+
+		Usage:
+			>>> g = Graph()
+			>>> ab = g.add_edge('a', 'b', weight=1)
+			>>> bc = g.add_edge('b', 'c', weight=1)
+			>>> ac = g.add_edge('a', 'c', weight=5)
+			>>> g.get_shortest_path('a', 'c', get_weight=lambda e: e.weight)
+			(2, [Edge(name=('a', 'b'), weight=1), Edge(name=('b', 'c'), weight=1)])
+		"""
+		source = self.get_element(source)
+		target = self.get_element(target)
+		if bidirectional:
+			return self._bidirectional_dijkstra(source, target, get_weight)
+		distances = {}
+		parents = {}
+		for node in self._dijkstra(source, get_weight, distances, parents):
+			if node == target:
+				tree = ShortestPathTree(self, source, distances, parents)
+				return (distances[target], tree.path(target))
+		raise ValueError("No path from %s to %s found" % (source, target))
+
+	def _bidirectional_dijkstra(self, source, target, get_weight):
+		"""Searches from both ends at once for the shortest source-target path.
+
+		Returns a (weight, [edges]) pair, and raises ValueError if there
+		is no such path.
+		"""
+		if source == target: return (0, [])
+		tiebreaker = count()
+		# index 0 is the forward search, index 1 the backward one
+		distances = ({source: 0}, {target: 0})
+		parents = ({}, {})
+		heaps = ([(0, next(tiebreaker), source)], [(0, next(tiebreaker), target)])
+		# the best known path length, and the node where it meets
+		best = float("inf")
+		meeting = None
+		while heaps[0] and heaps[1]:
+			# no unsettled node can lie on a path shorter than this
+			if heaps[0][0][0] + heaps[1][0][0] >= best: break
+			# expand the smaller frontier
+			side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+			distance, _, current = heapq.heappop(heaps[side])
+			if distance > distances[side][current]: continue
+			ours, theirs = distances[side], distances[1 - side]
+			# the backward search follows incoming edges
+			for edge, end in self._neighbours(current, reverse=side):
+				weight = distance + get_weight(edge)
+				if end not in ours or weight < ours[end]:
+					ours[end] = weight
+					parents[side][end] = (edge, current)
+					heapq.heappush(heaps[side], (weight, next(tiebreaker), end))
+				# see if this closes a shorter path
+				if end in theirs and ours[end] + theirs[end] < best:
+					best = ours[end] + theirs[end]
+					meeting = end
+		if meeting is None:
+			raise ValueError("No path from %s to %s found" % (source, target))
+		# join the two halves of the path at the meeting point
+		path = ShortestPathTree(self, source, distances[0], parents[0]).path(meeting)
+		parent = parents[1].get(meeting)
+		while parent is not None:
+			edge, node = parent
+			path.append(edge)
+			parent = parents[1].get(node)
+		return (best, path)
+
+	def astar(self, source, target, get_weight=lambda e: 1, heuristic=lambda node, target: 0):
+		"""Finds the shortest path from source to target using A* search.
+
+		get_weight should be a callable that accepts an edge and returns
+		its (non-negative) weight. heuristic should be a callable that
+		accepts a node and the target and returns a lower bound on the
+		weight of the path between them; the closer the bound, the fewer
+		nodes are visited. The default heuristic, which always returns
+		0, makes this equivalent to get_shortest_path.
+
+		For repeated queries on a static graph, a LandmarkHeuristic from
+		get_landmark_heuristic can be used when no domain-specific
+		heuristic is available.
+
+		Returns a (weight, [edges]) pair, and raises ValueError if
+		there is no path from source to target.
+
+		Usage:
+			>>> g = Graph()
+			>>> for x in range(3):
+			... 	for y in range(3):
+			... 		if x: g.add_edge((x-1, y), (x, y), is_directed=False)
+			... 		if y: g.add_edge((x, y-1), (x, y), is_directed=False)
+			>>> manhattan = lambda n, t: abs(n.name[0] - t.name[0]) + abs(n.name[1] - t.name[1])
+			>>> g.astar((0, 0), (2, 2), heuristic=manhattan)[0]
+			4
+		"""
+		source = self.get_element(source)
+		target = self.get_element(target)
+		distances = {source: 0}
+		parents = {}
+		# nodes are reinserted rather than having their keys decreased,
+		# and stale entries are skipped when they surface
+		tiebreaker = count()
+		heap = [(heuristic(source, target), next(tiebreaker), 0, source)]
+		while heap:
+			_, _, distance, current = heapq.heappop(heap)
+			if distance > distances[current]: continue
+			if current == target:
+				tree = ShortestPathTree(self, source, distances, parents)
+				return (distance, tree.path(target))
+			for edge, end in self._neighbours(current):
+				weight = distance + get_weight(edge)
+				if end not in distances or weight < distances[end]:
+					distances[end] = weight
+					parents[end] = (edge, current)
+					estimate = weight + heuristic(end, target)
+					heapq.heappush(heap, (estimate, next(tiebreaker), weight, end))
+		raise ValueError("No path from %s to %s found" % (source, target))
+
+	def get_landmark_heuristic(self, get_weight=lambda e: 1, landmarks=4):
+		"""Precomputes a landmark (ALT) heuristic for use with astar.
+
+		landmarks is either the number of landmarks to choose or an
+		iterable of the nodes to use. Chosen landmarks are spread out
+		by repeatedly picking the node farthest from those already
+		chosen.
+
+		The heuristic is only valid while the graph and the weights
+		returned by get_weight are unchanged.
+
+		Usage:
+			>>> h = g.get_landmark_heuristic(get_weight=lambda e: e.weight)
+			>>> g.astar('a', 'z', get_weight=lambda e: e.weight, heuristic=h)
+		"""
+		return LandmarkHeuristic(self, landmarks, get_weight)
+
+	def _neighbours(self, node, reverse=False):
+		"""Yields (edge, adjacent node) pairs for node's outgoing edges.
+
+		If reverse is True, incoming edges are followed back to their
+		starting points instead.
+		"""
+		if not reverse:
+			for edge in node.outgoing:
+				yield edge, edge.other_end(node)
 		else:
-			# makes it a lot prettier
-			processed_paths = {}
-			# turn the lists of edges into graphs
-			for endpoint, weight_and_edges in paths.items():
-				weight, path = weight_and_edges
-				# induce the graph on the edges
-				induced_path = self.edge_induce_subgraph(*path)
-				# give it a weight attribute
-				induced_path.weight = weight
-				# and fill the data structure
-				processed_paths[endpoint] = induced_path
-			return processed_paths
-
-	def minimum_span(self, weight=lambda e: 1):
+			for edge in node.incoming:
+				if edge.is_directed: yield edge, edge.start
+				else: yield edge, edge.other_end(node)
+
+	def _dijkstra(self, source, get_weight, distances, parents, reverse=False):
+		"""Runs Dijkstra's algorithm from source, yielding nodes as they are settled.
+
+		distances and parents should be dictionaries, which are filled
+		in with node -> distance and node -> (edge, previous node)
+		mappings as the search progresses. Nodes are yielded in order
+		of distance, and once a node has been yielded its entries are
+		final, so callers can stop the search early.
+
+		If reverse is True, the search follows edges backwards, finding
+		the distances from each node to source instead.
+		"""
+		distances[source] = 0
+		# the counter breaks ties, so nodes are never compared
+		tiebreaker = count()
+		heap = [(0, next(tiebreaker), source)]
+		while heap:
+			distance, _, current = heapq.heappop(heap)
+			# skip entries made stale by a later relaxation
+			if distance > distances[current]: continue
+			yield current
+			for edge, end in self._neighbours(current, reverse):
+				weight = distance + get_weight(edge)
+				if end not in distances or weight < distances[end]:
+					# relax it
+					distances[end] = weight
+					parents[end] = (edge, current)
+					heapq.heappush(heap, (weight, next(tiebreaker), end))
+
+	def minimum_span(self, weight=lambda e: 1, algorithm="kruskal", sorted_edges=None):
 		"""Returns the minimum spanning tree/forest for a given graph.
 
-		Returns a graph object that represents the MST/F.
+		Edge directions are ignored when building the tree. algorithm
+		may be "kruskal" or "prim", and sorted_edges may be given to
+		stream edges that are already in order of weight; see
+		minimum_span_edges for details.
+
+		Returns a graph object that represents the MST/F, containing
+		every node in the graph.
 
 		Usage:
 			>>> g = Graph()
@@ -1592,12 +3679,77 @@ class Graph:
 			... <graph object>
 
 		"""
-		tree = self.__class__()
-		for e in sorted(list(self.edges), key=weight):
-			if not ((e.start in tree) and (e.end in tree)):
-				tree.add_edge(e.start.name, e.end.name, e.name, **e.data)
+		tree = self._empty()
+		for node in self.nodes:
+			tree.add_node(node.name, **node.data)
+		for e in self.minimum_span_edges(weight, algorithm, sorted_edges):
+			tree.add_edge(e.start.name, e.end.name, e.name, is_directed=e.is_directed, **e.data)
 		return tree
 
+	def minimum_span_edges(self, weight=lambda e: 1, algorithm="kruskal", sorted_edges=None):
+		"""Iterates over the edges of the minimum spanning tree/forest.
+
+		"kruskal" sorts the edges by weight and joins components with a
+		disjoint-set forest, while "prim" grows each tree from a heap
+		of the edges leaving it, and is usually faster on dense graphs.
+
+		If sorted_edges is given, it should be an iterable over edges of
+		this graph in nondecreasing order of weight. It is consumed
+		lazily by Kruskal's algorithm, without being sorted or copied,
+		and the search stops as soon as every node has been spanned.
+		Prim's algorithm can't use it, so giving it with "prim" raises
+		ValueError.
+
+		Usage:
+			>>> g = Graph()
+			>>> g.add_edge('a', 'b', 'ab', weight=10)
+			>>> g.add_edge('a', 'c', 'ac', weight=10)
+			>>> g.add_edge('b', 'c', 'bc', weight=11)
+			>>> sorted(e.name for e in g.minimum_span_edges(lambda e: e.weight, "prim"))
+			['ab', 'ac']
+		"""
+		if algorithm == "kruskal":
+			if sorted_edges is None: sorted_edges = sorted(self.edges, key=weight)
+			return self._kruskal(sorted_edges)
+		if algorithm == "prim":
+			if sorted_edges is not None:
+				raise ValueError("sorted_edges can only be used with Kruskal's algorithm")
+			return self._prim(weight)
+		raise ValueError("Unknown spanning tree algorithm %s" % algorithm)
+
+	def _kruskal(self, edges):
+		"""Yields the edges that join components, given edges in weight order."""
+		components = DisjointSet()
+		remaining = self.order - 1
+		for edge in edges:
+			if remaining <= 0: return
+			if components.union(edge.start.name, edge.end.name):
+				remaining -= 1
+				yield edge
+
+	def _prim(self, weight):
+		"""Yields spanning edges, growing a tree from each unspanned node."""
+		spanned = set()
+		tiebreaker = count()
+		for root in self.nodes:
+			if root in spanned: continue
+			spanned.add(root)
+			heap = [(weight(e), next(tiebreaker), e) for e in root.edges]
+			heapq.heapify(heap)
+			while heap:
+				_, _, edge = heapq.heappop(heap)
+				# edges are left in the heap once both ends are spanned
+				if edge.end not in spanned: node = edge.end
+				elif edge.start not in spanned: node = edge.start
+				else: continue
+				spanned.add(node)
+				yield edge
+				for e in node.edges:
+					# directions are ignored, so take whichever end isn't node
+					other = e.start if e.end == node else e.end
+					if other not in spanned:
+						heapq.heappush(heap, (weight(e), next(tiebreaker), e))
+
 	@property
 	def size(self):
 		"""Reports the number of edges in the graph.
@@ -1636,27 +3788,18 @@ class Graph:
 
 		Does not change a directed edge into an undirected edge.
 		"""
+		self._write()
 		# get the edge if its a name
 		edge = self.get_element(edge)
-		if edge.is_directed:
-			edge.start._outgoing.remove(edge)
-			edge.end._incoming.remove(edge)
-		else:
-			try:	# to fix the problem with undirected loops
-				edge.start._bidirectional.remove(edge)
-				edge.end._bidirectional.remove(edge)
-			except:
-				pass
-		edge._start = start or edge.start
-		edge._end = end or edge.end
-		if edge.is_directed:
-			edge.start._outgoing.append(edge)
-			edge.end._incoming.append(edge)
-		else:
-			edge.start._bidirectional.append(edge)
-			# fix the problem with undirected loops
-			if start is not end:
-				edge.end._bidirectional.append(edge)
+		if self._journal is not None:
+			name, old_start, old_end = edge._name, edge._start, edge._end
+			self._record("edges", lambda: self.move_edge(name, old_start, old_end))
+		self._unlink(edge)
+		# the endpoints may be names, or elements of a graph this shared storage with
+		if start is not None: edge._start = self.get_element(start)
+		if end is not None: edge._end = self.get_element(end)
+		self._link(edge)
+		self._components = None
 		return edge
 
 	def contract_edge(self, edge, node_data):
@@ -1676,39 +3819,49 @@ class Graph:
 		2) Note that if multiple edges exist between the two nodes,
 		   this will still contract them!
 		"""
-		# get the edge if its a name
-		edge = self.get_element(edge)
-		# check to make sure that the given edge is the only edge between
-		# it endpoints
-		start = edge.start
-		end = edge.end
-		new_node = self.add_node(**node_data(start, end))
-		# delete the given edge
-		self.remove_edge(edge)
-		# move all incoming edges
-		for edge in start.incoming + end.incoming:
-			self.move_edge(edge, end=new_node)
-		# move all outgoing edges
-		for edge in start.outgoing + end.outgoing:
-			self.move_edge(edge, start=new_node)
-		# delete the existing endpoints
-		# remember, this may be a loop, so you may
-		# only be able to remove one.
-		try:
-			self.remove_node(start)
-			self.remove_node(end)
-		except KeyError:
-			pass
+		# make the whole contraction or none of it
+		with self.batch():
+			# take any copy of shared storage before looking the edge up
+			self._write()
+			# get the edge if its a name
+			edge = self.get_element(edge)
+			# check to make sure that the given edge is the only edge between
+			# it endpoints
+			start = edge.start
+			end = edge.end
+			new_node = self.add_node(**node_data(start, end))
+			# delete the given edge
+			self.remove_edge(edge)
+			# move all incoming edges
+			for edge in list(chain(start.incoming, end.incoming)):
+				self.move_edge(edge, end=new_node)
+			# move all outgoing edges
+			for edge in list(chain(start.outgoing, end.outgoing)):
+				self.move_edge(edge, start=new_node)
+			# delete the existing endpoints
+			# remember, this may be a loop, so you may
+			# only be able to remove one.
+			try:
+				self.remove_node(start)
+				self.remove_node(end)
+			except KeyError:
+				pass
 		return new_node
 
 	def transpose(self):
 		"""Reverses the directions on all edges in the current graph"""
-		for e in self.edges:
-			self.move_edge(e, start=e.end, end=e.start)
+		with self.batch():
+			# take any copy of shared storage before walking the edges
+			self._write()
+			for e in list(self.edges):
+				self.move_edge(e, start=e.end, end=e.start)
 
 	def induce_subgraph(self, *nodes):
 		"""Returns a new graph composed of only the specified nodes and their mutual edges.
 
+		Only the edges incident to the given nodes are inspected. To
+		avoid copying them at all, use subgraph_view.
+
 		Usage:
 
 		Set up your graph:
@@ -1739,38 +3892,32 @@ class Graph:
 			>>> new_mission.size
 			0
 		"""
-		g = self.__class__()
-		for node in nodes:
-			node = self.get_element(node)
-			name = node.name
-			data = node.data
-			n = g.add_node(name, **data)
-		for edge in self.edges:
-			if edge.start in g:
-				if edge.end in g:
-					name = edge.name
-					start = edge.start.name
-					end = edge.end.name
-					is_directed = edge.is_directed
-					data = edge.data
-					g.add_edge(start, end, name, **data)
-		return g
+		return SubgraphView(self, nodes).to_graph()
+
+	def subgraph_view(self, *nodes):
+		"""Returns a read-only view of the subgraph induced by the given nodes.
+
+		Unlike induce_subgraph, this doesn't copy anything; see SubgraphView.
+
+		Usage:
+			>>> g = Graph(edges=[("a", "b"), ("b", "c")])
+			>>> g.subgraph_view("b", "c").get_outgoing("b")
+			[Edge(name=('b', 'c'))]
+		"""
+		return SubgraphView(self, nodes)
 
 	def edge_induce_subgraph(self, *edges):
 		"""Similar to induce_subgraph but accepting edges rather than nodes."""
-		# create the new graph
-		g = self.__class__()
+		# keep the edges in the order given
+		nodes, chosen = OrderedDict(), OrderedDict()
 		for edge in edges:
 			edge = self.get_element(edge)
-			# and add them if they don't already exist
-			if edge.start not in g:
-				g.add_node(edge.start.name, **edge.start.data)
-			if edge.end not in g:
-				g.add_node(edge.end.name, **edge.end.data)
-		# iterate over the provided edges
-		for edge in edges:
-			# and add them, translating nodes as we go
-			g.add_edge(edge.start.name, edge.end.name, edge.name, **edge.data)
+			chosen[edge.name] = edge
+			# and their endpoints
+			for node in (edge.start, edge.end):
+				nodes[node.name] = node
+		g = self._empty()
+		g._merge(nodes, chosen)
 		return g
 
 	#########################################################################
@@ -1780,6 +3927,9 @@ class Graph:
 	def union(self, other):
 		"""Returns a new graph with all nodes and edges in either of its parents.
 
+		Where both parents have an element of the same name, the
+		other graph's version is used.
+
 		Usage:
 			>>> g1 = Graph()
 			>>> g2 = Graph()
@@ -1799,20 +3949,21 @@ class Graph:
 			>>> [edge.name for edge in g3.edges]
 			[2, 4, 6]
 		"""
-		# create the graph
-		g = self.__class__()
-		# add our nodes
-		for node in chain(self.nodes, other.nodes):
-			g.add_node(node.name, **node.data)
-		# and for edges
-		for edge in chain(self.edges, other.edges):
-			g.add_edge(edge.start.name, edge.end.name, edge.name, edge.is_directed, **edge.data)
+		# merge the name -> element mappings, theirs over ours
+		nodes = dict(self._nodes.items())
+		nodes.update(other._nodes.items())
+		edges = dict(self._edges.items())
+		edges.update(other._edges.items())
+		g = self._empty()
+		g._merge(nodes, edges)
 		return g
 
 	def intersection(self, other):
 		"""Returns a graph containing only the nodes and edges in both of its parents.
 
 		Note that both endpoints must exist in the new graph for an edge to exist.
+		Where the parents' versions of an element differ, the other
+		graph's version is used if it fits.
 
 		Usage:
 			>>> g1 = Graph()
@@ -1833,40 +3984,18 @@ class Graph:
 			>>> [edge.name for edge in g3.edges]
 			[4]
 		"""
-		# create the graph
-		g = self.__class__()
-		# iterate through our nodes
-		for node in self.nodes:
-			if node in other:
-				name = node.name
-				data = node.data
-				g.add_node(name, **data)
-		# and theirs
-		for node in other.nodes:
-			if node in self:
-				name = node.name
-				data = node.data
-				g.add_node(name, **data)
-		# ...and our edges...
-		for edge in self.edges:
-			if edge in other:
-				name = edge.name
-				start = edge.start
-				end = edge.end
-				if start in g and end in g:
-					is_directed = edge.is_directed
-					data = edge.data
-					g.add_edge(start.name, end.name, name, is_directed, **data)
-		# ...and theirs
-		for edge in other.edges:
-			if edge in self:
-				name = edge.name
-				start = edge.start
-				end = edge.end
-				if start in g and end in g:
-					is_directed = edge.is_directed
-					data = edge.data
-					g.add_edge(start.name, end.name, name, is_directed, **data)
+		theirs = other._nodes
+		nodes = dict((name, theirs[name]) for name in _shared_names(self._nodes, theirs))
+		ours, theirs = self._edges, other._edges
+		edges = {}
+		for name in _shared_names(ours, theirs):
+			# prefer their edge, but fall back to ours if only it fits
+			for edge in (theirs[name], ours[name]):
+				if edge._start._name in nodes and edge._end._name in nodes:
+					edges[name] = edge
+					break
+		g = self._empty()
+		g._merge(nodes, edges)
 		return g
 
 	def difference(self, other):
@@ -1885,25 +4014,113 @@ class Graph:
 			>>> f = g2.add_node(7)
 			>>> de = g2.add_edge(d, e, 4)
 			>>> ef = g2.add_edge(e, f, 6)
-			>>> g3 = g1 & g2
+			>>> g3 = g1 - g2
 			>>> [node.name for node in g3.nodes]
 			[1]
 			>>> [edge.name for edge in g3.edges]
 			[]
 		"""
-		# create the graph
-		g = self.__class__()
-		# create all the equivalent nodes
-		for node in self.nodes:
-			if node not in other:
-				g.add_node(node.name, **node.data)
-		# create all the equivalent edges
-		for edge in self.edges:
-			if edge not in other:
-				if edge.start in g and edge.end in g:
-					g.add_edge(edge.start, edge.end, edge.name, **edge.data)
+		theirs = other._nodes
+		nodes = dict((name, node) for name, node in self._nodes.items() if name not in theirs)
+		theirs = other._edges
+		edges = {}
+		for name, edge in self._edges.items():
+			if name not in theirs and edge._start._name in nodes and edge._end._name in nodes:
+				edges[name] = edge
+		g = self._empty()
+		g._merge(nodes, edges)
 		return g
 
+	def _merge(self, nodes, edges):
+		"""Adds copies of the elements in the given name -> element mappings.
+
+		None of the names may be in this graph already, and the
+		endpoints of every edge must be among the nodes.
+		"""
+		add = self._add_node
+		with _bulk():
+			for name, node in nodes.items():
+				add(name, dict(node.data), True)
+			self._add_edges(((edge._start._name, edge._end._name, name, edge._directed, dict(edge.data))
+				for name, edge in edges.items()), True)
+
+	def update(self, other):
+		"""Adds the nodes and edges of other to this graph, as for union.
+
+		Elements already in this graph are kept, but take on the other
+		graph's data attributes. Returns this graph.
+
+		Usage:
+			>>> g1 = Graph(nodes=[1])
+			>>> g2 = Graph(edges=[(1, 2)])
+			>>> g1 |= g2
+			>>> g1.order, g1.size
+			(2, 1)
+		"""
+		self._write()
+		nodes, edges = self._nodes, self._edges
+		new_nodes = {}
+		for name, node in other._nodes.items():
+			mine = nodes.get(name)
+			if mine is None: new_nodes[name] = node.data
+			else: _replace_data(mine, node.data)
+		self.add_nodes_from(new_nodes, unique=True)
+		new_edges = []
+		for name, edge in other._edges.items():
+			mine = edges.get(name)
+			if mine is not None:
+				if _same_ends(mine, edge):
+					_replace_data(mine, edge.data)
+					continue
+				self.remove_edge(name)
+			new_edges.append((edge._start._name, edge._end._name, name, edge._directed, edge.data))
+		self.add_edges_from(new_edges, unique=True)
+		return self
+
+	def intersection_update(self, other):
+		"""Removes the nodes and edges not in other, as for intersection.
+
+		Returns this graph.
+		"""
+		self._write()
+		theirs = other._nodes
+		removed = []
+		for name, node in self._nodes.items():
+			their_node = theirs.get(name)
+			if their_node is None: removed.append(name)
+			else: _replace_data(node, their_node.data)
+		for name in removed:
+			self.remove_node(name)
+		nodes, theirs = self._nodes, other._edges
+		removed, replaced = [], []
+		for name, edge in self._edges.items():
+			their_edge = theirs.get(name)
+			if their_edge is None:
+				removed.append(name)
+			elif _same_ends(edge, their_edge):
+				_replace_data(edge, their_edge.data)
+			elif their_edge._start._name in nodes and their_edge._end._name in nodes:
+				replaced.append(their_edge)
+		for name in removed:
+			self.remove_edge(name)
+		for edge in replaced:
+			self.remove_edge(edge.name)
+		self.add_edges_from([(edge._start._name, edge._end._name, edge._name, edge._directed, edge.data)
+			for edge in replaced], unique=True)
+		return self
+
+	def difference_update(self, other):
+		"""Removes the nodes and edges in other, as for difference.
+
+		Only the smaller of the two graphs is walked. Returns this graph.
+		"""
+		for name in _shared_names(self._nodes, other._nodes):
+			self.remove_node(name)
+		# removing the nodes also removed their edges
+		for name in _shared_names(self._edges, other._edges):
+			self.remove_edge(name)
+		return self
+
 	def contains(self, other):
 		"""Tests to see if other is a subgraph of this graph.
 
@@ -1913,3 +4130,649 @@ class Graph:
 			if set(self.edges).issuperset(other.edges):
 				return True
 		return False
+
+
+#########################################################################
+#			Compact Storage Backend				#
+#########################################################################
+
+# typecode used for the integer id arrays of the compact backend
+ID_TYPECODE = "l"
+
+# typecode of the arrays recording where each edge sits in its
+# endpoints' adjacency arrays
+POSITION_TYPECODE = "i"
+
+# marks the place of a removed edge in an adjacency array, until the
+# array is compacted
+_HOLE = -1
+
+
+class CompactElement(object):
+	"""Mixin for lightweight views onto elements of a CompactGraph.
+
+	A view only holds its graph and its integer id. Everything else-
+	name, structure and data attributes- lives in the graph's arrays
+	and tables and is looked up on demand, so views are cheap to make
+	and are created whenever an element is requested.
+
+	Note that two views of the same element are equal, but are not
+	necessarily the same object.
+	"""
+
+	# the name of the graph attribute holding this kind's data table
+	_table = None
+
+	def __init__(self, graph, id):
+		"""Binds the view to the element with the given id."""
+		object.__setattr__(self, "_graph", graph)
+		object.__setattr__(self, "_id", id)
+
+	def __getattr__(self, name):
+		"""Looks up data attributes in the graph's data table."""
+		if not name.startswith("_"):
+			data = getattr(self._graph, self._table).get(self._id, {})
+			if name in data: return data[name]
+		raise AttributeError("%s has no attribute %s" % (type(self).__name__, name))
+
+	def __setattr__(self, name, value):
+		"""Stores data attributes in the graph's data table."""
+		if name.startswith("_"):
+			object.__setattr__(self, name, value)
+		else:
+			graph = self._graph
+			graph._write()
+			data = getattr(graph, self._table).setdefault(self._id, {})
+			if graph._journal is not None:
+				graph._record(self._kind, _undo_attribute(self, name, data.get(name, _missing)))
+			if graph._indexes[self._kind]:
+				graph._reindex(self._kind, self._name, name, data.get(name, _missing), value)
+			data[name] = value
+
+	def __delattr__(self, name):
+		"""Removes data attributes from the graph's data table."""
+		if name.startswith("_"):
+			object.__delattr__(self, name)
+		else:
+			graph = self._graph
+			graph._write()
+			try: data = getattr(graph, self._table)[self._id]
+			except KeyError: raise AttributeError(name)
+			if name not in data: raise AttributeError(name)
+			if graph._journal is not None:
+				graph._record(self._kind, _undo_attribute(self, name, data[name]))
+			if graph._indexes[self._kind]:
+				graph._reindex(self._kind, self._name, name, data[name], _missing)
+			del data[name]
+
+	@property
+	def data(self):
+		"""Returns a read-only mapping of the data values of this element."""
+		return DataView(getattr(self._graph, self._table).get(self._id, _no_data))
+
+
+class CompactAdjacency(object):
+	"""Name -> edge mapping over one of a CompactGraph's adjacency arrays.
+
+	This gives CompactNodes the same adjacency interface as default
+	Nodes without copying the underlying array. kind is 0, 1 or 2
+	for the outgoing, incoming and bidirectional arrays.
+	"""
+
+	__slots__ = ("_graph", "_kind", "_node", "_ids")
+
+	def __init__(self, graph, kind, node):
+		self._graph = graph
+		self._kind = kind
+		self._node = node
+		self._ids = (graph._out, graph._in, graph._bi)[kind][node] or ()
+
+	def __len__(self):
+		return len(self._ids) - self._graph._holes.get((self._kind, self._node), 0)
+
+	def __contains__(self, name):
+		return self.get(name) is not None
+
+	def get(self, name, default=None):
+		graph = self._graph
+		id = graph._edge_ids.get(name)
+		if id is None: return default
+		# whether the edge is here follows from its endpoints and direction
+		if graph._directions[id]:
+			if self._kind == 2: return default
+			if (graph._starts, graph._ends)[self._kind][id] != self._node: return default
+		elif self._kind != 2 or self._node not in (graph._starts[id], graph._ends[id]):
+			return default
+		return graph._edge_view(id)
+
+	def values(self):
+		view = self._graph._edge_view
+		return (view(id) for id in self._ids if id != _HOLE)
+
+
+class CompactNode(CompactElement, Node):
+	"""Node view used by CompactGraph.
+
+	Its adjacency mappings wrap the graph's id arrays.
+	"""
+
+	_table = "_node_data"
+
+	@property
+	def _name(self):
+		return self._graph._node_names[self._id]
+
+	@property
+	def _incoming(self):
+		return CompactAdjacency(self._graph, 1, self._id)
+
+	@property
+	def _outgoing(self):
+		return CompactAdjacency(self._graph, 0, self._id)
+
+	@property
+	def _bidirectional(self):
+		return CompactAdjacency(self._graph, 2, self._id)
+
+	@property
+	def _loops(self):
+		return self._graph._loops.get(self._id, 0)
+
+
+class CompactEdge(CompactElement, Edge):
+	"""Edge view used by CompactGraph.
+
+	Its endpoints are recovered from the graph's start and end
+	arrays when they are asked for.
+	"""
+
+	_table = "_edge_data"
+
+	def other_end(self, starting_point):
+		"""Returns the other end of the edge from the given point.
+
+		If the point given is not an endpoint on this edge or the
+		endpoint on a directed edge, this raises AttributeError.
+		"""
+		g = self._graph
+		start = g._starts[self._id]
+		end = g._ends[self._id]
+		if isinstance(starting_point, GraphElement):
+			starting_point = starting_point.name
+		if starting_point == g._node_names[start]:
+			return g._node_view(end)
+		elif not g._directions[self._id]:
+			if starting_point == g._node_names[end]:
+				return g._node_view(start)
+		raise AttributeError("%s has no endpoint opposite to %s" % (self, starting_point))
+
+	@property
+	def _name(self):
+		return self._graph._edge_names[self._id]
+
+	@property
+	def _start(self):
+		return self._graph._node_view(self._graph._starts[self._id])
+
+	@property
+	def _end(self):
+		return self._graph._node_view(self._graph._ends[self._id])
+
+	@property
+	def _directed(self):
+		return bool(self._graph._directions[self._id])
+
+
+class ElementMap(object):
+	"""Read-only name to view mapping over a CompactGraph's elements.
+
+	It stands in for the _nodes and _edges dictionaries of the default
+	backend, so that Graph's lookup and inspection code works unchanged.
+	"""
+
+	def __init__(self, ids, view):
+		self._ids = ids
+		self._view = view
+
+	def __len__(self):
+		return len(self._ids)
+
+	def __iter__(self):
+		return iter(self._ids)
+
+	def __contains__(self, name):
+		return name in self._ids
+
+	def __getitem__(self, name):
+		return self._view(self._ids[name])
+
+	def get(self, name, default=None):
+		id = self._ids.get(name)
+		if id is None: return default
+		return self._view(id)
+
+	def keys(self):
+		return self._ids.keys()
+
+	def values(self):
+		return ElementValues(self._ids, self._view)
+
+	def items(self):
+		view = self._view
+		return ((name, view(id)) for name, id in self._ids.items())
+
+
+class ElementValues(object):
+	"""Sized, iterable view over the elements of a CompactGraph."""
+
+	def __init__(self, ids, view):
+		self._ids = ids
+		self._view = view
+
+	def __len__(self):
+		return len(self._ids)
+
+	def __iter__(self):
+		view = self._view
+		# take a snapshot of the ids so the graph can be modified while
+		# iterating, as with the default backend
+		for id in list(self._ids.values()):
+			yield view(id)
+
+	def __contains__(self, element):
+		return isinstance(element, GraphElement) and self._ids.get(element.name) is not None
+
+
+class CompactGraph(Graph):
+	"""A Graph storing its structure in integer arrays.
+
+	Node and edge names are interned to dense integer ids. Edge
+	endpoints and directions are kept in flat arrays indexed by edge
+	id, and each node's incoming, outgoing and bidirectional edges are
+	kept in an array of edge ids (allocated on its first edge). Data
+	attributes are stored in per-kind tables keyed by id, and only for
+	elements that have any.
+
+	Nodes and Edges handed out by a CompactGraph are lightweight views
+	created on demand, which expose the same API as their default
+	counterparts.
+
+	Ids of removed elements are not reused.
+
+	Usage:
+		>>> g = Graph(backend="compact")
+		>>> g.add_edge("a", "b", "ab", weight=5)
+		CompactEdge(name=ab, weight=5)
+		>>> g["a"].outgoing
+		[CompactEdge(name=ab, weight=5)]
+	"""
+
+	Node = CompactNode
+	Edge = CompactEdge
+
+	def __init__(self, nodes=set(), edges=set(), backend=None):
+		"""Initializes the compact storage and adds the given elements.
+
+		Arguments are as for Graph.
+		"""
+		# id -> name, name -> id, and id -> {attribute: value} for nodes
+		self._node_names = []
+		self._node_ids = {}
+		self._node_data = {}
+		# id -> array of edge ids, or None if the node has no such edges
+		self._out = []
+		self._in = []
+		self._bi = []
+		# id -> number of directed loops, for nodes that have any
+		self._loops = {}
+		# (0, 1 or 2 for _out, _in or _bi, id) -> number of holes left
+		# in that array by removed edges, for arrays that have any
+		self._holes = {}
+		# the same for edges, plus their endpoints and directions
+		self._edge_names = []
+		self._edge_ids = {}
+		self._edge_data = {}
+		self._starts = array(ID_TYPECODE)
+		self._ends = array(ID_TYPECODE)
+		self._directions = array("b")
+		# where each edge is in its start's and end's arrays
+		self._start_positions = array(POSITION_TYPECODE)
+		self._end_positions = array(POSITION_TYPECODE)
+		# name -> view mappings for Graph's lookup machinery
+		self._nodes = ElementMap(self._node_ids, self._node_view)
+		self._edges = ElementMap(self._edge_ids, self._edge_view)
+		self._counter = count()
+		self._components = None
+		self._indexes = {"nodes": {}, "edges": {}}
+		self.add_nodes_from(nodes)
+		self.add_edges_from(edges)
+
+	def snapshot(self):
+		"""Returns a copy-on-write clone of this graph, as for Graph.snapshot."""
+		snap = Graph.snapshot(self)
+		# views belong to the graph that made them, so nothing is borrowed
+		snap._borrowed = False
+		snap._nodes = ElementMap(snap._node_ids, snap._node_view)
+		snap._edges = ElementMap(snap._edge_ids, snap._edge_view)
+		return snap
+
+	def _write(self):
+		"""As for Graph._write, but since elements are views, the graph
+		being changed always takes the copy.
+		"""
+		if self._sharing is not None: self._unshare()
+
+	def _copy_storage(self):
+		"""Replaces the arrays and tables shared with other graphs by copies."""
+		self._node_names = list(self._node_names)
+		self._node_ids = dict(self._node_ids)
+		self._node_data = dict((id, dict(data)) for id, data in self._node_data.items())
+		self._out, self._in, self._bi = [[None if row is None else row[:] for row in table]
+			for table in (self._out, self._in, self._bi)]
+		self._loops = dict(self._loops)
+		self._holes = dict(self._holes)
+		self._edge_names = list(self._edge_names)
+		self._edge_ids = dict(self._edge_ids)
+		self._edge_data = dict((id, dict(data)) for id, data in self._edge_data.items())
+		self._starts = self._starts[:]
+		self._ends = self._ends[:]
+		self._directions = self._directions[:]
+		self._start_positions = self._start_positions[:]
+		self._end_positions = self._end_positions[:]
+		self._nodes = ElementMap(self._node_ids, self._node_view)
+		self._edges = ElementMap(self._edge_ids, self._edge_view)
+		self._components = None
+		self._indexes = self._copy_indexes(self._indexes)
+
+	def _node_view(self, id):
+		"""Returns a view of the node with the given id."""
+		return self.Node(self, id)
+
+	def _edge_view(self, id):
+		"""Returns a view of the edge with the given id."""
+		return self.Edge(self, id)
+
+	def _get_node_id(self, node):
+		"""Takes a node or a node name and returns its id.
+
+		Raises KeyError if it is not in this graph.
+		"""
+		if isinstance(node, GraphElement): node = node.name
+		return self._node_ids[node]
+
+	def _get_edge_id(self, edge):
+		"""Takes an edge or an edge name and returns its id.
+
+		Raises KeyError if it is not in this graph.
+		"""
+		if isinstance(edge, GraphElement): edge = edge.name
+		return self._edge_ids[edge]
+
+	def _link_id(self, id):
+		"""Adds the edge with the given id to its endpoints' arrays."""
+		start = self._starts[id]
+		end = self._ends[id]
+		if self._directions[id]:
+			tables = ((self._out, start, self._start_positions), (self._in, end, self._end_positions))
+			if start == end:
+				self._loops[start] = self._loops.get(start, 0) + 1
+		elif start != end:
+			tables = ((self._bi, start, self._start_positions), (self._bi, end, self._end_positions))
+		else:
+			tables = ((self._bi, start, self._start_positions),)
+		for table, node, positions in tables:
+			if table[node] is None: table[node] = array(ID_TYPECODE)
+			positions[id] = len(table[node])
+			table[node].append(id)
+
+	def _unlink_id(self, id, removed=None):
+		"""Removes the edge with the given id from its endpoints' arrays.
+
+		The arrays of removed, a node id, are left alone, since they
+		are about to be thrown away.
+		"""
+		start = self._starts[id]
+		end = self._ends[id]
+		if self._directions[id]:
+			if start != removed: self._punch(0, start, self._start_positions[id])
+			if end != removed: self._punch(1, end, self._end_positions[id])
+			if start == end:
+				self._loops[start] -= 1
+				if not self._loops[start]: del self._loops[start]
+		else:
+			if start != removed: self._punch(2, start, self._start_positions[id])
+			if start != end and end != removed: self._punch(2, end, self._end_positions[id])
+
+	def _punch(self, kind, node, position):
+		"""Leaves a hole at position in one of the node's arrays.
+
+		kind is 0, 1 or 2 for _out, _in or _bi. Holes keep removal
+		O(1) without disturbing the order of the other edges, and an
+		array is compacted once it is mostly holes, so that costs O(1)
+		amortized too.
+		"""
+		table = (self._out, self._in, self._bi)[kind]
+		row = table[node]
+		row[position] = _HOLE
+		key = (kind, node)
+		holes = self._holes.get(key, 0) + 1
+		if 2 * holes < len(row):
+			self._holes[key] = holes
+			return
+		self._holes.pop(key, None)
+		row = array(ID_TYPECODE, [id for id in row if id != _HOLE])
+		table[node] = row or None
+		# record where the remaining edges have moved to
+		starts, start_positions, end_positions = self._starts, self._start_positions, self._end_positions
+		for position, id in enumerate(row):
+			if kind == 0 or (kind == 2 and starts[id] == node): start_positions[id] = position
+			else: end_positions[id] = position
+
+	def _add_node(self, name, data, unique):
+		"""Adds a node with the given data, as for Graph._add_node."""
+		if self._sharing is not None: self._write()
+		if name is None: name = next(self._counter)
+		# remove any otherwise identical nodes
+		if not unique and name in self._node_ids: self.remove_node(name)
+		id = len(self._node_names)
+		self._node_names.append(name)
+		self._node_ids[name] = id
+		self._out.append(None)
+		self._in.append(None)
+		self._bi.append(None)
+		if data: self._node_data[id] = data
+		if self._journal is not None:
+			self._record("nodes", lambda: self.remove_node(name))
+		if self._indexes["nodes"]:
+			self._index_element("nodes", name, data, True)
+		if self._components is not None:
+			self._components.add(name)
+		return self._node_view(id)
+
+	def _add_edge(self, start, end, name, is_directed, data, unique):
+		"""Adds an edge with the given data, as for Graph._add_edge."""
+		if self._sharing is not None: self._write()
+		# get the start and end points, and create them if they don't exist
+		ids = self._node_ids
+		if isinstance(start, GraphElement): start = start.name
+		if isinstance(end, GraphElement): end = end.name
+		start = ids[start] if start in ids else self._add_node(start, {}, True)._id
+		end = ids[end] if end in ids else self._add_node(end, {}, True)._id
+		if name is None:
+			if is_directed: name = (self._node_names[start], self._node_names[end])
+			else: name = frozenset((self._node_names[start], self._node_names[end]))
+		# remove any otherwise identical edges
+		if not unique and name in self._edge_ids: self.remove_edge(name)
+		id = len(self._edge_names)
+		self._edge_names.append(name)
+		self._edge_ids[name] = id
+		self._starts.append(start)
+		self._ends.append(end)
+		self._directions.append(bool(is_directed))
+		self._start_positions.append(0)
+		self._end_positions.append(0)
+		if data: self._edge_data[id] = data
+		if self._journal is not None:
+			self._record("edges", lambda: self.remove_edge(name))
+		if self._indexes["edges"]:
+			self._index_element("edges", name, data, True)
+		self._link_id(id)
+		if self._components is not None:
+			self._components.union(self._node_names[start], self._node_names[end])
+		return self._edge_view(id)
+
+	def _add_edges(self, edges, unique):
+		"""Appends edges straight onto the arrays, as for Graph._add_edges.
+
+		When the edges are known to be unique and there are no indexes
+		or components to maintain, this avoids building a view for
+		every edge and linking each one through separate calls.
+		"""
+		if not unique or self._indexes["edges"] or self._components is not None or self._journal is not None:
+			return Graph._add_edges(self, edges, unique)
+		self._write()
+		node_ids, node_names = self._node_ids, self._node_names
+		edge_ids, edge_names, edge_data = self._edge_ids, self._edge_names, self._edge_data
+		starts, ends, directions = self._starts.append, self._ends.append, self._directions.append
+		start_positions, end_positions = self._start_positions.append, self._end_positions.append
+		outgoing, incoming, bidirectional, loops = self._out, self._in, self._bi, self._loops
+		add_node = self._add_node
+		for start, end, name, is_directed, data in edges:
+			if isinstance(start, GraphElement): start = start.name
+			if isinstance(end, GraphElement): end = end.name
+			s = node_ids.get(start)
+			if s is None: s = add_node(start, {}, True)._id
+			e = node_ids.get(end)
+			if e is None: e = add_node(end, {}, True)._id
+			if name is None:
+				if is_directed: name = (node_names[s], node_names[e])
+				else: name = frozenset((node_names[s], node_names[e]))
+			id = len(edge_names)
+			edge_names.append(name)
+			edge_ids[name] = id
+			starts(s)
+			ends(e)
+			directions(bool(is_directed))
+			if data: edge_data[id] = data
+			# link it, as _link_id does
+			if is_directed:
+				row = outgoing[s]
+				if row is None: row = outgoing[s] = array(ID_TYPECODE)
+				start_positions(len(row))
+				row.append(id)
+				row = incoming[e]
+				if row is None: row = incoming[e] = array(ID_TYPECODE)
+				end_positions(len(row))
+				row.append(id)
+				if s == e: loops[s] = loops.get(s, 0) + 1
+			else:
+				row = bidirectional[s]
+				if row is None: row = bidirectional[s] = array(ID_TYPECODE)
+				start_positions(len(row))
+				row.append(id)
+				if s != e:
+					row = bidirectional[e]
+					if row is None: row = bidirectional[e] = array(ID_TYPECODE)
+					end_positions(len(row))
+					row.append(id)
+				else:
+					end_positions(0)
+
+	def remove_node(self, node):
+		"""Removes a node from the graph.
+
+		Usage is identical to Graph.remove_node.
+		"""
+		self._write()
+		id = self._get_node_id(node)
+		# remove its edges, taking care to remove loops only once
+		incident = set()
+		for table in (self._out, self._in, self._bi):
+			if table[id]: incident.update(table[id])
+		incident.discard(_HOLE)
+		for edge in incident:
+			# only the other endpoints' arrays need the edge taken out
+			self._unlink_id(edge, id)
+			self._forget_edge(edge)
+		# and remove it from storage
+		self._out[id] = self._in[id] = self._bi[id] = None
+		for kind in (0, 1, 2):
+			self._holes.pop((kind, id), None)
+		del self._node_ids[self._node_names[id]]
+		data = self._node_data.pop(id, None)
+		if self._journal is not None:
+			self._record("nodes", lambda: self._restore_node(id, data))
+		if data and self._indexes["nodes"]:
+			self._index_element("nodes", self._node_names[id], data, False)
+		self._components = None
+		# views of removed elements have nothing left to look at, so
+		# hand back a detached Node holding the data, as Graph does
+		removed = Node(self._node_names[id])
+		if data: _set_attributes(removed, data)
+		return removed
+
+	def remove_edge(self, edge):
+		"""Removes an edge from the graph.
+
+		Usage is identical to Graph.remove_edge.
+		"""
+		self._write()
+		id = self._get_edge_id(edge)
+		self._unlink_id(id)
+		data = self._forget_edge(id)
+		self._components = None
+		# a detached Edge holding the data, between views of the endpoints
+		removed = Edge(self._node_view(self._starts[id]), self._node_view(self._ends[id]),
+			self._edge_names[id], bool(self._directions[id]))
+		if data: _set_attributes(removed, data)
+		return removed
+
+	def _forget_edge(self, id):
+		"""Removes an unlinked edge's name and data from storage, and returns the data."""
+		name = self._edge_names[id]
+		del self._edge_ids[name]
+		data = self._edge_data.pop(id, None)
+		if self._journal is not None:
+			self._record("edges", lambda: self._restore_edge(id, data))
+		if data and self._indexes["edges"]:
+			self._index_element("edges", name, data, False)
+		return data
+
+	def _restore_node(self, id, data):
+		"""Puts back a node removed during a batch."""
+		self._write()
+		self._node_ids[self._node_names[id]] = id
+		if data: self._node_data[id] = data
+		if data and self._indexes["nodes"]:
+			self._index_element("nodes", self._node_names[id], data, True)
+
+	def _restore_edge(self, id, data):
+		"""Puts back an edge removed during a batch, after its endpoints."""
+		self._write()
+		self._edge_ids[self._edge_names[id]] = id
+		if data: self._edge_data[id] = data
+		if data and self._indexes["edges"]:
+			self._index_element("edges", self._edge_names[id], data, True)
+		self._link_id(id)
+
+	def move_edge(self, edge, start=None, end=None):
+		"""Moves the edge, leaving its data intact.
+
+		Does not change a directed edge into an undirected edge.
+		"""
+		self._write()
+		id = self._get_edge_id(edge)
+		if self._journal is not None:
+			name, names = self._edge_names[id], self._node_names
+			old_start, old_end = names[self._starts[id]], names[self._ends[id]]
+			self._record("edges", lambda: self.move_edge(name, old_start, old_end))
+		self._unlink_id(id)
+		if start is not None: self._starts[id] = self._get_node_id(start)
+		if end is not None: self._ends[id] = self._get_node_id(end)
+		self._link_id(id)
+		self._components = None
+		return self._edge_view(id)
+
+
+Graph.backends["default"] = Graph
+Graph.backends["compact"] = CompactGraph
@@ -0,0 +1,13 @@
+"""
+Benchmarks for Graphine.
+
+Times the core Graph operations on generated graphs of increasing
+size and reports the results as JSON, so that runs made at different
+commits can be compared. To run every benchmark with the default
+sizes and print the report:
+
+	$ python -m graph.benchmarks
+
+See graph.benchmarks.runner for the options, and
+graph.benchmarks.suite for the benchmarks themselves.
+"""
@@ -0,0 +1,172 @@
+#! /usr/bin/env python
+
+"""
+runner.py
+
+Licensed under GPLv3
+
+This module times the benchmarks in graph.benchmarks.suite and
+reports the results as JSON.
+
+A report records where it was made- the commit, Python version and
+platform- along with one result for each benchmark, backend and
+size, giving every repetition's time in seconds and their minimum,
+median and mean. The minimum is the least disturbed by other work
+on the machine, so it is what compare() uses.
+
+Usage:
+
+	$ python -m graph.benchmarks --sizes 1000 10000 --output before.json
+	$ git checkout my-branch
+	$ python -m graph.benchmarks --sizes 1000 10000 --compare before.json
+
+The second command exits with status 1 if any benchmark got slower
+by more than the tolerance.
+"""
+
+# Copyright (C) 2009 Geremy Condra
+#
+# This file is part of Graphine.
+#
+# Graphine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Graphine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
+
+from timeit import default_timer
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from graph.benchmarks import suite
+
+# the version of the report layout
+FORMAT = 1
+
+DEFAULT_SIZES = (1000, 10000)
+
+def measure(benchmark, size, backend, repeat=3):
+	"""Returns the times, in seconds, of repeat runs of a benchmark."""
+	times = []
+	for i in range(repeat):
+		operation = benchmark(size, backend)
+		# start each run without garbage left over from the setup
+		gc.collect()
+		start = default_timer()
+		operation()
+		times.append(default_timer() - start)
+	return times
+
+def summarize(times):
+	"""Returns the minimum, median and mean of a list of times."""
+	ordered = sorted(times)
+	middle = len(ordered) // 2
+	if len(ordered) % 2: median = ordered[middle]
+	else: median = (ordered[middle - 1] + ordered[middle]) / 2.0
+	return {"min": ordered[0], "median": median, "mean": sum(ordered) / len(ordered)}
+
+def _commit():
+	"""Returns the checked out git commit, or None if it can't be found."""
+	directory = os.path.dirname(os.path.abspath(__file__))
+	try:
+		with open(os.devnull, "w") as null:
+			output = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=directory, stderr=null)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+	return output.decode("ascii").strip()
+
+def run(sizes=DEFAULT_SIZES, backends=("default",), names=None, repeat=3, log=None):
+	"""Runs the benchmarks and returns the report, as a dictionary.
+
+	names selects the benchmarks to run, defaulting to all of them.
+	If log is given, it is called with a line of progress after each
+	benchmark.
+
+	Raises KeyError for unknown benchmark names.
+	"""
+	if names is None: names = list(suite.BENCHMARKS)
+	benchmarks = [(name, suite.BENCHMARKS[name]) for name in names]
+	results = []
+	for size in sizes:
+		for backend in backends:
+			for name, benchmark in benchmarks:
+				times = measure(benchmark, size, backend, repeat)
+				result = {"name": name, "backend": backend, "size": size, "times": times}
+				result.update(summarize(times))
+				results.append(result)
+				if log: log("%-26s %-8s %9d %10.4fs" % (name, backend, size, result["min"]))
+			# the shared graphs of one size and backend aren't needed again
+			suite.clear()
+	return {
+		"format": FORMAT,
+		"created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+		"commit": _commit(),
+		"python": platform.python_version(),
+		"implementation": platform.python_implementation(),
+		"platform": platform.platform(),
+		"repeat": repeat,
+		"results": results,
+	}
+
+def compare(baseline, report, tolerance=0.1):
+	"""Compares two reports, returning the results they have in common.
+
+	Each is a (name, backend, size, old, new, ratio) tuple, where old
+	and new are the minimum times and ratio is new / old, in the order
+	of report. Results whose ratio exceeds 1 + tolerance are
+	regressions.
+	"""
+	old = dict(((r["name"], r["backend"], r["size"]), r["min"]) for r in baseline["results"])
+	comparison = []
+	for result in report["results"]:
+		key = (result["name"], result["backend"], result["size"])
+		if key not in old: continue
+		ratio = result["min"] / old[key] if old[key] else float("inf")
+		comparison.append(key + (old[key], result["min"], ratio))
+	return comparison
+
+def main(argv=None):
+	"""Runs the benchmarks from the command line, returning the exit status."""
+	parser = argparse.ArgumentParser(prog="python -m graph.benchmarks", description="Times core Graphine operations and reports the results as JSON.")
+	parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="numbers of nodes in the generated graphs")
+	parser.add_argument("--backends", nargs="+", default=["default"], choices=sorted(suite.Graph.backends), help="graph backends to benchmark")
+	parser.add_argument("--benchmarks", nargs="+", choices=list(suite.BENCHMARKS), help="benchmarks to run, defaulting to all")
+	parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark")
+	parser.add_argument("--output", help="file to write the report to, instead of standard output")
+	parser.add_argument("--compare", metavar="BASELINE", help="report to compare against")
+	parser.add_argument("--tolerance", type=float, default=0.1, help="slowdown allowed before a comparison fails")
+	parser.add_argument("--quiet", action="store_true", help="don't log progress")
+	options = parser.parse_args(argv)
+	baseline = None
+	if options.compare:
+		with open(options.compare) as f:
+			baseline = json.load(f)
+	def log(line):
+		sys.stderr.write(line + "\n")
+	report = run(options.sizes, options.backends, options.benchmarks, options.repeat, None if options.quiet else log)
+	text = json.dumps(report, indent=1, sort_keys=True)
+	if options.output:
+		with open(options.output, "w") as f:
+			f.write(text + "\n")
+	else:
+		sys.stdout.write(text + "\n")
+	if baseline is None: return 0
+	status = 0
+	for name, backend, size, old, new, ratio in compare(baseline, report, options.tolerance):
+		regressed = ratio > 1 + options.tolerance
+		if regressed: status = 1
+		sys.stderr.write("%-26s %-8s %9d %10.4fs -> %10.4fs %6.2fx%s\n" % (name, backend, size, old, new, ratio, "  REGRESSION" if regressed else ""))
+	return status
@@ -0,0 +1,209 @@
+#! /usr/bin/env python
+
+"""
+suite.py
+
+Licensed under GPLv3
+
+This module contains the benchmarks run by graph.benchmarks.
+
+Each benchmark is a function taking the size of the graph to work
+on and the name of the backend to store it in. It does whatever
+setup shouldn't be timed, and returns a callable performing the
+operation being measured. The runner calls the benchmark afresh
+for every repetition, so operations that modify their graph always
+start from the same state.
+
+Graphs are generated with the seeded constructors in
+graph.extras.constructors, so every run works on the same graphs.
+"""
+
+# Copyright (C) 2009 Geremy Condra
+#
+# This file is part of Graphine.
+#
+# Graphine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Graphine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+from io import BytesIO
+
+from graph.base import Graph
+from graph.extras import constructors, graphml
+from graph.extras.dot import DotGenerator
+
+# the seed all the generated graphs are built from
+SEED = 1
+
+# the number of edges attaching each new node in the scale-free graphs
+DEGREE = 3
+
+# the number of highest-degree nodes removed by remove_node_hubs
+HUBS = 10
+
+# benchmark name -> benchmark, in the order they were defined
+BENCHMARKS = OrderedDict()
+
+def benchmark(name):
+	"""Registers the decorated function as the benchmark called name."""
+	def register(function):
+		BENCHMARKS[name] = function
+		return function
+	return register
+
+# (kind, size, backend, seed) -> graph, for benchmarks that only read them
+_graphs = {}
+
+def scale_free(size, backend, seed=SEED, shared=True):
+	"""Returns a connected, undirected scale-free graph of size nodes.
+
+	Unless shared is false, the graph may be shared with other
+	benchmarks, and must not be modified.
+	"""
+	key = ("scale free", size, backend, seed)
+	if shared and key in _graphs: return _graphs[key]
+	graph = constructors.barabasi_albert(size, DEGREE, seed=seed, backend=backend)
+	if shared: _graphs[key] = graph
+	return graph
+
+def random_directed(size, backend):
+	"""Returns a shared, sparse random directed graph of size nodes."""
+	key = ("random directed", size, backend, SEED)
+	if key not in _graphs:
+		p = min(1.0, float(DEGREE) / size)
+		_graphs[key] = constructors.erdos_renyi(size, p, is_directed=True, seed=SEED, backend=backend)
+	return _graphs[key]
+
+def clear():
+	"""Forgets the shared graphs, freeing their memory."""
+	_graphs.clear()
+
+def _edge_list(size, backend):
+	"""Returns the endpoint names of the scale-free graph's edges."""
+	return [(edge.start.name, edge.end.name) for edge in scale_free(size, backend).edges]
+
+class _Sink(object):
+	"""A text file object which discards what is written to it."""
+
+	def write(self, text):
+		pass
+
+@benchmark("add_node")
+def add_node(size, backend):
+	g = Graph(backend=backend)
+	def run():
+		for i in range(size):
+			g.add_node(i)
+	return run
+
+@benchmark("add_edge")
+def add_edge(size, backend):
+	g = Graph(backend=backend)
+	g.add_nodes_from(range(size), unique=True)
+	edges = _edge_list(size, backend)
+	def run():
+		for start, end in edges:
+			g.add_edge(start, end)
+	return run
+
+@benchmark("add_edges_from")
+def add_edges_from(size, backend):
+	g = Graph(backend=backend)
+	g.add_nodes_from(range(size), unique=True)
+	edges = _edge_list(size, backend)
+	def run():
+		g.add_edges_from(edges, unique=True)
+	return run
+
+@benchmark("remove_node_hubs")
+def remove_node_hubs(size, backend):
+	g = scale_free(size, backend, shared=False)
+	hubs = sorted(g.nodes, key=lambda node: node.degree)[-HUBS:]
+	hubs = [node.name for node in hubs]
+	def run():
+		for hub in hubs:
+			g.remove_node(hub)
+	return run
+
+@benchmark("depth_first_traversal")
+def depth_first_traversal(size, backend):
+	g = scale_free(size, backend)
+	def run():
+		for node in g.depth_first_traversal(0):
+			pass
+	return run
+
+@benchmark("breadth_first_traversal")
+def breadth_first_traversal(size, backend):
+	g = scale_free(size, backend)
+	def run():
+		for node in g.breadth_first_traversal(0):
+			pass
+	return run
+
+@benchmark("get_shortest_paths")
+def get_shortest_paths(size, backend):
+	g = scale_free(size, backend)
+	return lambda: g.get_shortest_paths(0)
+
+@benchmark("get_connected_components")
+def get_connected_components(size, backend):
+	g = scale_free(size, backend)
+	return lambda: g.get_connected_components()
+
+@benchmark("get_strongly_connected")
+def get_strongly_connected(size, backend):
+	g = random_directed(size, backend)
+	return lambda: g.get_strongly_connected()
+
+@benchmark("induce_subgraph")
+def induce_subgraph(size, backend):
+	g = scale_free(size, backend)
+	nodes = range(0, size, 2)
+	return lambda: g.induce_subgraph(*nodes)
+
+@benchmark("induce_small_subgraph")
+def induce_small_subgraph(size, backend):
+	g = scale_free(size, backend)
+	nodes = range(0, size, max(1, size // 10))
+	return lambda: g.induce_subgraph(*nodes)
+
+@benchmark("union")
+def union(size, backend):
+	g1, g2 = scale_free(size, backend), scale_free(size, backend, SEED + 1)
+	return lambda: g1 | g2
+
+@benchmark("intersection")
+def intersection(size, backend):
+	g1, g2 = scale_free(size, backend), scale_free(size, backend, SEED + 1)
+	return lambda: g1 & g2
+
+@benchmark("difference")
+def difference(size, backend):
+	g1, g2 = scale_free(size, backend), scale_free(size, backend, SEED + 1)
+	return lambda: g1 - g2
+
+@benchmark("graphml_round_trip")
+def graphml_round_trip(size, backend):
+	g = scale_free(size, backend)
+	def run():
+		buffer = BytesIO()
+		graphml.store(g, buffer)
+		buffer.seek(0)
+		graphml.load(buffer, backend=backend)
+	return run
+
+@benchmark("dot_write")
+def dot_write(size, backend):
+	g = scale_free(size, backend)
+	return lambda: DotGenerator().write(g, _Sink())
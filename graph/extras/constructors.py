@@ -30,9 +30,20 @@ of graphs using Graphine.
 # You should have received a copy of the GNU General Public License
 # along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
 
+from itertools import product
+from math import log
+import random
+
 from graph.base import Graph
 
-def K(n):
+def _build(nodes, edges, backend=None):
+	"""Builds a graph from node names and edge tuples known to be unique."""
+	g = Graph(backend=backend)
+	g.add_nodes_from(nodes, unique=True)
+	g.add_edges_from(edges, unique=True)
+	return g
+
+def K(n, backend=None):
 	"""Generates a completely connected undirected graph of size n.
 
 	The verticies are numbered [0, n).
@@ -40,19 +51,10 @@ def K(n):
 	The edges are named after the verticies they connect such that
 	an edge connected verticies 1 and 2 is named (1,2).
 	"""
-	# create the graph
-	k = Graph()
-	# generate all the nodes
-	for i in range(n):
-		k.add_node(i)
-	# generate all the edges
-	for i in range(n):
-		for j in range(i+1, n):
-			k.add_edge(i, j, (i,j), is_directed=False)
-	# return the graph
-	return k
-
-def cycle(n, is_directed=True):
+	edges = ((i, j, (i,j), False) for i in range(n) for j in range(i+1, n))
+	return _build(range(n), edges, backend)
+
+def cycle(n, is_directed=True, backend=None):
 	"""Generates a cycle of size n.
 
 	The verticies are numbered [0, n).
@@ -60,10 +62,163 @@ def cycle(n, is_directed=True):
 	The edges are named after the verticies they connect such that
 	an edge connecting verticies 1 and 2 is named (1,2).
 	"""
-	G = Graph()
-	for i in range(n):
-		G.add_node(i)
-	for i in range(n):
-		j = (i + 1) % n
-		G.add_edge(i, j, (i,j), is_directed=is_directed)
-	return G
+	edges = ((i, (i + 1) % n, (i, (i + 1) % n), is_directed) for i in range(n))
+	return _build(range(n), edges, backend)
+
+def path(n, is_directed=True, backend=None):
+	"""Generates a path of n verticies.
+
+	The verticies are numbered [0, n), and the edges connect each
+	vertex i to i+1 and are named (i, i+1).
+	"""
+	edges = ((i, i + 1, (i, i + 1), is_directed) for i in range(n - 1))
+	return _build(range(n), edges, backend)
+
+def star(n, is_directed=False, backend=None):
+	"""Generates a star with n leaves.
+
+	The center is vertex 0 and the leaves are numbered [1, n]. Each
+	edge runs from the center to a leaf i, and is named (0, i).
+	"""
+	edges = ((0, i, (0, i), is_directed) for i in range(1, n + 1))
+	return _build(range(n + 1), edges, backend)
+
+def grid(rows, columns, is_directed=False, backend=None):
+	"""Generates a rows x columns lattice.
+
+	The verticies are named (row, column), and each is connected to
+	the vertex to its right and the one below it. Edges are named
+	after the verticies they connect, such that the edge from (0, 0)
+	to (0, 1) is named ((0, 0), (0, 1)).
+	"""
+	def edges():
+		for r in range(rows):
+			for c in range(columns):
+				if c + 1 < columns:
+					yield (r, c), (r, c + 1), ((r, c), (r, c + 1)), is_directed
+				if r + 1 < rows:
+					yield (r, c), (r + 1, c), ((r, c), (r + 1, c)), is_directed
+	return _build(product(range(rows), range(columns)), edges(), backend)
+
+def complete_bipartite(m, n, is_directed=False, backend=None):
+	"""Generates the complete bipartite graph K(m, n).
+
+	The first part is numbered [0, m) and the second [m, m+n). Every
+	vertex i of the first part is connected to every vertex j of the
+	second by an edge named (i, j), directed from i to j if is_directed
+	is true.
+	"""
+	edges = ((i, j, (i, j), is_directed) for i in range(m) for j in range(m, m + n))
+	return _build(range(m + n), edges, backend)
+
+def _skips(total, p, rng):
+	"""Yields each index in [0, total) independently with probability p.
+
+	Rather than drawing a number for every index, the gaps between
+	chosen indices are drawn from the geometric distribution, so this
+	takes time proportional to the number of indices chosen.
+	"""
+	if p <= 0: return
+	if p >= 1:
+		for i in range(total): yield i
+		return
+	scale = log(1 - p)
+	i = -1
+	while True:
+		i += 1 + int(log(1 - rng.random()) / scale)
+		if i >= total: return
+		yield i
+
+def erdos_renyi(n, p, is_directed=False, seed=None, backend=None):
+	"""Generates a random graph in which each edge exists with probability p.
+
+	The verticies are numbered [0, n). Each of the possible edges
+	between distinct verticies- both directions of each pair, if
+	is_directed is true- is present independently with probability
+	p, and is named after the verticies it connects. The same seed
+	always produces the same graph.
+
+	This takes time proportional to the number of edges generated,
+	so large sparse graphs are cheap to build.
+	"""
+	rng = random.Random(seed)
+	def edges():
+		if is_directed:
+			# index the n*(n-1) ordered pairs, skipping loops
+			for k in _skips(n * (n - 1), p, rng):
+				i, j = divmod(k, n - 1)
+				if j >= i: j += 1
+				yield i, j, (i, j), True
+		else:
+			# walk the pairs (i, j) with i < j in order of j, then i
+			i, j = 0, 1
+			previous = 0
+			for k in _skips(n * (n - 1) // 2, p, rng):
+				i += k - previous
+				previous = k
+				while i >= j:
+					i -= j
+					j += 1
+				yield i, j, (i, j), False
+	return _build(range(n), edges(), backend)
+
+def barabasi_albert(n, m, seed=None, backend=None):
+	"""Generates a random scale-free graph by preferential attachment.
+
+	The verticies are numbered [0, n). Starting from m unconnected
+	verticies, each further vertex i is connected by undirected edges
+	named (i, j) to m distinct existing verticies j, chosen with
+	probability proportional to their degree. The same seed always
+	produces the same graph.
+	"""
+	if not 1 <= m < n:
+		raise ValueError("need 1 <= m < n, got m=%s, n=%s" % (m, n))
+	rng = random.Random(seed)
+	def edges():
+		targets = list(range(m))
+		# every vertex appears here once per incident edge
+		repeated = []
+		for i in range(m, n):
+			for j in targets:
+				yield i, j, (i, j), False
+			repeated.extend(targets)
+			repeated.extend([i] * m)
+			chosen = set()
+			while len(chosen) < m:
+				chosen.add(rng.choice(repeated))
+			targets = sorted(chosen)
+	return _build(range(n), edges(), backend)
+
+def random_geometric(n, radius, dimensions=2, seed=None, backend=None):
+	"""Generates a random geometric graph.
+
+	The verticies are numbered [0, n), and each is placed uniformly
+	at random in the unit cube of the given dimension, recorded in
+	its "position" attribute as a tuple. Verticies i < j no further
+	apart than radius are connected by an undirected edge named
+	(i, j). The same seed always produces the same graph.
+
+	Points are bucketed into cells of width radius, so only points
+	in neighbouring cells are ever compared.
+	"""
+	rng = random.Random(seed)
+	positions = [tuple(rng.random() for d in range(dimensions)) for i in range(n)]
+	nodes = dict((i, {"position": position}) for i, position in enumerate(positions))
+	limit = radius * radius
+	def edges():
+		if radius <= 0: return
+		cells = {}
+		for i, position in enumerate(positions):
+			cells.setdefault(tuple(int(x / radius) for x in position), []).append(i)
+		offsets = list(product((-1, 0, 1), repeat=dimensions))
+		for cell, members in cells.items():
+			for offset in offsets:
+				others = cells.get(tuple(c + o for c, o in zip(cell, offset)))
+				if not others: continue
+				for i in members:
+					a = positions[i]
+					for j in others:
+						if j <= i: continue
+						if sum((x - y) ** 2 for x, y in zip(a, positions[j])) <= limit:
+							yield i, j, (i, j), False
+	return _build(nodes, edges(), backend)
@@ -30,6 +30,12 @@ using Graphine.
 # You should have received a copy of the GNU General Public License
 # along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
 
+def quote(value):
+	"""Returns value as a double-quoted DOT identifier."""
+	if not isinstance(value, (str, type(u""))): value = str(value)
+	text = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+	return '"%s"' % text
+
 def node_properties(n):
 	"""Returns default properties for nodes adjusted by the contents of n."""
 	defaults = {"label": n.name, "color": "black", "shape": "circle", "style": "filled", "fillcolor": "white"}
@@ -41,7 +47,7 @@ def node_properties(n):
 
 def edge_properties(e):
 	"""Returns default properties for edges adjusted by the contents of e."""
-	defaults = {"label": "'" + str(e.name) + "'", "color": "black", "style": None}
+	defaults = {"label": e.name, "color": "black", "style": None}
 	data = e.data
 	for k in defaults:
 		if k in data:
@@ -50,9 +56,18 @@ def edge_properties(e):
 	return defaults
 
 
-class DotGenerator:
+class DotGenerator(object):
+
+	"""This produces dot files for compatibility with other graph libraries.
+
+	Nodes are identified in the output by their quoted names, with
+	their labels and other properties given as attributes, so nodes
+	with equal labels stay distinct.
 
-	"""This produces dot files for compatibility with other graph libraries."""
+	Usage:
+		>>> with open("graph.dot", "w") as f:
+		... 	DotGenerator().write(g, f)
+	"""
 
 	def __init__(self, node_property_getter=node_properties, edge_property_getter=edge_properties, is_directed=True):
 		"""Sets the general properties of the graph and how to get node and edge labels."""
@@ -61,38 +76,55 @@ class DotGenerator:
 		self.is_directed = is_directed
 
 	def draw(self, graph, name):
-
-		doc = ""
-
+		"""Returns the dot document for graph as a string."""
+		return "".join(self.generate(graph, name))
+
+	def write(self, graph, fileobj, name="G", chunk_size=65536):
+		"""Writes the dot document for graph to a text file object."""
+		for chunk in self.generate(graph, name, chunk_size):
+			fileobj.write(chunk)
+
+	def generate(self, graph, name="G", chunk_size=65536):
+		"""Yields the dot document for graph in chunks of about chunk_size characters."""
+		lines = []
+		pending = 0
+		for line in self._lines(graph, name):
+			lines.append(line)
+			pending += len(line)
+			if pending >= chunk_size:
+				yield "".join(lines)
+				lines = []
+				pending = 0
+		if lines: yield "".join(lines)
+
+	def _lines(self, graph, name):
+		"""Yields the lines of the dot document."""
 		if self.is_directed:
-			doc += "digraph %s {\n" % name
-			edge_marker = " -> "
+			yield "digraph %s {\n" % quote(name)
+			edge_marker = "->"
 		else:
-			doc += "graph %s {\n" % name
-			edge_marker = " -- "
+			yield "graph %s {\n" % quote(name)
+			edge_marker = "--"
 
+		# node name -> quoted identifier, built once per node
+		ids = {}
 		for node in graph.nodes:
-			node_properties = self.get_node_properties(node)
-			property_strings = []
-			for k, v in node_properties.items():
-				property_strings.append("%s=%s" % (k, v))
-			property_strings = str(property_strings).replace("'", "")
-			doc += "\t%s %s\n" % (node_properties["label"], property_strings)
+			id = ids[node.name] = quote(node.name)
+			yield "\t%s %s\n" % (id, self._attributes(self.get_node_properties(node)))
 
 		for edge in graph.edges:
-			start = edge.start
-			end = edge.end
-			start_label = self.get_node_properties(start)["label"]
-			end_label = self.get_node_properties(end)["label"]
-			edge_properties = self.get_edge_properties(edge)
-			property_strings = []
-			for k, v in edge_properties.items():
-				property_strings.append("%s=%s" % (k, v))
-			property_strings = str(property_strings).replace("'", "")
-			edge_string = "\t%s %s %s %s\n"
-			edge_string %= (start_label, edge_marker, end_label, property_strings)
-			doc += edge_string
-
-		doc += "}"
-
-		return doc
+			properties = self.get_edge_properties(edge)
+			# undirected edges in a digraph are drawn without arrowheads
+			if self.is_directed and not edge.is_directed:
+				# copied, since the getter may hand out a shared dict
+				properties = dict(properties, dir="none")
+			start = ids[edge.start.name]
+			end = ids[edge.end.name]
+			yield "\t%s %s %s %s\n" % (start, edge_marker, end, self._attributes(properties))
+
+		yield "}\n"
+
+	def _attributes(self, properties):
+		"""Formats a dictionary of properties as a dot attribute list."""
+		pairs = ["%s=%s" % (k, quote(v)) for k, v in properties.items() if v is not None]
+		return "[%s]" % ", ".join(pairs)
@@ -15,7 +15,8 @@ graphs represented in the GraphML format.
 It contains two functions of interest to the end user: load,
 which takes a file as an argument and returns the parsed graph,
 and store, which takes a graph and a file as arguments and
-stores the graph in the given file.
+stores the graph in the given file. store_stream does the same
+for nodes and edges produced by generators.
 
 It also contains Reader, a GraphML reader, and Writer, which
 does its obvious opposite.
@@ -38,339 +39,444 @@ does its obvious opposite.
 # You should have received a copy of the GNU General Public License
 # along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
 
-from xml.sax.handler import ContentHandler
-from xml.sax.saxutils import XMLGenerator
-from xml.sax import parse
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+	from xml.etree.cElementTree import iterparse
+except ImportError:
+	from xml.etree.ElementTree import iterparse
 
 from pickle import loads, dumps
 
-from collections import defaultdict
+import gzip, bz2
 
+try:
+	import lzma
+except ImportError:
+	lzma = None
 
-from graph.base import Graph
 
-class Reader(ContentHandler):
-	"""Generates a Graph from GraphML data."""
+from graph.base import Graph, Node
 
-	def startDocument(self):
-		"""Handles the beginning of a given document."""
-		self.current_graph = None
-		self.elements = []
-		self.ids = {}
-		self.defaults = {}
 
-	def startElement(self, name, attrs):
-		"""Dispatches opening tags to the appropriate handler."""
-		try:
-			handler = getattr(self, "handle_%s_start" % name)
-		except AttributeError as error:
-			print(error)
-			print("Warning: ignoring unsupported tag %s" % name)
-		handler(attrs)
-
-	def endElement(self, name):
-		"""Dispatches closing tags to the appropriate handler."""
-		try:
-			handler = getattr(self, "handle_%s_end" % name)
-		except AttributeError as error:
-			print(error)
-			print("Warning: ignoring unsupported tag %s" % name)
-		handler()
+class ParseError(Exception):
+	"""Raised when a GraphML document is malformed."""
+	pass
 
-	def handle_graphml_start(self, attrs):
-		pass
 
-	def handle_graphml_end(self):
+# converters from GraphML attr.type values to Python values
+def _to_bool(text):
+	return text.strip().lower() in ("true", "1")
+
+def _to_obj(text):
+	return loads(text.encode("latin-1"))
+
+CONVERTERS = {"boolean": _to_bool, "int": int, "long": int, "float": float,
+	      "double": float, "string": lambda text: text, "obj": _to_obj}
+
+class _Decompressor(object):
+	"""A minimal readable stream over a decompressor object.
+
+	Works with the bz2 and lzma decompressors on every supported
+	Python, including concatenated streams such as pbzip2 output.
+	"""
+
+	def __init__(self, raw, factory):
+		self.raw = raw
+		self.factory = factory
+		self.decompressor = factory()
+		self.buffer = b""
+
+	def read(self, size=-1):
+		while size < 0 or len(self.buffer) < size:
+			chunk = self.raw.read(65536)
+			if not chunk: break
+			while chunk:
+				try: self.buffer += self.decompressor.decompress(chunk)
+				except EOFError:
+					# the previous stream ended exactly at a chunk boundary
+					self.decompressor = self.factory()
+					continue
+				# start over on anything after the end of a stream
+				chunk = self.decompressor.unused_data
+				if chunk: self.decompressor = self.factory()
+		if size < 0: size = len(self.buffer)
+		data, self.buffer = self.buffer[:size], self.buffer[size:]
+		return data
+
+	def close(self):
 		pass
 
-	def handle_graph_start(self, attrs):
-		"""Creates a new node and puts it on the stack."""
-		# create the new graph
-		self.current_graph = Graph()
-		# associate it with its id
-		self.ids[attrs["id"]] = self.current_graph
-		# set the default edge direction
-		self.defaults["edgedefault"] = attrs["edgedefault"]
-		# add it to the graphs stack
-		self.elements.append(self.current_graph)
-
-	def handle_graph_end(self):
-		"""Pops the graph off the graph stack."""
-		if isinstance(self.elements[-1], Graph):
-			self.elements.pop()
-		else:
-			raise ParseError("Invalid closing tag.")
-
-	def handle_node_start(self, attrs):
-		"""Creates a new Node and puts it on the stack."""
-		# get the id
-		id = attrs["id"]
-		# create the node
-		node = self.current_graph.add_node(id)
-		# associate it with its id
-		self.ids[id] = node
-		# put it on the stack
-		self.elements.append(node)
-
-	def handle_node_end(self):
-		"""Ties off the node and removes it from the stack."""
-		if isinstance(self.elements[-1], Graph.Node):
-			self.elements.pop()
-		else:
-			raise ParseError("Invalid closing tag.")
-
-	def handle_edge_start(self, attrs):
-		"""Creates a new edge and puts it on the stack."""
-		# get the edge's id
-		id = attrs["id"]
-		# get the edge's start and end
-		start = self.ids[attrs["source"]]
-		end = self.ids[attrs["target"]]
-		# verify them
-		if not isinstance(start, Graph.Node) or not isinstance(end, Graph.Node):
-			raise ParseError("Encountered invalid node ids while parsing edge %s" % id)
-		# get the edge's directed state
-		is_directed = attrs.get("directed", self.defaults["edgedefault"])
-		# build the edge
-		edge = self.current_graph.add_edge(start, end, id, is_directed=is_directed)
-		# associate its id with it
-		self.ids[id] = edge
-		# and push it onto the stack
-		self.elements.append(edge)
-
-	def handle_edge_end(self):
-		"""Ties off the edge and removes it from the stack."""
-		if isinstance(self.elements[-1], Graph.Edge):
-			self.elements.pop()
-		else:
-			raise ParseError("Invalid closing tag.")
-
-	def handle_key_start(self, attrs):
-		"""Creates a new key and puts it on the stack."""
-		# keys are represented as dictionaries
-		key = {'_data_type': 'key'}
-		# now, so are attrs
-		attrs = dict(attrs.items())
-		# with two attributes: id and for
-		key["id"] = attrs.pop("id")
-		key["for"] = attrs.pop("for")
-		# now figure out the other ones
-		for k, v in attrs.items():
-			if k.startswith("attr."):
-				key[k[5:]] = v
-		# and put the miserable concoction on the stack
-		self.elements.append(key)
-		# and into the ids dict
-		self.ids[key["id"]] = key
-
-	def handle_key_end(self):
-		"""Ties off the key and removes it from the stack."""
-		if self.elements[-1]["_data_type"] == "key":
-			self.elements.pop()
-		else:
-			raise ParseError("Invalid closing tag.")
-
-	def handle_data_start(self, attrs):
-		"""Creates a new data structure and puts it onto the stack."""
-		data = {}
-		key_id = attrs["key"]
-		data["key"] = self.ids[key_id]
-		self.elements.append(data)
-
-	def handle_data_end(self):
-		"""Ties off the data structure and removes it from the stack."""
-		data = self.elements.pop()
-		key = data["key"]
-		data_name = key["name"]
-		data_type = key["type"]
-		default_value = key.get("default", False)
-		data_value = data.get("default", default_value)
-		types = {"obj": loads, "string": str, "boolean": bool, "int": int, "float": float, "double": float, "long": float}
-		setattr(self.elements[-1], data_name, types[data_type](data_value))
-
-	def handle_default_start(self, attrs):
-		"""Creates a new default and attaches it to the parent key."""
-		self.elements[-1]["default"] = None
-
-	def handle_default_end(self):
-		"""Ties off the default value."""
+
+class _Prefixed(object):
+	"""A readable stream giving back bytes already read from raw before the rest of it.
+
+	Lets the format of streams that can't seek, such as pipes, be
+	detected from their first bytes.
+	"""
+
+	def __init__(self, head, raw):
+		self.head = head
+		self.raw = raw
+
+	def read(self, size=-1):
+		head = self.head
+		if not head: return self.raw.read(size)
+		if size < 0:
+			self.head = b""
+			return head + self.raw.read()
+		data, self.head = head[:size], head[size:]
+		if len(data) < size: data += self.raw.read(size - len(data))
+		return data
+
+	def close(self):
 		pass
 
-	def handle_desc_start(self):
-		"""Creates a new key and puts it on the stack."""
-		print("Warning: ignoring description")
 
-	def handle_desc_end(self):
-		"""Ties off the key and removes it from the stack."""
-		print("Warning: ignoring description")
+# the leading bytes of each supported compressed format
+MAGIC = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "xz"))
 
-	def characters(self, data):
-		"""If valid, associates the characters with the last element on the stack."""
-		try:
-			data = data.strip()
-			if data:
-				self.elements[-1]["default"] = data.strip()
-		except:
-			pass
 
+def decompress(raw):
+	"""Returns a readable stream over raw's decompressed contents.
+
+	raw should be a binary file object, which needn't be seekable, so
+	pipes and standard input will do. gzip, bzip2 and xz compression
+	are detected from the data rather than a filename. xz requires the
+	lzma module, and on Python 2, gzip requires a seekable stream.
+	"""
+	head = raw.read(6)
+	try: raw.seek(-len(head), 1)
+	except (AttributeError, IOError, ValueError):
+		raw = _Prefixed(head, raw)
+	for magic, format in MAGIC:
+		if not head.startswith(magic): continue
+		if format == "gzip":
+			return gzip.GzipFile(fileobj=raw)
+		if format == "bz2":
+			return _Decompressor(raw, bz2.BZ2Decompressor)
+		if lzma is None:
+			raise ParseError("xz compressed input requires the lzma module")
+		return _Decompressor(raw, lzma.LZMADecompressor)
+	return raw
+
+
+def _local(tag):
+	"""Strips the namespace from an ElementTree tag."""
+	if tag[0] == "{": return tag[tag.index("}") + 1:]
+	return tag
+
+
+class Reader(object):
+	"""Generates a Graph from GraphML data.
+
+	The document is parsed incrementally with iterparse, and each
+	node and edge is discarded from the parse tree as soon as it has
+	been read, so memory use is bounded by the graph being built
+	rather than by the document. Nodes and edges are queued and added
+	to the graph batch_size at a time.
+
+	Usage:
+		>>> r = Reader(backend="compact")
+		>>> g = r.read("network.graphml.gz")
+	"""
+
+	def __init__(self, backend=None, batch_size=10000):
+		self.backend = backend
+		self.batch_size = batch_size
 
-class Writer:
-	"""Generates a GraphML representation of a given graph."""
+	def read(self, source):
+		"""Parses source and returns the last graph it contains.
 
-	def __init__(self, filename, obj_extension=False):
-		self.xml = XMLGenerator(open(filename, "w"), "utf-8")
-		self.ids = {}
-		self.node_keys = {}
-		self.edge_keys = {}
+		source may be a filename or a binary file object, optionally
+		compressed; filenames are opened and closed by the reader.
+		"""
+		owned = not hasattr(source, "read")
+		raw = open(source, "rb") if owned else source
+		try:
+			stream = decompress(raw)
+			try:
+				return self._parse(stream)
+			finally:
+				if stream is not raw: stream.close()
+		finally:
+			if owned: raw.close()
+
+	def _parse(self, stream):
+		"""Runs the parse loop over a binary stream."""
+		# key id -> (attr.name, converter), and default values per domain
+		self.keys = {}
+		self.defaults = {"node": {}, "edge": {}}
+		self.nodes = []
+		self.edges = []
+		graph = None
+		container = None
+		directed = True
+		for event, element in iterparse(stream, events=("start", "end")):
+			tag = _local(element.tag)
+			if event == "start":
+				if tag == "graph":
+					self._flush(graph)
+					graph = Graph(backend=self.backend)
+					container = element
+					directed = element.get("edgedefault", "directed") == "directed"
+				continue
+			if tag == "node":
+				if graph is None: raise ParseError("node outside of a graph")
+				self.nodes.append((element.get("id"), self._read_data(element, "node")))
+			elif tag == "edge":
+				if graph is None: raise ParseError("edge outside of a graph")
+				is_directed = element.get("directed")
+				if is_directed is None: is_directed = directed
+				else: is_directed = is_directed == "true"
+				source, target = element.get("source"), element.get("target")
+				if source is None or target is None:
+					raise ParseError("edge %s is missing an endpoint" % element.get("id"))
+				data = self._read_data(element, "edge")
+				self.edges.append((source, target, element.get("id"), is_directed, data))
+			elif tag == "key":
+				self._read_key(element)
+				element.clear()
+				continue
+			else:
+				continue
+			# drop everything parsed so far
+			container.clear()
+			if len(self.nodes) + len(self.edges) >= self.batch_size:
+				self._flush(graph)
+		self._flush(graph)
+		if graph is None: raise ParseError("no graph found")
+		return graph
+
+	def _read_key(self, element):
+		"""Builds the converter for a key element once, when it is parsed."""
+		id = element.get("id")
+		name = element.get("attr.name", id)
+		try: converter = CONVERTERS[element.get("attr.type", "string")]
+		except KeyError: raise ParseError("unsupported data type for key %s" % id)
+		self.keys[id] = (name, converter)
+		for child in element:
+			if _local(child.tag) == "default":
+				value = converter(child.text or "")
+				domain = element.get("for", "all")
+				for target in self.defaults:
+					if domain in (target, "all"):
+						self.defaults[target][name] = value
+
+	def _read_data(self, element, domain):
+		"""Returns the data attached to a node or edge as a dictionary."""
+		data = dict(self.defaults[domain])
+		for child in element:
+			if _local(child.tag) != "data": continue
+			try: name, converter = self.keys[child.get("key")]
+			except KeyError: raise ParseError("undeclared key %s" % child.get("key"))
+			data[name] = converter(child.text or "")
+		return data
+
+	def _flush(self, graph):
+		"""Adds the queued nodes and edges to graph."""
+		if graph is None: return
+		# later definitions of a node in a batch replace earlier ones
+		nodes = dict(self.nodes)
+		# but nodes already in the graph, perhaps made by an edge in an
+		# earlier batch, keep their edges and take on the new data
+		for name in list(nodes):
+			node = graph[name] if name in graph else None
+			if isinstance(node, Node):
+				for key, value in nodes.pop(name).items():
+					setattr(node, key, value)
+		graph.add_nodes_from(nodes, unique=True)
+		graph.add_edges_from(self.edges)
 		self.nodes = []
-		self.type_map = {"str": ("string", str), "float": ("float", str), "int": ("int", str), "bool": ("boolean", lambda b: "1" if b else "0")}
-		if obj_extension:
-			self.type_map = defaultdict(self.type_map, lambda s: ("obj", pickle.dumps))
+		self.edges = []
 
-	def handle_graph(self, graph):
-		# start the document
-		self.xml.startDocument()
 
-		# build attributes
-		attrs =  {"xmlns": "http://graphml.graphdrawing.org/xmlns",
-			  "xmlns:xsi": "http://www.w3.org/2001/XMLSchema-instance",
-			  "xsi:schemaLocation": "http://graphml.graphdrawing.org/xmlns"}
+class Writer(object):
+	"""Generates a GraphML representation of a given graph.
+
+	Output is accumulated in memory and written to the underlying
+	binary file object chunk_size characters at a time. Nodes are
+	given ids of the form "n0", "n1" and so on, which edges look up
+	by node name in a dictionary; edges are numbered "e0", "e1"...
+
+	Usage:
+		>>> with open("network.graphml", "wb") as f:
+		... 	Writer(f).handle_graph(g)
+	"""
+
+	# Python type names -> GraphML attr.type values
+	type_map = {"str": "string", "unicode": "string", "bool": "boolean",
+		    "int": "int", "long": "long", "float": "double"}
+
+	# GraphML attr.type values -> text converters
+	converters = {"string": lambda v: v, "boolean": lambda b: "true" if b else "false",
+		      "int": str, "long": str, "double": repr,
+		      "obj": lambda v: dumps(v, 0).decode("latin-1")}
 
-		# attach the graphml root element
-		attrs = self.xml.startElement("graphml", attrs)
+	def __init__(self, out, obj_extension=False, chunk_size=65536):
+		self.out = out
+		self.obj_extension = obj_extension
+		self.chunk_size = chunk_size
+		# node name -> node id
+		self.ids = {}
+		self.edge_count = 0
+		# (domain, name, type) -> key id
+		self.keys = {}
+		self.chunks = []
+		self.pending = 0
+
+	def write(self, text):
+		"""Queues text for output, flushing if enough has built up."""
+		self.chunks.append(text)
+		self.pending += len(text)
+		if self.pending >= self.chunk_size:
+			self.flush()
+
+	def flush(self):
+		"""Writes all queued output to the file object."""
+		self.out.write("".join(self.chunks).encode("utf-8"))
+		self.chunks = []
+		self.pending = 0
+
+	def get_type(self, value):
+		"""Returns the GraphML type used to store value."""
+		try: return self.type_map[type(value).__name__]
+		except KeyError:
+			if self.obj_extension: return "obj"
+			raise ValueError("Cannot store %r without the object extension" % (value,))
 
-		# accumulates all unique node data as threeples of (name, type, "node")
-		node_data = set()
+	def handle_graph(self, graph):
+		"""Writes a complete document describing graph."""
+		# collect the distinct (name, type) pairs for each domain
+		node_keys = set()
 		for node in graph.nodes:
 			for k, v in node.data.items():
-				# get the data type and conversion function
-				data_type, converter = self.type_map[str(type(v).__name__)]
-				data_threeple = (k, data_type, "node")
-				# add the threeple to node_data
-				node_data.add(data_threeple)
-
-		# accumulates all unique edge data as threeples of (name, type, "edge")
-		edge_data = set()
+				node_keys.add((k, self.get_type(v)))
+		edge_keys = set()
 		for edge in graph.edges:
 			for k, v in edge.data.items():
-				# get the data type and conversion function
-				data_type, converter = self.type_map[str(type(v).__name__)]
-				data_threeple = (k, data_type, "edge")
-				# add the threeple to edge_data
-				edge_data.add(data_threeple)
-
-		# process all threeples into keys and map their (name, type) to their id
-		for pos, threeple in enumerate(node_data):
-			self.node_keys[(threeple[0], threeple[1])] = self.handle_key(pos, *threeple)
-		for pos, threeple in enumerate(edge_data):
-			self.edge_keys[(threeple[0], threeple[1])] = self.handle_key(pos, *threeple)
-
-		print(self.node_keys)
-		print(self.edge_keys)
-
-		# attach the graph element, with edges directed by default
-		self.xml.startElement("graph", {"edgedefault": "directed"})
-
-		# for each node, attach it and record its id
-		for pos, node in enumerate(graph.nodes):
-			self.nodes.append((node, self.handle_node(pos, node)))
-
-		# for each edge, attach it and record its id
-		for pos, edge in enumerate(graph.edges):
-			self.handle_edge(pos, edge)
-
-		# close the graph element
-		self.xml.endElement("graph")
-		# close the graphml element
-		self.xml.endElement("graphml")
-		# close the document
-		self.xml.endDocument()
-
-	def handle_key(self, id, name, var_type, attaches_to):
-		# make the id unique to keys by prefixing "k"
-		id = "k" + str(id)
-		# build the attrs object
-		attrs = {"id": id, "for": attaches_to, "attr.name": name, "attr.type": var_type}
-		# attach the start tag
-		self.xml.startElement("key", attrs)
-		# attach the end tag
-		self.xml.endElement("key")
-		# return the id
+				edge_keys.add((k, self.get_type(v)))
+		nodes = ((node.name, node.data) for node in graph.nodes)
+		edges = ((e.start.name, e.end.name, e.is_directed, e.data) for e in graph.edges)
+		self.handle_stream(nodes, edges, node_keys, edge_keys)
+
+	def handle_stream(self, nodes, edges, node_keys=(), edge_keys=(), directed=True):
+		"""Writes a document from iterables of nodes and edges.
+
+		nodes should yield (name, data) pairs and edges should yield
+		(start name, end name, is_directed, data) tuples, where data
+		is a dictionary; they are written as they are produced, so
+		neither has to be held in memory. Edges may only refer to
+		nodes that have already been produced.
+
+		Since keys have to be declared before they are used,
+		node_keys and edge_keys should be iterables of the (name,
+		GraphML type) pairs that the data may contain.
+
+		directed is the default direction for edges in the document.
+		"""
+		self.write('<?xml version="1.0" encoding="utf-8"?>\n')
+		self.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+			   'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+			   'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns">\n')
+		for name, var_type in sorted(node_keys, key=repr):
+			self.handle_key(name, var_type, "node")
+		for name, var_type in sorted(edge_keys, key=repr):
+			self.handle_key(name, var_type, "edge")
+		self.write('<graph edgedefault="%s">\n' % ("directed" if directed else "undirected"))
+		for name, data in nodes:
+			self.handle_node(name, data)
+		for start, end, is_directed, data in edges:
+			self.handle_edge(start, end, is_directed, data, directed)
+		self.write("</graph>\n</graphml>\n")
+		self.flush()
+
+	def handle_key(self, name, var_type, attaches_to):
+		"""Declares a key, returning its id."""
+		if var_type not in self.converters:
+			raise ValueError("Unknown GraphML type %s" % var_type)
+		# key ids are unique across both domains
+		id = "k%d" % len(self.keys)
+		self.keys[(attaches_to, name, var_type)] = id
+		self.write('<key id="%s" for="%s" attr.name=%s attr.type="%s"/>\n' % (id, attaches_to, quoteattr(str(name)), var_type))
 		return id
 
-	def handle_data(self, name, value, attaches_to):
-		# get the data's type
-		t = str(type(value).__name__)
-		# find the appropriate key
-		if attaches_to == "node": key = self.node_keys[(name, self.type_map[t][0])]
-		elif attaches_to == "edge": key = self.edge_keys[(name, self.type_map[t][0])]
-		# build the attrs object
-		attrs = {"key": key}
-		# place the data tag
-		self.xml.startElement("data", attrs)
-		# place the data
-		converter = self.type_map[t][1]
-		data = converter(value)
-		self.xml.characters(data)
-		# place the end tag
-		self.xml.endElement("data")
-
-	def handle_node(self, id, node):
-		# make the id unique to nodes by prefixing "n"
-		id = "n" + str(id)
-		# build the attrs object
-		attrs = {"id": id}
-		# attach the start tag
-		self.xml.startElement("node", attrs)
-		# for each attribute the node has
-		for k, v in node.data.items():
-			# write its data
-			self.handle_data(k, v, "node")
-		# close the tag
-		self.xml.endElement("node")
-		# return the id
+	def handle_data(self, data, attaches_to):
+		"""Writes the data elements for a node or edge."""
+		for name, value in data.items():
+			var_type = self.get_type(value)
+			try: key = self.keys[(attaches_to, name, var_type)]
+			except KeyError: raise ValueError("No %s key declared for %s of type %s" % (attaches_to, name, var_type))
+			text = escape(self.converters[var_type](value))
+			self.write('<data key="%s">%s</data>' % (key, text))
+
+	def handle_node(self, name, data):
+		"""Writes a node, returning its id."""
+		id = "n%d" % len(self.ids)
+		self.ids[name] = id
+		if data:
+			self.write('<node id="%s">' % id)
+			self.handle_data(data, "node")
+			self.write("</node>\n")
+		else:
+			self.write('<node id="%s"/>\n' % id)
 		return id
 
-	def handle_edge(self, id, edge):
-		# make the id unique to edges by prefixing "e"
-		id = "e" + str(id)
-		# find the start and end ids
-		start = None
-		end = None
-		for node, id in self.nodes:
-			if node == edge.start:
-				start = id
-			if node == edge.end:
-				end = id
-		# determine if it is directional
-		if edge.is_directed: directed="true"
-		else: directed="false"
-		# build the attrs object
-		attrs = {"id": id, "source": start, "target": end, "directed": directed}
-		# attach the start tag
-		self.xml.startElement("edge", attrs)
-		# for each attribute the edge has
-		for k, v in edge.data.items():
-			# write the data
-			self.handle_data(k, v, "edge")
-		# close the tag
-		self.xml.endElement("edge")
-		# return the id
+	def handle_edge(self, start, end, is_directed, data, directed=True):
+		"""Writes an edge between two previously written nodes, returning its id."""
+		try: start, end = self.ids[start], self.ids[end]
+		except KeyError: raise ValueError("Edge from %r to %r refers to an unwritten node" % (start, end))
+		id = "e%d" % self.edge_count
+		self.edge_count += 1
+		attrs = 'id="%s" source="%s" target="%s"' % (id, start, end)
+		if bool(is_directed) != directed:
+			attrs += ' directed="%s"' % ("true" if is_directed else "false")
+		if data:
+			self.write("<edge %s>" % attrs)
+			self.handle_data(data, "edge")
+			self.write("</edge>\n")
+		else:
+			self.write("<edge %s/>\n" % attrs)
 		return id
 
 
-def load(filename):
-	"""Loads a graph from a GraphML file specified by filename."""
-	r = Reader()
-	parse(open(filename), r)
-	return r.current_graph
+def load(source, backend=None):
+	"""Loads a graph from a GraphML file.
+
+	source may be a filename or a binary file object, and may be
+	gzip, bzip2 or xz compressed. backend selects the storage engine
+	of the returned graph, as in the Graph constructor.
+	"""
+	return Reader(backend=backend).read(source)
 
-def store(graph, filename, obj_extension=False):
-	"""Writes a graph to the file given by filename in GraphML.
+def store(graph, target, obj_extension=False):
+	"""Writes a graph to the given file in GraphML.
+
+	target may be a filename or a binary file object, which is
+	left open.
 
 	The optional argument obj_extension indicates whether to use
 	the object extension, which stores arbitrary Python objects
 	via pickle if a Java type does not exist to handle it.
 	"""
-	w = Writer(filename, obj_extension=obj_extension)
-	w.handle_graph(graph)
+	if hasattr(target, "write"):
+		Writer(target, obj_extension=obj_extension).handle_graph(graph)
+	else:
+		with open(target, "wb") as out:
+			Writer(out, obj_extension=obj_extension).handle_graph(graph)
+
+def store_stream(nodes, edges, target, node_keys=(), edge_keys=(), obj_extension=False):
+	"""Writes nodes and edges to the given file in GraphML as they are produced.
+
+	See Writer.handle_stream for the arguments.
+
+	Usage:
+		>>> nodes = ((i, {"label": str(i)}) for i in range(10**6))
+		>>> edges = ((i - 1, i, True, {}) for i in range(1, 10**6))
+		>>> store_stream(nodes, edges, "path.graphml", node_keys=[("label", "string")])
+	"""
+	if hasattr(target, "write"):
+		Writer(target, obj_extension=obj_extension).handle_stream(nodes, edges, node_keys, edge_keys)
+	else:
+		with open(target, "wb") as out:
+			Writer(out, obj_extension=obj_extension).handle_stream(nodes, edges, node_keys, edge_keys)
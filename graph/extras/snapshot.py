@@ -0,0 +1,749 @@
+#! /usr/bin/env python
+
+"""
+snapshot.py
+
+Licensed under GPLv3
+
+This module contains a compact binary snapshot format for
+Graphine graphs, intended for saving and reopening large graphs
+far faster than GraphML allows.
+
+It contains two functions of interest to the end user: save,
+which takes a graph and a file and writes the snapshot, and
+load, which takes a file and returns the graph it contains.
+
+It also contains Snapshot, which opens a snapshot file with mmap
+and gives access to its sections without reading the whole file,
+and MappedGraph, a read-only graph that works directly on the
+mapped arrays, so that processes opening the same snapshot share
+a single copy of it through the OS page cache.
+
+A snapshot is a sequence of 8-byte aligned sections, each holding
+a single little-endian array, followed by a pickled table of
+contents and a fixed-size trailer that locates it:
+
+	- node and edge names, as string tables of tagged, encoded
+	  values (an offsets array and a blob). Default edge names,
+	  derived from their endpoints, are stored as a one-byte tag.
+	- the edge array: start and end node indices and directions.
+	- CSR adjacency blocks for outgoing, incoming and undirected
+	  edges, giving each node's edges in the order of the graph.
+	- one columnar block per node or edge attribute. Booleans,
+	  integers and floats are stored as typed arrays, strings are
+	  interned into a table of distinct values and stored as codes,
+	  and anything else is pickled.
+
+Since names and some attribute values are pickled, snapshots
+should only be loaded from trusted sources.
+"""
+
+# Copyright (C) 2009 Geremy Condra
+#
+# This file is part of Graphine.
+#
+# Graphine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Graphine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Graphine.  If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from pickle import loads, dumps
+
+import mmap, struct, sys
+
+from graph.base import Graph, CompactGraph, CompactNode, CompactEdge, ElementMap
+
+
+MAGIC = b"GRAPHSNP"
+VERSION = 1
+
+# meta offset, meta length, magic
+TRAILER = struct.Struct("<QQ8s")
+
+# the array typecode for signed 64 bit integers, which is "l"
+# where "q" is unavailable
+for INT64 in ("q", "l"):
+	try:
+		if array(INT64).itemsize == 8: break
+	except ValueError:
+		pass
+else:
+	raise ImportError("snapshots require a 64 bit integer array type")
+
+try:
+	integer_types = (int, long)
+except NameError:
+	integer_types = (int,)
+
+text_type = type(u"")
+
+# marks missing values in attribute columns
+_MISSING = object()
+
+
+class SnapshotError(Exception):
+	"""Raised when a file is not a valid snapshot."""
+	pass
+
+
+def _to_bytes(a):
+	"""Returns an array's contents as little-endian bytes."""
+	if sys.byteorder == "big" and a.itemsize > 1:
+		a = array(a.typecode, a)
+		a.byteswap()
+	try: return a.tobytes()
+	except AttributeError: return a.tostring()
+
+def _from_bytes(typecode, data):
+	"""Builds an array from little-endian bytes."""
+	a = array(typecode)
+	try: a.frombytes(data)
+	except AttributeError: a.fromstring(data)
+	if sys.byteorder == "big" and a.itemsize > 1:
+		a.byteswap()
+	return a
+
+def encode(value, default=None):
+	"""Encodes a name or value as a tagged byte string.
+
+	If default is given and value equals it, only a tag is stored.
+	"""
+	if default is not None and value == default:
+		return b"d"
+	kind = type(value)
+	if kind is text_type:
+		return b"s" + value.encode("utf-8")
+	if kind is bytes:
+		return b"b" + value
+	if kind in integer_types:
+		return b"i" + str(value).encode("ascii")
+	return b"p" + dumps(value, 2)
+
+def decode(data, default=None):
+	"""Reverses encode."""
+	tag, payload = data[:1], data[1:]
+	if tag == b"s": return payload.decode("utf-8")
+	if tag == b"b": return payload
+	if tag == b"i": return int(payload)
+	if tag == b"d": return default
+	if tag == b"p": return loads(payload)
+	raise SnapshotError("unknown value tag %r" % tag)
+
+
+class _Writer(object):
+	"""Writes sections to a binary file object and records their positions."""
+
+	def __init__(self, out):
+		self.out = out
+		self.position = 0
+		self.sections = {}
+		self._write(MAGIC + struct.pack("<Q", VERSION))
+
+	def _write(self, data):
+		self.out.write(data)
+		self.position += len(data)
+
+	def _align(self):
+		padding = -self.position % 8
+		if padding: self._write(b"\0" * padding)
+
+	def array(self, name, a):
+		"""Writes an array as a section."""
+		self._align()
+		self.sections[name] = (self.position, a.typecode, len(a))
+		self._write(_to_bytes(a))
+
+	def table(self, name, values):
+		"""Writes a string table of encoded values as two sections."""
+		offsets = array(INT64, [0])
+		self._align()
+		start = self.position
+		for data in values:
+			self._write(data)
+			offsets.append(self.position - start)
+		self.sections[name + ".blob"] = (start, "B", self.position - start)
+		self.array(name + ".offsets", offsets)
+
+	def close(self, meta):
+		"""Writes the table of contents and the trailer."""
+		meta["sections"] = self.sections
+		data = dumps(meta, 2)
+		offset = self.position
+		self._write(data)
+		self._write(TRAILER.pack(offset, len(data), MAGIC))
+
+
+def _column_kind(values):
+	"""Chooses the storage for a column from the types of its values."""
+	kinds = set()
+	for value in values:
+		if value is _MISSING: continue
+		kind = type(value)
+		if kind is bool: kinds.add("bool")
+		elif kind in integer_types and -2**63 <= value < 2**63: kinds.add("int")
+		elif kind is float: kinds.add("float")
+		elif kind is text_type or kind is bytes: kinds.add("str")
+		else: return "object"
+	if len(kinds) == 1: return kinds.pop()
+	return "object"
+
+def _write_column(writer, prefix, values):
+	"""Writes one attribute column, returning its kind."""
+	kind = _column_kind(values)
+	if kind == "bool":
+		# -1 marks a missing value
+		writer.array(prefix + ".values", array("b", (-1 if v is _MISSING else int(v) for v in values)))
+	elif kind in ("int", "float"):
+		typecode = INT64 if kind == "int" else "d"
+		writer.array(prefix + ".values", array(typecode, (0 if v is _MISSING else v for v in values)))
+		writer.array(prefix + ".mask", array("b", (v is not _MISSING for v in values)))
+	elif kind == "str":
+		# intern the distinct values, with -1 marking a missing one
+		interned = {}
+		codes = array(INT64)
+		for value in values:
+			if value is _MISSING:
+				codes.append(-1)
+			else:
+				codes.append(interned.setdefault(value, len(interned)))
+		table = sorted(interned, key=interned.get)
+		writer.table(prefix + ".table", (encode(value) for value in table))
+		writer.array(prefix + ".codes", codes)
+	else:
+		writer.table(prefix + ".table", (b"" if v is _MISSING else encode(v) for v in values))
+		writer.array(prefix + ".mask", array("b", (v is not _MISSING for v in values)))
+	return kind
+
+def _collect_columns(elements, count):
+	"""Gathers the data of a sequence of elements into columns."""
+	columns = {}
+	for i, element in enumerate(elements):
+		for name, value in element.data.items():
+			try: column = columns[name]
+			except KeyError: column = columns[name] = [_MISSING] * count
+			column[i] = value
+	return columns
+
+
+def save(graph, target):
+	"""Writes a snapshot of graph to target.
+
+	target may be a filename or a binary file object, which is
+	written sequentially and left open.
+
+	Usage:
+		>>> save(g, "hourly.snapshot")
+		>>> g = load("hourly.snapshot")
+	"""
+	if hasattr(target, "write"):
+		_save(graph, target)
+	else:
+		with open(target, "wb") as out:
+			_save(graph, out)
+
+def _save(graph, out):
+	writer = _Writer(out)
+	nodes = list(graph.nodes)
+	edges = list(graph.edges)
+	n, m = len(nodes), len(edges)
+	# node name -> index
+	index = {}
+	for i, node in enumerate(nodes):
+		index[node.name] = i
+	writer.table("node.names", (encode(node.name) for node in nodes))
+
+	starts = array(INT64)
+	ends = array(INT64)
+	directions = array("b")
+	for edge in edges:
+		starts.append(index[edge.start.name])
+		ends.append(index[edge.end.name])
+		directions.append(bool(edge.is_directed))
+	writer.array("edge.starts", starts)
+	writer.array("edge.ends", ends)
+	writer.array("edge.directions", directions)
+	writer.table("edge.names", (encode(e.name, _default_name(e.start.name, e.end.name, e.is_directed)) for e in edges))
+
+	for name, block in zip(("out", "in", "bi"), _adjacency(n, starts, ends, directions)):
+		writer.array("adjacency.%s.offsets" % name, block[0])
+		writer.array("adjacency.%s.edges" % name, block[1])
+
+	meta = {"version": VERSION, "order": n, "size": m, "columns": {}}
+	for domain, elements, count in (("node", nodes, n), ("edge", edges, m)):
+		columns = []
+		for i, (name, values) in enumerate(sorted(_collect_columns(elements, count).items(), key=repr)):
+			kind = _write_column(writer, "%s.column.%d" % (domain, i), values)
+			columns.append((name, kind))
+		meta["columns"][domain] = columns
+	writer.close(meta)
+
+def _default_name(start, end, is_directed):
+	"""Returns the name an edge gets when none is given."""
+	if is_directed: return (start, end)
+	return frozenset((start, end))
+
+def _adjacency(n, starts, ends, directions):
+	"""Builds CSR blocks of outgoing, incoming and undirected edges.
+
+	Each block is an (offsets, edges) pair of arrays, where node i's
+	edges are edges[offsets[i]:offsets[i+1]], in edge order. As in
+	Graph, an undirected loop is only listed once.
+	"""
+	zeros = array(INT64, [0]) * (n + 1)
+	counts = [array(INT64, zeros) for i in range(3)]
+	for start, end, directed in zip(starts, ends, directions):
+		if directed:
+			counts[0][start + 1] += 1
+			counts[1][end + 1] += 1
+		else:
+			counts[2][start + 1] += 1
+			if start != end: counts[2][end + 1] += 1
+	blocks = []
+	for offsets in counts:
+		for i in range(n):
+			offsets[i + 1] += offsets[i]
+		blocks.append((offsets, array(INT64, [0]) * offsets[n]))
+	# the next free slot for each node in each block
+	slots = [array(INT64, offsets[:n]) for offsets, edges in blocks]
+	for id, (start, end, directed) in enumerate(zip(starts, ends, directions)):
+		if directed: places = ((0, start), (1, end))
+		elif start != end: places = ((2, start), (2, end))
+		else: places = ((2, start),)
+		for block, node in places:
+			blocks[block][1][slots[block][node]] = id
+			slots[block][node] += 1
+	return blocks
+
+
+class Snapshot(object):
+	"""A snapshot file opened for reading.
+
+	Files are memory-mapped where possible, so opening a snapshot
+	only reads its table of contents, and each section is read from
+	the mapping when asked for.
+
+	Usage:
+		>>> with Snapshot("hourly.snapshot") as s:
+		... 	names = s.node_names()
+		... 	g = s.to_graph()
+	"""
+
+	def __init__(self, source):
+		"""Opens source, which may be a filename or a binary file object."""
+		self._file = None
+		if hasattr(source, "read"):
+			try:
+				self.buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+			except (AttributeError, IOError, OSError, ValueError):
+				# not backed by a real file, so read it into memory
+				source.seek(0)
+				self.buffer = source.read()
+		else:
+			self._file = open(source, "rb")
+			try:
+				self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+			except ValueError:
+				# empty files can't be mapped
+				self.buffer = self._file.read()
+			except:
+				self._file.close()
+				raise
+		try:
+			self._read_meta()
+		except:
+			self.close()
+			raise
+
+	def _read_meta(self):
+		size = len(self.buffer)
+		if size < len(MAGIC) + 8 + TRAILER.size or self.buffer[:len(MAGIC)] != MAGIC:
+			raise SnapshotError("not a graph snapshot")
+		offset, length, magic = TRAILER.unpack(self.buffer[size - TRAILER.size:])
+		if magic != MAGIC:
+			raise SnapshotError("truncated graph snapshot")
+		self.meta = loads(self.buffer[offset:offset + length])
+		if self.meta["version"] != VERSION:
+			raise SnapshotError("unsupported snapshot version %s" % self.meta["version"])
+		self.sections = self.meta["sections"]
+		self.order = self.meta["order"]
+		self.size = self.meta["size"]
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def close(self):
+		"""Releases the mapping and any file opened by the snapshot."""
+		if isinstance(self.buffer, mmap.mmap):
+			self.buffer.close()
+		if self._file is not None:
+			self._file.close()
+
+	def _bounds(self, name):
+		offset, typecode, count = self.sections[name]
+		return offset, offset + count * array(typecode).itemsize, typecode
+
+	def array(self, name):
+		"""Returns a copy of the named section as an array."""
+		start, end, typecode = self._bounds(name)
+		return _from_bytes(typecode, self.buffer[start:end])
+
+	def view(self, name):
+		"""Returns the named section without copying it, if possible.
+
+		On little-endian machines with Python 3 this is a memoryview
+		of the mapping cast to the section's type, which must be
+		released before the snapshot is closed; otherwise it is a
+		copy, as from array.
+		"""
+		start, end, typecode = self._bounds(name)
+		if sys.byteorder == "little" and hasattr(memoryview, "cast"):
+			return memoryview(self.buffer)[start:end].cast(typecode)
+		return self.array(name)
+
+	def table(self, name, default=lambda i: None):
+		"""Returns a list of the decoded values in a string table.
+
+		default is called with an entry's index for entries that were
+		stored as defaults.
+		"""
+		return list(_Table(self, name, default))
+
+	def node_names(self):
+		"""Returns the node names, in order."""
+		return self.table("node.names")
+
+	def edges(self):
+		"""Returns the (starts, ends, directions) arrays of the edges."""
+		return self.array("edge.starts"), self.array("edge.ends"), self.array("edge.directions")
+
+	def edge_names(self, node_names=None):
+		"""Returns the edge names, in order."""
+		if node_names is None: node_names = self.node_names()
+		starts, ends, directions = self.edges()
+		default = lambda i: _default_name(node_names[starts[i]], node_names[ends[i]], directions[i])
+		return self.table("edge.names", default)
+
+	def adjacency(self, kind):
+		"""Returns the (offsets, edges) CSR arrays for "out", "in" or "bi"."""
+		return self.array("adjacency.%s.offsets" % kind), self.array("adjacency.%s.edges" % kind)
+
+	def columns(self, domain):
+		"""Yields (name, values) for each attribute column of "node" or "edge".
+
+		Missing values are None, so use rows to tell them apart from
+		stored Nones.
+		"""
+		for name, values in self._columns(domain):
+			yield name, [None if v is _MISSING else v for v in values]
+
+	def _columns(self, domain):
+		for i, (name, kind) in enumerate(self.meta["columns"][domain]):
+			prefix = "%s.column.%d" % (domain, i)
+			if kind == "bool":
+				values = [_MISSING if v < 0 else bool(v) for v in self.array(prefix + ".values")]
+			elif kind in ("int", "float"):
+				values = self.array(prefix + ".values").tolist()
+				for j, present in enumerate(self.array(prefix + ".mask")):
+					if not present: values[j] = _MISSING
+			elif kind == "str":
+				table = self.table(prefix + ".table")
+				values = [_MISSING if code < 0 else table[code] for code in self.array(prefix + ".codes")]
+			else:
+				values = self.table(prefix + ".table")
+				for j, present in enumerate(self.array(prefix + ".mask")):
+					if not present: values[j] = _MISSING
+			yield name, values
+
+	def rows(self, domain):
+		"""Returns a list holding each element's data as a dictionary."""
+		count = self.order if domain == "node" else self.size
+		rows = [{} for i in range(count)]
+		for name, values in self._columns(domain):
+			for row, value in zip(rows, values):
+				if value is not _MISSING: row[name] = value
+		return rows
+
+	def to_graph(self, backend=None):
+		"""Builds a graph from the snapshot.
+
+		backend selects the storage engine, as in the Graph constructor.
+		"""
+		graph = Graph(backend=backend)
+		names = self.node_names()
+		# names in a snapshot are unique, so skip the overwrite checks
+		graph.add_nodes_from(dict(zip(names, self.rows("node"))), unique=True)
+		starts, ends, directions = self.edges()
+		edge_names = self.edge_names(names)
+		edges = ((names[starts[i]], names[ends[i]], edge_names[i], bool(directions[i]), data)
+			for i, data in enumerate(self.rows("edge")))
+		graph.add_edges_from(edges, unique=True)
+		return graph
+
+
+class _Table(object):
+	"""Sequence over a string table, decoding each entry when it is asked for."""
+
+	def __init__(self, snapshot, name, default=lambda i: None):
+		self._buffer = snapshot.buffer
+		self._offsets = snapshot.view(name + ".offsets")
+		self._start = snapshot.sections[name + ".blob"][0]
+		self._default = default
+
+	def __len__(self):
+		return len(self._offsets) - 1
+
+	def __getitem__(self, i):
+		start = self._start
+		data = self._buffer[start + self._offsets[i]:start + self._offsets[i + 1]]
+		if data == b"d": return self._default(i)
+		# empty entries stand in for missing values
+		if not data: return None
+		return decode(data)
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+
+class _Ids(object):
+	"""Name -> id mapping over a _Table.
+
+	Iterating over it reads the table directly, while the dictionary
+	needed for lookups by name is only built on the first one.
+	"""
+
+	def __init__(self, names):
+		self._names = names
+		self._ids = None
+
+	def _index(self):
+		if self._ids is None:
+			self._ids = dict((name, id) for id, name in enumerate(self._names))
+		return self._ids
+
+	def __len__(self):
+		return len(self._names)
+
+	def __iter__(self):
+		return iter(self._names)
+
+	def __contains__(self, name):
+		return name in self._index()
+
+	def __getitem__(self, name):
+		return self._index()[name]
+
+	def get(self, name, default=None):
+		return self._index().get(name, default)
+
+	def keys(self):
+		return iter(self._names)
+
+	def values(self):
+		return range(len(self._names))
+
+	def items(self):
+		return ((name, id) for id, name in enumerate(self._names))
+
+
+class _Rows(object):
+	"""Sequence of each node's edge ids in a CSR adjacency block.
+
+	Rows are slices of the mapped edge array, or None for nodes
+	without such edges, as in CompactGraph.
+	"""
+
+	def __init__(self, offsets, edges):
+		self._offsets = offsets
+		self._edges = edges
+
+	def __len__(self):
+		return len(self._offsets) - 1
+
+	def __getitem__(self, node):
+		start, end = self._offsets[node], self._offsets[node + 1]
+		if start == end: return None
+		return self._edges[start:end]
+
+
+class _Loops(object):
+	"""Counts a node's directed loops from its outgoing edges on demand."""
+
+	def __init__(self, graph):
+		self._graph = graph
+
+	def get(self, node, default=0):
+		ends = self._graph._ends
+		loops = sum(1 for edge in self._graph._out[node] or () if ends[edge] == node)
+		return loops or default
+
+
+class _Data(object):
+	"""Read-only id -> data mapping over a snapshot's attribute columns."""
+
+	def __init__(self, snapshot, domain):
+		self._columns = []
+		for i, (name, kind) in enumerate(snapshot.meta["columns"][domain]):
+			getter = self._getter(snapshot, "%s.column.%d" % (domain, i), kind)
+			self._columns.append((name, getter))
+
+	def _getter(self, snapshot, prefix, kind):
+		"""Returns a callable reading one row of a column."""
+		if kind == "bool":
+			values = snapshot.view(prefix + ".values")
+			return lambda row: _MISSING if values[row] < 0 else bool(values[row])
+		if kind == "str":
+			codes = snapshot.view(prefix + ".codes")
+			table = _Table(snapshot, prefix + ".table")
+			return lambda row: _MISSING if codes[row] < 0 else table[codes[row]]
+		if kind in ("int", "float"): values = snapshot.view(prefix + ".values")
+		else: values = _Table(snapshot, prefix + ".table")
+		mask = snapshot.view(prefix + ".mask")
+		return lambda row: values[row] if mask[row] else _MISSING
+
+	def get(self, id, default=None):
+		data = {}
+		for name, getter in self._columns:
+			value = getter(id)
+			if value is not _MISSING: data[name] = value
+		return data or default
+
+
+class MappedElement(object):
+	"""Mixin making the data attributes of a view read-only."""
+
+	def __setattr__(self, name, value):
+		if name.startswith("_"): object.__setattr__(self, name, value)
+		else: raise TypeError("elements of a MappedGraph are read-only")
+
+	def __delattr__(self, name):
+		if name.startswith("_"): object.__delattr__(self, name)
+		else: raise TypeError("elements of a MappedGraph are read-only")
+
+
+class MappedNode(MappedElement, CompactNode):
+	"""Node view used by MappedGraph."""
+	pass
+
+
+class MappedEdge(MappedElement, CompactEdge):
+	"""Edge view used by MappedGraph."""
+	pass
+
+
+class MappedGraph(CompactGraph):
+	"""A read-only graph backed directly by a memory-mapped snapshot.
+
+	The edge arrays and CSR adjacency blocks are used in place, so
+	opening a graph only reads the snapshot's table of contents, and
+	every process mapping the same file shares its pages. Names and
+	data attributes are decoded from the mapping when they are asked
+	for; the only per-process structures are the name -> id
+	dictionaries, built the first time an element is looked up by
+	name.
+
+	Since it exposes the same internals as CompactGraph, all of
+	Graph's inspection, traversal and shortest path methods work as
+	usual, and operations that build new graphs return ordinary
+	CompactGraphs. Methods that would modify it raise TypeError.
+
+	Zero-copy access needs Python 3 on a little-endian machine;
+	elsewhere the arrays are copied into memory when opened.
+
+	Usage:
+		>>> g = MappedGraph("hourly.snapshot")
+		>>> g.get_shortest_path("a", "z", lambda e: e.weight)
+		>>> g.close()
+	"""
+
+	Node = MappedNode
+	Edge = MappedEdge
+
+	def __init__(self, source):
+		"""Opens the snapshot at source, a filename or binary file object."""
+		self._snapshot = snapshot = Snapshot(source)
+		self._node_names = _Table(snapshot, "node.names")
+		self._node_ids = _Ids(self._node_names)
+		self._node_data = _Data(snapshot, "node")
+		rows = []
+		for kind in ("out", "in", "bi"):
+			offsets = snapshot.view("adjacency.%s.offsets" % kind)
+			rows.append(_Rows(offsets, snapshot.view("adjacency.%s.edges" % kind)))
+		self._out, self._in, self._bi = rows
+		self._loops = _Loops(self)
+		self._holes = {}
+		self._starts = snapshot.view("edge.starts")
+		self._ends = snapshot.view("edge.ends")
+		self._directions = snapshot.view("edge.directions")
+		self._edge_names = _Table(snapshot, "edge.names", self._default_edge_name)
+		self._edge_ids = _Ids(self._edge_names)
+		self._edge_data = _Data(snapshot, "edge")
+		self._nodes = ElementMap(self._node_ids, self._node_view)
+		self._edges = ElementMap(self._edge_ids, self._edge_view)
+		self._counter = None
+		self._components = None
+		self._indexes = {"nodes": {}, "edges": {}}
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def _empty(self):
+		"""Derived graphs are ordinary, modifiable CompactGraphs."""
+		return CompactGraph()
+
+	def snapshot(self):
+		"""Returns a modifiable CompactGraph copy of this graph.
+
+		Since the mapping can't be changed, it can't be shared copy-on-write.
+		"""
+		g = self._empty()
+		g._merge(self._nodes, self._edges)
+		return g
+
+	def close(self):
+		"""Unmaps the snapshot.
+
+		The graph and any elements taken from it must not be used
+		afterwards.
+		"""
+		snapshot = self._snapshot
+		# drop our views of the mapping so that it can be closed
+		self.__dict__.clear()
+		snapshot.close()
+
+	def _default_edge_name(self, id):
+		"""Returns the name of an edge that was stored without one."""
+		names = self._node_names
+		return _default_name(names[self._starts[id]], names[self._ends[id]], self._directions[id])
+
+	def _read_only(self, *args, **kwargs):
+		raise TypeError("MappedGraph is read-only")
+
+	add_node = add_edge = remove_node = remove_edge = move_edge = _read_only
+	add_nodes_from = add_edges_from = _read_only
+
+
+def load(source, backend=None):
+	"""Loads a graph from a snapshot.
+
+	source may be a filename or a binary file object. backend selects
+	the storage engine of the returned graph, as in the Graph
+	constructor.
+	"""
+	with Snapshot(source) as snapshot:
+		return snapshot.to_graph(backend)
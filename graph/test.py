@@ -33,8 +33,21 @@ This contains all the test data for Graphine.
 import unittest
 import timeit
 import copy
-
-from base import Graph, Node, Edge, GraphElement
+import os
+import sys
+import gzip
+import bz2
+import tempfile
+import re
+import random
+import warnings
+from io import BytesIO
+
+from base import Graph, Node, Edge, GraphElement, CompactGraph, DisjointSet, ShortestPathTree, RangeIndex, where
+
+# the extras import the library as the graph package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from graph.extras import graphml, snapshot, dot, constructors
 
 #########################################################################################
 #                                    COMPONENT TESTS                                    #       
@@ -93,6 +106,21 @@ class NodeCreationTest(BaseGraphTest):
 		self.failUnlessEqual(self.node_5.degree, 0)
 		self.failUnlessEqual(self.node_5.get_adjacent(), []) # no adjacent nodes
 
+	def testPrivateAttributes(self):
+		# private attributes are kept out of the data
+		self.node_4._cache = 1
+		self.node_1._cache = 2
+		self.failUnlessEqual(self.node_4._cache, 1)
+		self.failUnlessEqual(self.node_1._cache, 2)
+		self.failUnlessEqual(self.node_4.data, {"foo": "stuff"})
+		self.failUnlessEqual(self.node_1.data, {})
+		self.node_1.color = "red"
+		self.failUnlessEqual(self.node_1.data, {"color": "red"})
+		del self.node_4._cache
+		self.failIf(hasattr(self.node_4, "_cache"))
+		self.failUnlessRaises(AttributeError, getattr, self.node_4, "_other")
+		self.failUnlessEqual(self.node_4.foo, "stuff")
+
 	def testNodeCreationFailPoints(self):
 		# ensure that node creation fails when it's supposed to
 		self.failUnlessRaises(TypeError, self.g.add_node, "two", "names")
@@ -215,6 +243,111 @@ class AdjacencyTest(BaseGraphTest):
 		self.failUnlessEqual(set(self.node_3.get_adjacent(True, True)), set([self.node_1]))
 
 
+class AdjacencyOrderTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.hub = self.g.add_node("hub")
+		self.spokes = [self.g.add_edge(self.hub, i, ("hub", i)) for i in range(10)]
+
+	def testOrderAfterRemoval(self):
+		# removing edges must not disturb the order of the others
+		self.g.remove_edge(self.spokes[3])
+		self.g.remove_edge(self.spokes[7])
+		expected = [e for i, e in enumerate(self.spokes) if i not in (3, 7)]
+		self.failUnlessEqual(self.hub.outgoing, expected)
+		self.failUnlessEqual([n.name for n in self.g.depth_first_traversal(self.hub)][0], "hub")
+
+	def testOrderAfterMove(self):
+		# moved edges go to the back of their new endpoints' adjacency
+		self.g.move_edge(self.spokes[0], end=self.g[5])
+		self.failUnlessEqual(self.hub.outgoing, self.spokes[1:] + [self.spokes[0]])
+		self.failUnlessEqual(self.g[5].incoming, [self.spokes[5], self.spokes[0]])
+		self.failUnlessEqual(self.g[0].incoming, [])
+
+	def testHubRemoval(self):
+		self.g.add_edge(self.hub, self.hub, "loop", is_directed=False)
+		self.g.remove_node(self.hub)
+		self.failUnlessEqual(self.g.size, 0)
+		self.failUnlessEqual(self.g.order, 10)
+		for node in self.g.nodes:
+			self.failUnlessEqual(node.edges, [])
+
+
+	def testFewEdges(self):
+		# nodes gaining and losing their first few edges
+		node = self.g[0]
+		self.failUnlessEqual(node.incoming, [self.spokes[0]])
+		self.failUnless(self.spokes[0] in node.edges)
+		self.failIf(self.spokes[1] in node.edges)
+		second = self.g.add_edge(1, 0, "second")
+		third = self.g.add_edge(0, 0, "third", is_directed=False)
+		self.failUnlessEqual(node.incoming, [self.spokes[0], second, third])
+		self.failUnlessEqual((node.degree, node.in_degree, node.out_degree), (3, 3, 1))
+		self.g.remove_edge(self.spokes[0])
+		self.g.remove_edge(third)
+		self.failUnlessEqual(node.edges, [second])
+		self.failUnless(second in node.edges)
+		self.g.remove_edge(second)
+		self.failUnlessEqual((node.edges, node.degree), ([], 0))
+		loop = self.g.add_edge(0, 0, "loop")
+		self.failUnlessEqual((node.incoming, node.outgoing, node.edges), ([loop], [loop], [loop]))
+		self.failUnlessEqual(node.degree, 1)
+		self.g.remove_edge(loop)
+		self.failUnlessEqual((node.incoming, node.outgoing, node.degree), ([], [], 0))
+
+
+class EdgeViewTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.ab = self.g.add_edge("a", "b", "ab")
+		self.ba = self.g.add_edge("b", "a", "ba")
+		self.aa = self.g.add_edge("a", "a", "aa")
+		self.ac = self.g.add_edge("a", "c", "ac", is_directed=False)
+		self.cc = self.g.add_edge("c", "c", "cc", is_directed=False)
+		self.a = self.g["a"]
+		self.c = self.g["c"]
+
+	def testViews(self):
+		a = self.a
+		self.failUnlessEqual(a.incoming, [self.ba, self.aa, self.ac])
+		self.failUnlessEqual(a.outgoing, [self.ab, self.aa, self.ac])
+		self.failUnlessEqual(a.bidirectional, [self.ac])
+		self.failUnlessEqual(a.edges, [self.ba, self.aa, self.ab, self.ac])
+		self.failUnlessEqual(self.c.edges, [self.ac, self.cc])
+		self.failUnlessEqual(len(a.edges), 4)
+		self.failUnless(self.aa in a.outgoing)
+		self.failIf(self.ba in a.outgoing)
+		self.failIf("ab" in a.outgoing)
+
+	def testIndexing(self):
+		a = self.a
+		self.failUnlessEqual(a.outgoing[0], self.ab)
+		self.failUnlessEqual(a.outgoing[-1], self.ac)
+		self.failUnlessEqual(a.outgoing[1:], [self.aa, self.ac])
+		self.failUnlessRaises(IndexError, a.outgoing.__getitem__, 3)
+		self.failUnlessRaises(IndexError, a.outgoing.__getitem__, -4)
+
+	def testLiveness(self):
+		outgoing = self.a.outgoing
+		self.g.remove_edge(self.ab)
+		self.failUnlessEqual(outgoing, [self.aa, self.ac])
+		self.g.add_edge("a", "d", "ad")
+		self.failUnlessEqual(len(outgoing), 3)
+
+	def testDegrees(self):
+		a = self.a
+		self.failUnlessEqual((a.degree, a.in_degree, a.out_degree), (4, 3, 3))
+		self.failUnlessEqual((self.c.degree, self.c.in_degree, self.c.out_degree), (2, 2, 2))
+		self.g.remove_edge(self.aa)
+		self.failUnlessEqual((a.degree, a.in_degree, a.out_degree), (3, 2, 2))
+		self.g.move_edge(self.ab, end=a)
+		self.failUnlessEqual((a.degree, a.in_degree, a.out_degree), (3, 3, 2))
+		self.failUnlessEqual(a.edges, [self.ba, self.ab, self.ac])
+		self.failUnlessEqual(self.g["b"].degree, 1)
+
+
 class RemovalTest(BaseGraphTest):
 
 	def setUp(self):
@@ -442,6 +575,658 @@ class GraphSearchTest(BaseGraphTest):
 		self.failUnlessEqual(s, set([self.edge_1]))
 
 
+class IndexTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.node_1 = self.g.add_node("node1", color="red", size=3)
+		self.node_2 = self.g.add_node("node2", color="blue", size=1)
+		self.node_3 = self.g.add_node("node3", color="red", size=2)
+		self.edge_1 = self.g.add_edge(self.node_1, self.node_2, "edge1", weight=5)
+		self.edge_2 = self.g.add_edge(self.node_2, self.node_3, "edge2", weight=1)
+		self.edge_3 = self.g.add_edge(self.node_3, self.node_1, "edge3", weight=5, is_directed=False)
+
+	def testIndexedSearch(self):
+		# indexed searches should agree with scans
+		self.g.create_index("nodes", "color")
+		self.g.create_index("edges", "weight")
+		s = set(self.g.search_nodes(color="red"))
+		self.failUnlessEqual(s, set([self.node_1, self.node_3]))
+		s = set(self.g.search_nodes(color="red", size=2))
+		self.failUnlessEqual(s, set([self.node_3]))
+		self.failUnlessEqual(list(self.g.search_nodes(color="green")), [])
+		s = set(self.g.search_edges(weight=5))
+		self.failUnlessEqual(s, set([self.edge_1, self.edge_3]))
+		s = set(self.g.search_edges(weight=5, start=self.node_1))
+		self.failUnlessEqual(s, set([self.edge_1]))
+		s = set(self.g.search_edges(weight=5, is_directed=False))
+		self.failUnlessEqual(s, set([self.edge_3]))
+
+	def testIndexMaintenance(self):
+		# indexes should follow additions, removals and modifications
+		self.g.create_index("nodes", "color")
+		node_4 = self.g.add_node("node4", color="blue")
+		s = set(self.g.search_nodes(color="blue"))
+		self.failUnlessEqual(s, set([self.node_2, node_4]))
+		self.g.remove_node(self.node_2)
+		self.failUnlessEqual(list(self.g.search_nodes(color="blue")), [node_4])
+		node_4.color = "red"
+		self.failUnlessEqual(list(self.g.search_nodes(color="blue")), [])
+		s = set(self.g.search_nodes(color="red"))
+		self.failUnlessEqual(s, set([self.node_1, self.node_3, node_4]))
+		del self.node_1.color
+		s = set(self.g.search_nodes(color="red"))
+		self.failUnlessEqual(s, set([self.node_3, node_4]))
+		# overwriting a node replaces its indexed data
+		self.g.add_node("node3", color="green")
+		self.failUnlessEqual(list(self.g.search_nodes(color="red")), [node_4])
+		self.failUnlessEqual(len(list(self.g.search_nodes(color="green"))), 1)
+
+	def testEdgeIndexMaintenance(self):
+		# edge indexes should follow edge and node removal
+		self.g.create_index("edges", "weight")
+		self.g.remove_edge(self.edge_1)
+		self.failUnlessEqual(list(self.g.search_edges(weight=5)), [self.edge_3])
+		self.g.remove_node(self.node_3)
+		self.failUnlessEqual(list(self.g.search_edges(weight=5)), [])
+		self.failUnlessEqual(list(self.g.search_edges(weight=1)), [])
+
+	def testUnhashableValues(self):
+		# unhashable values should still be found
+		self.g.create_index("nodes", "tags")
+		node_4 = self.g.add_node("node4", tags=["a", "b"])
+		self.failUnlessEqual(list(self.g.search_nodes(tags=["a", "b"])), [node_4])
+		self.failUnlessEqual(list(self.g.search_nodes(tags=["a"])), [])
+
+	def testRangeSearch(self):
+		# range searches should work with or without an index
+		s = set(self.g.search_range("nodes", "size", 2))
+		self.failUnlessEqual(s, set([self.node_1, self.node_3]))
+		self.g.create_index("nodes", "size", ordered=True)
+		l = list(self.g.search_range("nodes", "size", 2))
+		self.failUnlessEqual(l, [self.node_3, self.node_1])
+		l = list(self.g.search_range("nodes", "size", high=2))
+		self.failUnlessEqual(l, [self.node_2, self.node_3])
+		self.node_2.size = 10
+		l = list(self.g.search_range("nodes", "size", 2, 10))
+		self.failUnlessEqual(l, [self.node_3, self.node_1, self.node_2])
+		s = set(self.g.search_range("edges", "weight", 2, 5))
+		self.failUnlessEqual(s, set([self.edge_1, self.edge_3]))
+
+	def testNoneValues(self):
+		# None should only equal None, not open the range
+		node_4 = self.g.add_node("node4", size=None)
+		self.g.create_index("nodes", "size", ordered=True)
+		self.failUnlessEqual(list(self.g.search_nodes(size=None)), [node_4])
+		self.failUnlessEqual(list(self.g.query("nodes", where("size") == None)), [node_4])
+		s = set(self.g.query("nodes", where("size").isin([None, 1])))
+		self.failUnlessEqual(s, set([node_4, self.node_2]))
+		expected = set(node for node in self.g.nodes if where("size").between(None, 2)(node.data))
+		self.failUnlessEqual(set(self.g.query("nodes", where("size").between(None, 2))), expected)
+
+	def testRangeIndex(self):
+		# the blocks should agree with a sorted list through splits and merges
+		rng = random.Random(7)
+		index = RangeIndex()
+		index._load = 4
+		values = {}
+		for step in range(2000):
+			name = rng.randrange(300)
+			if name in values:
+				index.remove(name, values.pop(name))
+			else:
+				values[name] = rng.randrange(100)
+				index.add(name, values[name])
+			if step % 100 == 0:
+				bulk = RangeIndex()
+				bulk._load = 4
+				bulk.update(values.items())
+				for checked in (index, bulk, index.copy()):
+					self.failUnlessEqual(len(checked), len(values))
+					self.failUnlessEqual(checked.find(50), set(n for n, v in values.items() if v == 50))
+					l = [values[n] for n in checked.find_range(20, 60)]
+					self.failUnlessEqual(l, sorted(v for v in values.values() if 20 <= v <= 60))
+					l = [values[n] for n in checked.find_range()]
+					self.failUnlessEqual(l, sorted(values.values()))
+
+	def testDropIndex(self):
+		# dropping an index should fall back to scanning
+		self.g.create_index("nodes", "color")
+		self.g.drop_index("nodes", "color")
+		s = set(self.g.search_nodes(color="red"))
+		self.failUnlessEqual(s, set([self.node_1, self.node_3]))
+		self.failUnlessRaises(KeyError, self.g.drop_index, "nodes", "color")
+		self.failUnlessRaises(ValueError, self.g.create_index, "graphs", "color")
+
+
+class QueryTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.node_1 = self.g.add_node("node1", color="red", size=3)
+		self.node_2 = self.g.add_node("node2", color="blue", size=1)
+		self.node_3 = self.g.add_node("node3", color="green", size=2)
+		self.node_4 = self.g.add_node("node4", size=None)
+		self.edge_1 = self.g.add_edge(self.node_1, self.node_2, "edge1", weight=5)
+		self.edge_2 = self.g.add_edge(self.node_2, self.node_3, "edge2", weight=1)
+		self.edge_3 = self.g.add_edge(self.node_1, self.node_3, "edge3", weight=8, is_directed=False)
+
+	def testPredicates(self):
+		# comparisons should skip missing and incomparable values
+		s = set(self.g.query("nodes", where("size") > 1))
+		self.failUnlessEqual(s, set([self.node_1, self.node_3]))
+		s = set(self.g.query("nodes", where("color") != "red"))
+		self.failUnlessEqual(s, set([self.node_2, self.node_3]))
+		s = set(self.g.query("nodes", where("color").isin(["red", "blue"])))
+		self.failUnlessEqual(s, set([self.node_1, self.node_2]))
+		s = set(self.g.query("nodes", where("size").between(1, 2)))
+		self.failUnlessEqual(s, set([self.node_2, self.node_3]))
+		s = set(self.g.query("nodes", ~where("color").exists()))
+		self.failUnlessEqual(s, set([self.node_4]))
+		s = set(self.g.query("nodes", where("size").test(lambda size: size is None)))
+		self.failUnlessEqual(s, set([self.node_4]))
+
+	def testCombinations(self):
+		# predicates should combine with and, or and not
+		red_or_blue = (where("color") == "red") | (where("color") == "blue")
+		s = set(self.g.query("nodes", red_or_blue & (where("size") >= 3)))
+		self.failUnlessEqual(s, set([self.node_1]))
+		s = set(self.g.query("nodes", red_or_blue, where("size") < 3))
+		self.failUnlessEqual(s, set([self.node_2]))
+		s = set(self.g.query("nodes", ~red_or_blue))
+		self.failUnlessEqual(s, set([self.node_3, self.node_4]))
+		s = set(self.g.query("nodes", where("size") < 3, color="green"))
+		self.failUnlessEqual(s, set([self.node_3]))
+		s = set(self.g.query("nodes", where("size") < 3).where(where("size") > 1))
+		self.failUnlessEqual(s, set([self.node_3]))
+
+	def testStructure(self):
+		# edge queries should honour start, end and is_directed
+		s = set(self.g.query("edges", start="node1"))
+		self.failUnlessEqual(s, set([self.edge_1, self.edge_3]))
+		s = set(self.g.query("edges", where("weight") > 4, end=self.node_3))
+		self.failUnlessEqual(s, set([self.edge_3]))
+		s = set(self.g.query("edges", start="node1", is_directed=True))
+		self.failUnlessEqual(s, set([self.edge_1]))
+		s = set(self.g.query("edges", name="edge2", weight=1))
+		self.failUnlessEqual(s, set([self.edge_2]))
+		self.failUnlessEqual(list(self.g.query("edges", name="edge2", weight=2)), [])
+		self.failUnlessEqual(list(self.g.search_edges(where("weight") > 6)), [self.edge_3])
+
+	def testIndexes(self):
+		# indexed queries should agree with scans
+		queries = [
+			("nodes", [where("size") > 1], {}),
+			("nodes", [where("size") >= 2, where("color").isin(["red", "green"])], {}),
+			("nodes", [(where("color") == "red") | (where("color") == "blue")], {}),
+			("nodes", [where("size").between(2, 3)], {"color": "red"}),
+			("edges", [where("weight") < 8], {"start": "node1"}),
+		]
+		expected = [set(self.g.query(kind, *p, **c)) for kind, p, c in queries]
+		self.g.create_index("nodes", "size", ordered=True)
+		self.g.create_index("nodes", "color")
+		self.g.create_index("edges", "weight", ordered=True)
+		for (kind, p, c), result in zip(queries, expected):
+			query = self.g.query(kind, *p, **c)
+			self.failUnless(query.explain().startswith("index lookup"))
+			self.failUnlessEqual(set(query), result)
+		l = list(self.g.query("nodes", where("size") >= 1))
+		self.failUnlessEqual(l, [self.node_2, self.node_3, self.node_1])
+
+	def testLimit(self):
+		# limits should stop the search early
+		self.failUnlessEqual(len(list(self.g.query("nodes").limit(2))), 2)
+		self.failUnlessEqual(list(self.g.query("nodes").limit(0)), [])
+		self.failUnlessEqual(self.g.query("nodes", color="red").first(), self.node_1)
+		self.failUnlessEqual(self.g.query("nodes", color="pink").first(), None)
+		seen = []
+		def watch(size):
+			seen.append(size)
+			return True
+		list(self.g.query("nodes", where("size").test(watch)).limit(1))
+		self.failUnlessEqual(len(seen), 1)
+
+	def testBadKind(self):
+		self.failUnlessRaises(ValueError, self.g.query, "graphs")
+
+
+class BulkConstructionTest(BaseGraphTest):
+
+	def testAddNodesFrom(self):
+		# nodes can be given as names or with attributes
+		g = self.build_graph()
+		g.add_nodes_from(["a", "b"])
+		g.add_nodes_from({"c": {"weight": 5}, "d": None})
+		self.failUnlessEqual(g.order, 4)
+		self.failUnlessEqual(g["c"].weight, 5)
+		self.failUnlessEqual(g["d"].data, {})
+		# existing nodes are replaced, along with their edges
+		g.add_edge("a", "b")
+		g.add_nodes_from({"a": {"weight": 1}})
+		self.failUnlessEqual(g.order, 4)
+		self.failUnlessEqual(g.size, 0)
+		self.failUnlessEqual(g["a"].weight, 1)
+
+	def testAddEdgesFrom(self):
+		# edges can be given as tuples of varying length
+		g = self.build_graph()
+		data = {"weight": 5}
+		g.add_edges_from([("a", "b"), ("b", "c", "bc"), ("c", "a", "ca", False), ("a", "a", "aa", True, data)])
+		self.failUnlessEqual(g.order, 3)
+		self.failUnlessEqual(g.size, 4)
+		self.failUnless(("a", "b") in g)
+		self.failUnlessEqual(g["bc"].start, g["b"])
+		self.failIf(g["ca"].is_directed)
+		self.failUnlessEqual(g["aa"].weight, 5)
+		# the caller's data isn't shared with the graph
+		g["aa"].weight = 6
+		self.failUnlessEqual(data, {"weight": 5})
+		# or as a mapping to their attributes
+		g.add_edges_from({("c", "d", "cd"): {"weight": 2, "is_directed": False}})
+		self.failUnlessEqual(g["cd"].weight, 2)
+		self.failIf(g["cd"].is_directed)
+		# existing edges are replaced
+		g.add_edges_from([("b", "a", "bc")])
+		self.failUnlessEqual(g.size, 5)
+		self.failUnlessEqual(g["bc"].start, g["b"])
+		self.failUnlessEqual(g["bc"].end, g["a"])
+		self.failUnlessEqual(g["b"].outgoing, [g["bc"]])
+
+	def testUnique(self):
+		# unique additions should give the same graph as checked ones
+		g1, g2 = self.build_graph(), self.build_graph()
+		edges = [(i, (i + 1) % 10, "e%d" % i) for i in range(10)]
+		g1.add_nodes_from(range(10))
+		g1.add_edges_from(edges)
+		g2.add_nodes_from(range(10), unique=True)
+		g2.add_edges_from(edges, unique=True)
+		self.failUnlessEqual(g1, g2)
+		self.failUnlessEqual(g2["e9"].end, g2[0])
+
+	def testIndexes(self):
+		# bulk additions should keep indexes up to date
+		g = self.build_graph()
+		g.create_index("nodes", "weight")
+		g.create_index("edges", "weight", ordered=True)
+		g.add_nodes_from({"a": {"weight": 1}, "b": {"weight": 2}}, unique=True)
+		g.add_edges_from([("a", "b", "ab", True, {"weight": 3})], unique=True)
+		self.failUnlessEqual(list(g.search_nodes(weight=2)), [g["b"]])
+		self.failUnlessEqual(list(g.search_range("edges", "weight", 3)), [g["ab"]])
+
+
+class SubgraphViewTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.g.add_edge("a", "b", "ab", weight=1)
+		self.g.add_edge("b", "c", "bc", is_directed=False)
+		self.g.add_edge("c", "a", "ca")
+		self.g.add_edge("c", "c", "cc")
+		self.g.add_edge("c", "d", "cd")
+
+	def testView(self):
+		view = self.g.subgraph_view("b", self.g["c"])
+		self.failUnlessEqual(sorted(node.name for node in view.nodes), ["b", "c"])
+		self.failUnlessEqual(sorted(edge.name for edge in view.edges), ["bc", "cc"])
+		self.failUnlessEqual((view.order, view.size), (2, 2))
+		self.failUnless("b" in view)
+		self.failUnless(self.g["bc"] in view)
+		self.failIf("a" in view)
+		self.failIf("ab" in view)
+		# the parent's changes show through
+		self.g.add_edge("b", "c", "bc2")
+		self.failUnlessEqual(view.size, 3)
+		# and bad nodes are rejected
+		self.failUnlessRaises(KeyError, self.g.subgraph_view, "e")
+		self.failUnlessRaises(KeyError, view.get_outgoing, "a")
+
+	def testAdjacency(self):
+		view = self.g.subgraph_view("a", "c")
+		self.failUnlessEqual([edge.name for edge in view.get_outgoing("c")], ["ca", "cc"])
+		self.failUnlessEqual([edge.name for edge in view.get_incoming("a")], ["ca"])
+		self.failUnlessEqual(view.get_outgoing("a"), [])
+		self.failUnlessEqual(sorted(node.name for node in view.get_adjacent("c")), ["a", "c"])
+		self.failUnlessEqual(view.get_adjacent("a"), [])
+
+	def testToGraph(self):
+		g = self.g.subgraph_view("a", "b", "c").to_graph()
+		self.failUnlessEqual(sorted(node.name for node in g.nodes), ["a", "b", "c"])
+		self.failUnlessEqual(sorted(edge.name for edge in g.edges), ["ab", "bc", "ca", "cc"])
+		self.failUnlessEqual(g["ab"].weight, 1)
+		self.failIf(g["bc"].is_directed)
+		self.failUnless(g["ca"].is_directed)
+		# the copy is independent of the parent
+		g.remove_node("a")
+		self.failUnless("a" in self.g)
+
+	def testInduceSubgraphDirection(self):
+		g = self.g.induce_subgraph("b", "c")
+		self.failIf(g["bc"].is_directed)
+		g = self.g.edge_induce_subgraph("bc", "cd")
+		self.failIf(g["bc"].is_directed)
+		self.failUnlessEqual(sorted(node.name for node in g.nodes), ["b", "c", "d"])
+
+
+class SnapshotTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.g.add_node("a", color="red")
+		self.g.add_edge("a", "b", "ab", weight=1)
+		self.g.add_edge("b", "c", "bc", is_directed=False)
+
+	def names(self, elements):
+		return set(element.name for element in elements)
+
+	def testSnapshot(self):
+		snap = self.g.snapshot()
+		self.failUnlessEqual(snap, self.g)
+		self.failUnlessEqual(type(snap), type(self.g))
+		self.failUnlessEqual(snap["ab"].weight, 1)
+		self.failIf(snap["bc"].is_directed)
+		# changing the snapshot leaves the parent alone
+		snap.remove_edge("ab")
+		snap.add_edge("c", "d", "cd")
+		snap.remove_node("b")
+		self.failUnlessEqual(self.names(snap.nodes), set(["a", "c", "d"]))
+		self.failUnlessEqual(self.names(self.g.nodes), set(["a", "b", "c"]))
+		self.failUnlessEqual(self.names(self.g.edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(self.g["b"].edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(snap["c"].edges), set(["cd"]))
+
+	def testParentChanges(self):
+		a = self.g["a"]
+		snap = self.g.snapshot()
+		# changing the parent leaves the snapshot alone
+		self.g.move_edge("ab", end=self.g["c"])
+		self.g.remove_edge("bc")
+		a.color = "blue"
+		self.failUnlessEqual(self.g["a"].color, "blue")
+		self.failUnlessEqual(snap["a"].color, "red")
+		self.failUnlessEqual(snap["ab"].end.name, "b")
+		self.failUnlessEqual(self.names(snap.edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(snap["b"].edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.g["ab"].end.name, "c")
+
+	def testManySnapshots(self):
+		first = self.g.snapshot()
+		second = self.g.snapshot()
+		third = first.snapshot()
+		first.add_edge("c", "a", "ca")
+		self.g.remove_node("a")
+		second.add_node("e")
+		self.failUnlessEqual(self.names(self.g.nodes), set(["b", "c"]))
+		self.failUnlessEqual(self.names(first.edges), set(["ab", "bc", "ca"]))
+		self.failUnlessEqual(self.names(second.nodes), set(["a", "b", "c", "e"]))
+		self.failUnlessEqual(self.names(third.nodes), set(["a", "b", "c"]))
+		self.failUnlessEqual(self.names(third.edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(third["a"].edges), set(["ab"]))
+
+	def testSharedCopy(self):
+		# the parent's change leaves its snapshots sharing one copy
+		snaps = [self.g.snapshot() for i in range(4)]
+		self.g.remove_edge("ab")
+		self.g["a"].color = "blue"
+		if not isinstance(self.g, CompactGraph):
+			self.failUnlessEqual(len(set(id(snap._nodes) for snap in snaps)), 1)
+		for snap in snaps:
+			self.failUnlessEqual(self.names(snap.edges), set(["ab", "bc"]))
+			self.failUnlessEqual(snap["a"].color, "red")
+		# which they then copy for themselves as usual
+		snaps[0].remove_node("c")
+		snaps[1]["b"].color = "green"
+		snaps[2].add_edge("c", "a", "ca")
+		self.failUnlessEqual(self.names(snaps[0].nodes), set(["a", "b"]))
+		self.failUnlessEqual(self.names(snaps[1]["a"].edges), set(["ab"]))
+		self.failIf("color" in snaps[0]["b"].data)
+		self.failUnlessEqual(snaps[1]["b"].color, "green")
+		self.failUnlessEqual(self.names(snaps[2]["a"].edges), set(["ab", "ca"]))
+		self.failUnlessEqual(self.names(snaps[3].edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(snaps[3]["c"].edges), set(["bc"]))
+		self.failIf("color" in snaps[3]["b"].data)
+		self.failUnlessEqual(self.names(self.g.edges), set(["bc"]))
+
+	def testDefaultNames(self):
+		# copying the name counter is deprecated from Python 3.12
+		with warnings.catch_warnings():
+			warnings.simplefilter("error")
+			snap = self.g.snapshot()
+		n1 = self.g.add_node()
+		n2 = snap.add_node()
+		self.failUnlessEqual(n1.name, n2.name)
+		self.failUnlessEqual(self.g.add_node().name, snap.snapshot().add_node().name)
+
+	def testIndexes(self):
+		self.g.create_index("nodes", "color")
+		snap = self.g.snapshot()
+		snap.add_node("d", color="red")
+		self.g.add_node("e", color="red")
+		self.failUnlessEqual(self.names(snap.search_nodes(color="red")), set(["a", "d"]))
+		self.failUnlessEqual(self.names(self.g.search_nodes(color="red")), set(["a", "e"]))
+		snap.drop_index("nodes", "color")
+		self.failUnless("color" in self.g._indexes["nodes"])
+
+	def failUnlessParentUnchanged(self):
+		self.failUnlessEqual(self.names(self.g.nodes), set(["a", "b", "c"]))
+		self.failUnlessEqual(self.names(self.g.edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.g["a"].color, "red")
+		self.failUnlessEqual((self.g["ab"].start.name, self.g["ab"].end.name), ("a", "b"))
+		self.failUnlessEqual(self.names(self.g["a"].outgoing), set(["ab"]))
+		self.failUnlessEqual(self.names(self.g["a"].incoming), set())
+		self.failUnlessEqual(self.names(self.g["b"].edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(self.g["c"].edges), set(["bc"]))
+
+	def testSnapshotMoveEdge(self):
+		snap = self.g.snapshot()
+		snap.move_edge("ab", end=snap["c"])
+		self.failUnlessEqual(snap["ab"].end.name, "c")
+		self.failUnlessEqual(self.names(snap["c"].edges), set(["ab", "bc"]))
+		self.failUnlessParentUnchanged()
+		# elements of the parent stand for the snapshot's own
+		snap = self.g.snapshot()
+		snap.move_edge("ab", start=self.g["b"], end=self.g["a"])
+		self.failUnlessEqual(self.names(snap["a"].incoming), set(["ab"]))
+		self.failUnlessParentUnchanged()
+
+	def testSnapshotTranspose(self):
+		snap = self.g.snapshot()
+		snap.transpose()
+		self.failUnlessEqual(self.names(snap["a"].incoming), set(["ab"]))
+		self.failUnlessEqual(self.names(snap["a"].outgoing), set())
+		self.failUnlessParentUnchanged()
+
+	def testSnapshotContractEdge(self):
+		snap = self.g.snapshot()
+		snap.contract_edge("ab", lambda start, end: {"name": "d"})
+		self.failUnlessEqual(self.names(snap.nodes), set(["c", "d"]))
+		self.failUnlessEqual(self.names(snap["d"].edges), set(["bc"]))
+		self.failUnlessParentUnchanged()
+
+	def testSnapshotAttributes(self):
+		snap = self.g.snapshot()
+		snap["a"].color = "x"
+		self.failUnlessEqual(snap["a"].color, "x")
+		self.failUnlessParentUnchanged()
+		snap = self.g.snapshot()
+		for node in snap.nodes:
+			node.color = "y"
+		del snap["a"].color
+		self.failUnlessParentUnchanged()
+		self.failIf("color" in snap["a"].data)
+
+	def testSnapshotInPlaceOperators(self):
+		other = self.build_graph()
+		other.add_node("a", color="blue")
+		other.add_edge("a", "b", "ab", weight=2)
+		snap = self.g.snapshot()
+		snap |= other
+		self.failUnlessEqual(snap["a"].color, "blue")
+		self.failUnlessEqual(snap["ab"].weight, 2)
+		self.failUnlessParentUnchanged()
+		self.failUnlessEqual(self.g["ab"].weight, 1)
+		snap = self.g.snapshot()
+		snap &= other
+		self.failUnlessEqual(self.names(snap.nodes), set(["a", "b"]))
+		self.failUnlessEqual(snap["a"].color, "blue")
+		self.failUnlessParentUnchanged()
+		self.failUnlessEqual(self.g["ab"].weight, 1)
+		snap = self.g.snapshot()
+		snap -= other
+		self.failUnlessEqual(self.names(snap.nodes), set(["c"]))
+		self.failUnlessParentUnchanged()
+		# and the parent's changes leave the snapshot alone
+		snap = self.g.snapshot()
+		self.g |= other
+		self.failUnlessEqual(snap["a"].color, "red")
+		self.failUnlessEqual(snap["ab"].weight, 1)
+
+
+class BatchTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.g.add_node("a", color="red")
+		self.g.add_edge("a", "b", "ab", weight=1)
+		self.g.add_edge("b", "c", "bc", is_directed=False, weight=2)
+		self.g.add_edge("c", "c", "cc")
+
+	def names(self, elements):
+		return set(element.name for element in elements)
+
+	def failUnlessUnchanged(self):
+		self.failUnlessEqual(self.names(self.g.nodes), set(["a", "b", "c"]))
+		self.failUnlessEqual(self.names(self.g.edges), set(["ab", "bc", "cc"]))
+		self.failUnlessEqual(self.g["a"].color, "red")
+		self.failIf("color" in self.g["b"].data)
+		self.failUnlessEqual(self.g["ab"].weight, 1)
+		self.failUnlessEqual((self.g["ab"].start.name, self.g["ab"].end.name), ("a", "b"))
+		self.failIf(self.g["bc"].is_directed)
+		self.failUnlessEqual(self.names(self.g["b"].edges), set(["ab", "bc"]))
+		self.failUnlessEqual(self.names(self.g["c"].edges), set(["bc", "cc"]))
+
+	def testCommit(self):
+		with self.g.batch():
+			self.g.remove_node("a")
+			self.g.add_edge("c", "d", "cd")
+		self.failUnlessEqual(self.names(self.g.nodes), set(["b", "c", "d"]))
+		self.failUnlessEqual(self.names(self.g.edges), set(["bc", "cc", "cd"]))
+
+	def testRollback(self):
+		try:
+			with self.g.batch():
+				self.g.remove_node("c")
+				self.g.remove_edge("ab")
+				self.g.add_edge("a", "d", "ad")
+				self.g.add_node("b", color="blue")
+				self.g["a"].color = "green"
+				self.g.transpose()
+				raise ValueError
+		except ValueError:
+			pass
+		else:
+			self.fail("the batch swallowed the exception")
+		self.failUnlessUnchanged()
+
+	def testRollbackData(self):
+		try:
+			with self.g.batch():
+				self.g["b"].color = "blue"
+				del self.g["a"].color
+				del self.g["ab"].weight
+				raise KeyError
+		except KeyError:
+			pass
+		self.failUnlessUnchanged()
+
+	def testNesting(self):
+		with self.g.batch():
+			self.g.add_node("d")
+			try:
+				with self.g.batch():
+					self.g.remove_node("a")
+					raise ValueError
+			except ValueError:
+				pass
+			self.failUnlessEqual(self.names(self.g.nodes), set(["a", "b", "c", "d"]))
+		self.failUnlessEqual(self.names(self.g.nodes), set(["a", "b", "c", "d"]))
+		self.failUnlessEqual(self.names(self.g["a"].edges), set(["ab"]))
+
+	def testIndexes(self):
+		self.g.create_index("nodes", "color")
+		self.g.create_index("edges", "weight", ordered=True)
+		with self.g.batch():
+			self.g.add_node("d", color="red")
+			self.g["a"].color = "blue"
+			self.g.add_edge("d", "a", "da", weight=3)
+			# changing most of the graph puts maintenance off until the end
+			self.failIf(self.g._indexes["nodes"])
+			self.failUnlessEqual(self.names(self.g.search_nodes(color="red")), set(["d"]))
+		self.failUnlessEqual(self.names(self.g.search_nodes(color="red")), set(["d"]))
+		self.failUnlessEqual(self.names(self.g.search_range("edges", "weight", 2, 3)), set(["bc", "da"]))
+		try:
+			with self.g.batch():
+				self.g.create_index("nodes", "size")
+				self.g["d"].size = 1
+				self.g.remove_node("d")
+				raise ValueError
+		except ValueError:
+			pass
+		self.failUnless("size" in self.g._indexes["nodes"])
+		# the new index survives the rollback, and matches the graph
+		self.failUnlessEqual(self.names(self.g.search_nodes(size=1)), set())
+		self.g["b"].size = 1
+		self.failUnlessEqual(self.names(self.g.search_nodes(size=1)), set(["b"]))
+		self.failUnlessEqual(self.names(self.g.search_nodes(color="red")), set(["d"]))
+		self.failUnlessEqual(self.names(self.g.search_range("edges", "weight", 2, 3)), set(["bc", "da"]))
+
+	def testSmallBatchIndexes(self):
+		# a few changes to a large graph keep the indexes in place
+		for i in range(100):
+			self.g.add_node(i, size=i % 10)
+		self.g.create_index("nodes", "size", ordered=True)
+		self.g.create_index("nodes", "color")
+		with self.g.batch():
+			self.g[5].size = 20
+			self.g.add_node("d", size=20)
+			self.g.remove_node(15)
+			query = self.g.query("nodes", where("size") >= 20)
+			self.failUnless(query.explain().startswith("index lookup"))
+			self.failUnlessEqual(self.names(query), set([5, "d"]))
+			try:
+				with self.g.batch():
+					self.g.remove_node(25)
+					self.g[35].size = 20
+					self.g.add_node("e", color="red", size=20)
+					raise ValueError
+			except ValueError:
+				pass
+			self.failUnlessEqual(self.names(self.g.search_range("nodes", "size", 20)), set([5, "d"]))
+			self.failUnlessEqual(self.names(self.g.search_nodes(size=5)), set(range(25, 100, 10)))
+			self.failUnlessEqual(self.names(self.g.search_nodes(color="red")), set(["a"]))
+		self.failUnlessEqual(self.names(self.g.search_nodes(size=20)), set([5, "d"]))
+		try:
+			with self.g.batch():
+				self.g.remove_node("d")
+				raise ValueError
+		except ValueError:
+			pass
+		self.failUnlessEqual(self.names(self.g.search_nodes(size=20)), set([5, "d"]))
+
+	def testContractionIsAtomic(self):
+		def node_data(start, end):
+			raise ValueError
+		self.failUnlessRaises(ValueError, self.g.contract_edge, "ab", node_data)
+		# fail once the edges have been moved
+		remove_node = self.g.remove_node
+		def failing_remove_node(node):
+			self.g.remove_node = remove_node
+			raise ValueError
+		self.g.remove_node = failing_remove_node
+		self.failUnlessRaises(ValueError, self.g.contract_edge, "bc", lambda start, end: {"name": "d"})
+		self.failUnlessUnchanged()
+		self.failIf("d" in self.g)
+
+
 class EdgeMovementTest(BaseGraphTest):
 
 	def setUp(self):
@@ -561,6 +1346,32 @@ class TraversalTest(BaseGraphTest):
 		self.failUnless(positions["A"] < min(positions["B"], positions["C"], positions["E"]))
 		self.failUnless(max(positions["B"], positions["C"], positions["E"]) < min(positions["D"], positions["F"], positions["G"]))
 
+	def testDepthFirstOrder(self):
+		# children are visited in the order their edges were added, and
+		# E stays where A discovered it rather than being reached via F
+		names = [node.first_name for node in self.g.depth_first_traversal(self.nodes["A"])]
+		self.failUnlessEqual(names, ["A", "B", "D", "F", "C", "G", "E"])
+		edges = list(self.g.depth_first_edge_traversal(self.nodes["A"]))
+		self.failUnlessEqual(edges[:2], self.edges[:2])
+		self.failUnlessEqual(set(edges), set(self.edges))
+
+	def testPriorityTraversal(self):
+		names = [node.first_name for node in self.g.priority_traversal(self.nodes["A"], lambda n: n.first_name)]
+		self.failUnlessEqual(names, ["A", "B", "C", "D", "E", "F", "G"])
+		names = [node.first_name for node in self.g.priority_traversal(self.nodes["A"], lambda n: -n.out_degree)]
+		self.failUnlessEqual(names[:2], ["A", "B"])
+		edges = list(self.g.priority_edge_traversal(self.nodes["A"], lambda e: e.end.first_name))
+		self.failUnlessEqual(len(edges), len(self.edges))
+		self.failUnlessEqual(edges[0].end.first_name, "B")
+
+	def testWideTraversal(self):
+		g = self.build_graph()
+		for i in range(3000):
+			g.add_edge("hub", i)
+		for traversal in (g.depth_first_traversal, g.breadth_first_traversal):
+			self.failUnlessEqual(len(list(traversal("hub"))), 3001)
+		self.failUnlessEqual(len(list(g.heuristic_traversal("hub", lambda s: s.pop()))), 3001)
+
 	def testLevelTraversal(self):
 		g = self.g
 		ab = g.add_edge('a', 'b', is_directed=False)
@@ -767,6 +1578,87 @@ class GraphCorrectnessTest(BaseGraphTest):
 		self.failUnlessEqual(diff.order, 2)
 		self.failUnlessEqual(diff.size, 1)
 
+	def testSetOperationData(self):
+		g1 = self.build_graph()
+		g2 = self.build_graph()
+		g1.add_node(1, color="red", size=3)
+		g1.add_edge(1, 2, 12, is_directed=False, weight=1)
+		g1.add_edge(2, 3, 23)
+		g2.add_node(1, color="blue")
+		g2.add_edge(1, 2, 12, is_directed=False, weight=2)
+		# their data wins in unions and intersections
+		for g in (g1 | g2, g1 & g2):
+			self.failUnlessEqual(dict(g[1].data), {"color": "blue"})
+			self.failUnlessEqual(g[12].weight, 2)
+			self.failIf(g[12].is_directed)
+		# and edges keep their direction in differences
+		diff = g1 - self.build_graph()
+		self.failIf(diff[12].is_directed)
+		self.failUnless(diff[23].is_directed)
+
+	def testInPlaceUnion(self):
+		g1 = self.build_graph()
+		g2 = self.build_graph()
+		g1.add_node(1, color="red")
+		g1.add_edge(1, 2, 12)
+		g1.add_edge(2, 3, 23, weight=1)
+		g2.add_node(1, color="blue")
+		g2.add_edge(2, 3, 23, weight=2)
+		g2.add_edge(3, 2, 32)
+		g2.add_edge(4, 1, 41)
+		g = g1
+		g1 |= g2
+		self.failUnless(g1 is g)
+		self.failUnlessEqual(g1, g | g2)
+		self.failUnlessEqual(set(node.name for node in g1.nodes), set([1, 2, 3, 4]))
+		self.failUnlessEqual(set(edge.name for edge in g1.edges), set([12, 23, 32, 41]))
+		self.failUnlessEqual(g1[1].color, "blue")
+		self.failUnlessEqual(g1[23].weight, 2)
+		self.failUnlessEqual(set(g1[1].incoming), set([g1[41]]))
+		# an edge that moves is replaced
+		g3 = self.build_graph()
+		g3.add_edge(4, 3, 12)
+		g1 |= g3
+		self.failUnlessEqual(g1[12].start.name, 4)
+		self.failUnlessEqual([edge.name for edge in g1[2].incoming], [32])
+
+	def testInPlaceIntersection(self):
+		g1 = self.build_graph()
+		g2 = self.build_graph()
+		g1.add_node(1, color="red")
+		g1.add_edge(1, 2, 12)
+		g1.add_edge(2, 3, 23)
+		g1.add_edge(3, 1, 31)
+		g2.add_node(1, color="blue")
+		g2.add_edge(2, 1, 12, weight=2)
+		g2.add_edge(3, 4, 31)
+		expected = g1 & g2
+		g1 &= g2
+		self.failUnlessEqual(g1, expected)
+		self.failUnlessEqual(set(node.name for node in g1.nodes), set([1, 2, 3]))
+		self.failUnlessEqual(set(edge.name for edge in g1.edges), set([12, 31]))
+		self.failUnlessEqual(g1[1].color, "blue")
+		self.failUnlessEqual(g1[12].start.name, 2)
+		self.failUnlessEqual(g1[12].weight, 2)
+		self.failUnlessEqual(g1[31].end.name, 1)
+
+	def testInPlaceDifference(self):
+		g1 = self.build_graph()
+		g2 = self.build_graph()
+		g1.add_edge(0, 2, 20)
+		g1.add_edge(1, 2, 12)
+		g1.add_edge(2, 3, 23)
+		g1.add_edge(3, 1, 31)
+		g2.add_edge(1, 5, 15)
+		g2.add_edge(5, 3, 53)
+		g2.add_edge(4, 4, 23)
+		expected = g1 - g2
+		g1 -= g2
+		self.failUnlessEqual(g1, expected)
+		self.failUnlessEqual(set(node.name for node in g1.nodes), set([0, 2]))
+		self.failUnlessEqual(set(edge.name for edge in g1.edges), set([20]))
+		self.failUnlessEqual(list(g1[2].incoming), [g1[20]])
+
 	def testGetAllConnected(self):
 		# setup
 		g = self.build_graph()
@@ -864,6 +1756,292 @@ TODO:
 	- five node undirected tree
 """
 
+class ConnectedComponentsTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.g.add_edge("a", "b")
+		self.g.add_edge("c", "b")
+		self.g.add_edge("d", "e", is_directed=False)
+		self.g.add_node("f")
+
+	def names(self, components):
+		return set(frozenset(node.name for node in c) for c in components)
+
+	def testDisjointSet(self):
+		s = DisjointSet(range(5))
+		self.failUnlessEqual(len(s), 5)
+		self.failUnless(s.union(0, 1))
+		self.failUnless(s.union(2, 1))
+		self.failIf(s.union(0, 2))
+		self.failUnless(s.union(5, 6))
+		self.failUnless(6 in s)
+		self.failUnlessEqual(s.find(0), s.find(2))
+		self.failIfEqual(s.find(0), s.find(3))
+		self.failUnlessEqual(set(frozenset(g) for g in s.groups()), set([frozenset([0, 1, 2]), frozenset([3]), frozenset([4]), frozenset([5, 6])]))
+		self.failUnlessRaises(KeyError, s.find, 7)
+
+	def testWeakComponents(self):
+		expected = set([frozenset("abc"), frozenset("de"), frozenset("f")])
+		self.failUnlessEqual(self.names(self.g.get_connected_components()), expected)
+
+	def testIncremental(self):
+		g = self.g
+		g.get_connected_components(incremental=True)
+		g.add_edge("f", "a")
+		g.add_node("h")
+		expected = set([frozenset("abcf"), frozenset("de"), frozenset("h")])
+		self.failUnlessEqual(self.names(g.get_connected_components()), expected)
+		# removals invalidate the incremental structure
+		g.remove_edge(("f", "a"))
+		expected = set([frozenset("abc"), frozenset("de"), frozenset("f"), frozenset("h")])
+		self.failUnlessEqual(self.names(g.get_connected_components()), expected)
+		g.remove_node("b")
+		expected = set([frozenset("a"), frozenset("c"), frozenset("de"), frozenset("f"), frozenset("h")])
+		self.failUnlessEqual(self.names(g.get_connected_components(incremental=True)), expected)
+		g.move_edge(frozenset("de"), end=g["a"])
+		expected = set([frozenset("ad"), frozenset("c"), frozenset("e"), frozenset("f"), frozenset("h")])
+		self.failUnlessEqual(self.names(g.get_connected_components()), expected)
+
+
+class StronglyConnectedTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		# a -> b <-> c -> d, with d in an undirected pair with e
+		self.g.add_edge("a", "b")
+		self.g.add_edge("b", "c")
+		self.g.add_edge("c", "b")
+		self.g.add_edge("c", "d")
+		self.g.add_edge("d", "e", is_directed=False)
+		self.g.add_edge("a", "a")
+
+	def names(self, components):
+		return [frozenset(node.name for node in c) for c in components]
+
+	def testComponents(self):
+		components = self.names(self.g.strongly_connected_traversal())
+		self.failUnlessEqual(set(components), set([frozenset("a"), frozenset("bc"), frozenset("de")]))
+		# components come out in reverse topological order
+		self.failUnlessEqual(components, [frozenset("de"), frozenset("bc"), frozenset("a")])
+		self.failUnlessEqual(self.names(self.g.get_strongly_connected()), components)
+
+	def testGraphUnchanged(self):
+		before = [(e.name, e.start.name, e.end.name) for e in self.g.edges]
+		traversal = self.g.strongly_connected_traversal()
+		next(traversal)
+		self.failUnlessEqual([(e.name, e.start.name, e.end.name) for e in self.g.edges], before)
+
+	def testDeepGraph(self):
+		# deeper than the recursion limit
+		g = self.build_graph()
+		for i in range(5000):
+			g.add_edge(i, i + 1)
+		g.add_edge(5000, 0)
+		g.add_edge(0, "tail")
+		components = self.names(g.get_strongly_connected())
+		self.failUnlessEqual(components, [frozenset(["tail"]), frozenset(range(5001))])
+
+
+class ShortestPathTreeTest(BaseGraphTest):
+
+	def setUp(self):
+		g = self.build_graph()
+		self.ab = g.add_edge("a", "b", "ab", weight=10)
+		self.ad = g.add_edge("a", "d", "ad", weight=1)
+		self.db = g.add_edge("d", "b", "db", weight=2)
+		self.bc = g.add_edge("b", "c", "bc", weight=1, is_directed=False)
+		self.ce = g.add_edge("c", "e", "ce", weight=1)
+		g.add_node("unreachable")
+		self.g = g
+		self.tree = g.get_shortest_paths("a", get_weight=lambda e: e.weight, pretty=False)
+
+	def testTree(self):
+		g, tree = self.g, self.tree
+		self.failUnless(isinstance(tree, ShortestPathTree))
+		self.failUnlessEqual(len(tree), 5)
+		self.failUnless(g["e"] in tree)
+		self.failIf(g["unreachable"] in tree)
+		# b was relaxed twice, but only the best path survives
+		self.failUnlessEqual(tree.distance(g["b"]), 3)
+		self.failUnlessEqual(tree.path(g["e"]), [self.ad, self.db, self.bc, self.ce])
+		self.failUnlessEqual(tree.parent(g["c"]), self.bc)
+		self.failUnlessEqual(tree.parent(g["a"]), None)
+		self.failUnlessEqual(tree[g["c"]], (4, [self.ad, self.db, self.bc]))
+		self.failUnlessRaises(KeyError, tree.path, g["unreachable"])
+		self.failUnlessRaises(KeyError, tree.distance, g["unreachable"])
+
+	def testPretty(self):
+		g = self.g
+		tree = g.get_shortest_paths("a", get_weight=lambda e: e.weight)
+		path = tree[g["c"]]
+		self.failUnlessEqual(path.weight, 4)
+		self.failUnlessEqual(set(e.name for e in path.edges), set(["ad", "db", "bc"]))
+		self.failUnlessEqual(tree[g["a"]].order, 0)
+
+
+class ShortestPathTest(BaseGraphTest):
+
+	def setUp(self):
+		g = self.build_graph()
+		self.ab = g.add_edge("a", "b", "ab", weight=10)
+		self.ad = g.add_edge("a", "d", "ad", weight=1)
+		self.db = g.add_edge("d", "b", "db", weight=2)
+		self.bc = g.add_edge("b", "c", "bc", weight=1, is_directed=False)
+		self.ce = g.add_edge("c", "e", "ce", weight=1)
+		g.add_node("unreachable")
+		self.g = g
+		self.weight = lambda e: e.weight
+
+	def testShortestPath(self):
+		for bidirectional in (False, True):
+			path = self.g.get_shortest_path("a", "e", self.weight, bidirectional=bidirectional)
+			self.failUnlessEqual(path, (5, [self.ad, self.db, self.bc, self.ce]))
+			# against the direction of bc, which is undirected
+			path = self.g.get_shortest_path("c", "b", self.weight, bidirectional=bidirectional)
+			self.failUnlessEqual(path, (1, [self.bc]))
+			self.failUnlessEqual(self.g.get_shortest_path("a", "a", bidirectional=bidirectional), (0, []))
+			self.failUnlessRaises(ValueError, self.g.get_shortest_path, "e", "a", bidirectional=bidirectional)
+			self.failUnlessRaises(ValueError, self.g.get_shortest_path, "a", "unreachable", bidirectional=bidirectional)
+			self.failUnlessRaises(KeyError, self.g.get_shortest_path, "a", "nonexistent", bidirectional=bidirectional)
+
+	def testAgainstShortestPaths(self):
+		import random
+		rng = random.Random(12)
+		g = self.build_graph()
+		for i in range(60):
+			g.add_node(i)
+		for i in range(300):
+			g.add_edge(rng.randrange(60), rng.randrange(60), is_directed=rng.random() < 0.8, weight=rng.randint(0, 9))
+		for source in range(0, 60, 15):
+			tree = g.get_shortest_paths(source, self.weight, pretty=False)
+			for target in range(60):
+				for bidirectional in (False, True):
+					if g[target] in tree:
+						weight, path = g.get_shortest_path(source, target, self.weight, bidirectional=bidirectional)
+						self.failUnlessEqual(weight, tree.distance(g[target]))
+						self.failUnlessEqual(weight, sum(e.weight for e in path))
+					else:
+						self.failUnlessRaises(ValueError, g.get_shortest_path, source, target, self.weight, bidirectional)
+
+
+class AStarTest(BaseGraphTest):
+
+	def setUp(self):
+		g = self.build_graph()
+		for x in range(8):
+			for y in range(8):
+				if x: g.add_edge((x-1, y), (x, y), is_directed=False, weight=1)
+				if y: g.add_edge((x, y-1), (x, y), is_directed=False, weight=1)
+		# a one-way shortcut across the grid
+		self.shortcut = g.add_edge((0, 0), (7, 7), weight=3)
+		g.add_node("unreachable")
+		self.g = g
+		self.weight = lambda e: e.weight
+
+	def testManhattan(self):
+		manhattan = lambda n, t: abs(n.name[0] - t.name[0]) + abs(n.name[1] - t.name[1])
+		weight, path = self.g.astar((0, 1), (6, 5), self.weight, manhattan)
+		self.failUnlessEqual(weight, 10)
+		self.failUnlessEqual(len(path), 10)
+		self.failUnlessEqual(sum(e.weight for e in path), 10)
+		self.failUnlessEqual(self.g.astar((0, 0), (7, 7), self.weight), (3, [self.shortcut]))
+		self.failUnlessEqual(self.g.astar((3, 3), (3, 3), self.weight), (0, []))
+		self.failUnlessRaises(ValueError, self.g.astar, (0, 0), "unreachable")
+		self.failUnlessRaises(KeyError, self.g.astar, (0, 0), "nonexistent")
+
+	def testLandmarks(self):
+		h = self.g.get_landmark_heuristic(self.weight, landmarks=3)
+		self.failUnlessEqual(len(h.landmarks), 3)
+		self.failUnlessEqual(len(set(h.landmarks)), 3)
+		for source in [(0, 0), (7, 7), (2, 5)]:
+			tree = self.g.get_shortest_paths(source, self.weight, pretty=False)
+			for target, (distance, path) in tree.items():
+				# the heuristic must never overestimate
+				self.failUnless(h(self.g[source], target) <= distance)
+				self.failUnlessEqual(self.g.astar(source, target, self.weight, h)[0], distance)
+		# explicitly chosen landmarks
+		h = self.g.get_landmark_heuristic(self.weight, landmarks=[(7, 7)])
+		self.failUnlessEqual(h(self.g[(0, 0)], self.g[(7, 7)]), 3)
+		self.failUnlessEqual(h(self.g[(7, 7)], self.g[(0, 0)]), 14)
+		self.failUnlessEqual(h(self.g["unreachable"], self.g[(0, 0)]), 0)
+
+	def testAgainstShortestPath(self):
+		import random
+		rng = random.Random(8)
+		g = self.build_graph()
+		for i in range(40):
+			g.add_node(i)
+		for i in range(160):
+			g.add_edge(rng.randrange(40), rng.randrange(40), is_directed=rng.random() < 0.8, weight=rng.randint(0, 9))
+		h = g.get_landmark_heuristic(self.weight, landmarks=4)
+		for source in range(0, 40, 10):
+			tree = g.get_shortest_paths(source, self.weight, pretty=False)
+			for target in range(40):
+				if g[target] in tree:
+					weight, path = g.astar(source, target, self.weight, h)
+					self.failUnlessEqual(weight, tree.distance(g[target]))
+					self.failUnlessEqual(weight, sum(e.weight for e in path))
+				else:
+					self.failUnlessRaises(ValueError, g.astar, source, target, self.weight, h)
+
+
+class MinimumSpanTest(BaseGraphTest):
+
+	def setUp(self):
+		g = self.build_graph()
+		g.add_edge("a", "b", "ab", weight=1)
+		g.add_edge("c", "d", "cd", weight=1)
+		g.add_edge("b", "c", "bc", weight=2, is_directed=False)
+		g.add_edge("a", "d", "ad", weight=3)
+		g.add_edge("d", "d", "dd", weight=0)
+		g.add_edge("e", "f", "ef", weight=5)
+		g.add_node("g", color="red")
+		self.g = g
+		self.weight = lambda e: e.weight
+
+	def testSpan(self):
+		for algorithm in ("kruskal", "prim"):
+			tree = self.g.minimum_span(self.weight, algorithm)
+			self.failUnlessEqual(set(e.name for e in tree.edges), set(["ab", "cd", "bc", "ef"]))
+			self.failUnlessEqual(set(n.name for n in tree.nodes), set("abcdefg"))
+			self.failUnlessEqual(tree["g"].color, "red")
+			self.failUnlessEqual(tree["bc"].weight, 2)
+			self.failIf(tree["bc"].is_directed)
+			self.failUnless(tree["ab"].is_directed)
+			self.failUnlessEqual(len(tree.get_connected_components()), 3)
+		self.failUnlessRaises(ValueError, self.g.minimum_span, self.weight, "boruvka")
+
+	def testSortedEdges(self):
+		edges = sorted(self.g.edges, key=self.weight)
+		spanned = self.g.minimum_span_edges(sorted_edges=iter(edges))
+		self.failUnlessEqual(set(e.name for e in spanned), set(["ab", "cd", "bc", "ef"]))
+		# stops reading once every node is spanned
+		g = self.build_graph()
+		g.add_edge("a", "b", weight=1)
+		g.add_edge("b", "c", weight=2)
+		stream = iter(sorted(g.edges, key=self.weight) + [None])
+		self.failUnlessEqual(len(list(g.minimum_span_edges(sorted_edges=stream))), 2)
+		# only Kruskal's algorithm can use them
+		self.failUnlessRaises(ValueError, g.minimum_span_edges, self.weight, "prim", edges)
+		self.failUnlessRaises(ValueError, g.minimum_span, self.weight, "prim", edges)
+		self.failUnlessRaises(ValueError, g.minimum_span_edges, self.weight, "boruvka", edges)
+
+	def testAgainstEachOther(self):
+		import random
+		rng = random.Random(9)
+		g = self.build_graph()
+		for i in range(50):
+			g.add_node(i)
+		for i in range(200):
+			g.add_edge(rng.randrange(50), rng.randrange(50), weight=rng.randint(0, 20))
+		kruskal = list(g.minimum_span_edges(self.weight, "kruskal"))
+		prim = list(g.minimum_span_edges(self.weight, "prim"))
+		self.failUnlessEqual(len(kruskal), len(prim))
+		self.failUnlessEqual(sum(e.weight for e in kruskal), sum(e.weight for e in prim))
+		self.failUnlessEqual(len(kruskal), 50 - len(g.get_connected_components()))
+
+
 class ZeroNodeTest(BaseGraphTest):
 	# tests all applicable operations with the zero node case
 
@@ -1365,7 +2543,7 @@ class OneNodeDirectedTest(BaseGraphTest):
 	def testEdgeContraction(self):
 		# in this case, it should delete one node and add one node
 		def node_initializer(x, y):
-			d = x.data
+			d = dict(x.data)
 			d["name"] = x.name + "2"
 			return d
 		n = self.g.contract_edge(self.AA, node_initializer)
@@ -1657,7 +2835,7 @@ class OneNodeDoubleUndirectedTest(OneNodeDirectedTest):
 	def testEdgeContraction(self):
 		# in this case, it should delete one node and add one node
 		def node_initializer(x, y):
-			d = x.data
+			d = dict(x.data)
 			d["name"] = x.name + "2"
 			return d
 		n = self.g.contract_edge(self.AA, node_initializer)
@@ -2493,7 +3671,7 @@ class ThreeNodeCycleTest(BaseGraphTest):
 	def testEdgeContraction(self):
 		# in this case, it should delete two nodes and add one node
 		def node_initializer(x, y):
-			d = x.data
+			d = dict(x.data)
 			d["name"] = x.name + "2"
 			return d
 		n = self.g.contract_edge(self.AB, node_initializer)
@@ -2657,6 +3835,734 @@ class ThreeNodeCycleTest(BaseGraphTest):
 		self.failUnlessEqual((set(self.g.nodes) - set(G.nodes), set(self.g.edges) - set(G.edges)), (set(G2.nodes), set(G2.edges)))
 
 
+#################################################################################################################################
+#                                                        BACKEND TESTS                                                          #
+#################################################################################################################################
+
+class CompactGraphTest(BaseGraphTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+	def testBackendSelection(self):
+		self.failUnless(type(self.build_graph()) is CompactGraph)
+		self.failUnless(type(Graph(backend="default")) is Graph)
+		self.failUnless(type(Graph()) is Graph)
+		self.failUnless(type(CompactGraph()) is CompactGraph)
+		self.failUnlessRaises(ValueError, Graph, backend="nonexistent")
+		g = Graph(nodes=['a', 'b'], edges=[('a', 'b')], backend="compact")
+		self.failUnlessEqual(g.order, 2)
+		self.failUnlessEqual(g.size, 1)
+
+	def testRemovedElements(self):
+		# removed elements keep their data, as on the default backend
+		for backend in ("default", "compact"):
+			g = Graph(backend=backend)
+			g.add_node("a", color="red")
+			g.add_edge("a", "b", "ab", weight=3)
+			g.add_edge("b", "c", "bc", is_directed=False)
+			e = g.remove_edge("ab")
+			self.failUnlessEqual(repr(e), "Edge(name=ab, weight=3)")
+			self.failUnlessEqual((e.weight, e.start.name, e.end.name, e.is_directed), (3, "a", "b", True))
+			self.failIf(g.remove_edge("bc").is_directed)
+			n = g.remove_node("a")
+			self.failUnlessEqual(repr(n), "Node(name=a, color=red)")
+			self.failUnlessEqual((n.color, n.data, n.edges), ("red", {"color": "red"}, []))
+			self.failIf(n in g)
+			# and changing them leaves the graph alone
+			n.color = "blue"
+			g.add_node("a")
+			self.failUnlessEqual(g["a"].data, {})
+
+	def testStorage(self):
+		g = self.build_graph()
+		ab = g.add_edge("a", "b", "ab")
+		bb = g.add_edge("b", "b", "bb", is_directed=False)
+		self.failUnlessEqual(g._node_names, ["a", "b"])
+		self.failUnlessEqual(list(g._starts), [0, 1])
+		self.failUnlessEqual(list(g._ends), [1, 1])
+		self.failUnlessEqual(list(g._directions), [1, 0])
+		self.failUnlessEqual(list(g._out[0]), [0])
+		self.failUnlessEqual(list(g._in[1]), [0])
+		self.failUnlessEqual(list(g._bi[1]), [1])
+		self.failUnlessEqual(g._in[0], None)
+		# elements without data don't get a data table entry
+		self.failUnlessEqual(g._node_data, {})
+		self.failUnlessEqual(g._edge_data, {})
+
+	def testAttributes(self):
+		g = self.build_graph()
+		a = g.add_node("a", weight=5)
+		self.failUnlessEqual(a.weight, 5)
+		self.failUnlessEqual(g["a"].weight, 5)
+		g["a"].color = "blue"
+		self.failUnlessEqual(a.data, {"weight": 5, "color": "blue"})
+		del a.weight
+		self.failUnlessEqual(g["a"].data, {"color": "blue"})
+		self.failUnlessRaises(AttributeError, getattr, a, "weight")
+		e = g.add_edge("a", "b", distance=3)
+		self.failUnlessEqual(e.data, {"distance": 3})
+		self.failUnlessEqual(e.name, ("a", "b"))
+		self.failUnlessEqual(e.start, a)
+		self.failUnlessEqual(e.other_end("a"), g["b"])
+		self.failUnlessRaises(AttributeError, e.other_end, "b")
+
+	def testRemoval(self):
+		g = self.build_graph()
+		g.add_edge("a", "b", "ab")
+		g.add_edge("a", "a", "aa")
+		g.add_edge("b", "a", "ba", is_directed=False)
+		a = g.remove_node("a")
+		self.failUnlessEqual(a.name, "a")
+		self.failIf(a in g)
+		self.failUnlessEqual(set(e.name for e in g.edges), set())
+		self.failUnlessEqual(g["b"].edges, [])
+		# readding a node gives it a new id
+		a = g.add_node("a")
+		self.failUnlessEqual(g._node_ids["a"], 2)
+		self.failUnlessEqual(g["a"].edges, [])
+
+	def testHubRemoval(self):
+		# removing most of a hub's edges, one at a time, compacts its
+		# arrays, and neither disturbs the order of the rest
+		g = self.build_graph()
+		spokes = [g.add_edge("hub", i, i) for i in range(20)]
+		spokes += [g.add_edge(i, "hub", -i - 1, is_directed=False) for i in range(20)]
+		spokes.append(g.add_edge("hub", "hub", "loop"))
+		removed = [i for i in range(20) if i % 3] + [-i - 1 for i in range(20) if i % 4]
+		for name in removed:
+			g.remove_edge(name)
+		expected = [e for e in spokes if e.name not in removed]
+		hub = g["hub"]
+		directed = [e for e in expected if e.is_directed]
+		undirected = [e for e in expected if not e.is_directed]
+		self.failUnlessEqual(hub.outgoing, directed + undirected)
+		self.failUnlessEqual(hub.bidirectional, undirected)
+		self.failUnlessEqual((len(hub._outgoing), len(hub._bidirectional)), (8, 5))
+		for e in spokes:
+			self.failUnlessEqual(e.name in hub._outgoing, e in directed)
+			self.failUnlessEqual(e.name in hub._bidirectional, e in undirected)
+		self.failIf("loop" in hub._bidirectional)
+		self.failUnless("loop" in hub._incoming)
+		# the remaining edges can still be moved and removed
+		g.move_edge(0, start=1)
+		g.remove_edge(3)
+		self.failUnlessEqual([e.name for e in g[1].outgoing], [0])
+		g.remove_node("hub")
+		self.failUnlessEqual(g.size, 1)
+		for i in range(20):
+			self.failUnlessEqual([e.name for e in g[i].edges], [0] if i in (0, 1) else [])
+
+	def adjacency(self, g):
+		# every node's edges, in order, by kind
+		return dict((node.name, ([e.name for e in node.outgoing], [e.name for e in node.incoming],
+			[e.name for e in node.bidirectional])) for node in g.nodes)
+
+	def testBulkFastPath(self):
+		# unique edges are appended straight onto the arrays, which must
+		# match adding them one at a time
+		g = self.build_graph()
+		g.add_node("a", weight=1)
+		edges = [("a", "b", None, True, {}), ("b", "c", "bc", False, {"weight": 2}),
+			("c", "c", None, True, {}), ("c", "c", None, False, {"kind": "loop"}),
+			(g["a"], "d", "ad", True, {}), ("d", "a", None, False, {}), ("a", "b", "again", True, {})]
+		g.add_edges_from(edges, unique=True)
+		h = self.build_graph()
+		h.add_node("a", weight=1)
+		for start, end, name, is_directed, data in edges:
+			if isinstance(start, GraphElement): start = h[start.name]
+			h.add_edge(start, end, name, is_directed, **data)
+		self.failUnlessEqual([n.name for n in g.nodes], [n.name for n in h.nodes])
+		self.failUnlessEqual([e.name for e in g.edges], [e.name for e in h.edges])
+		for e in h.edges:
+			self.failUnlessEqual((g[e.name].start, g[e.name].end, g[e.name].is_directed), (e.start, e.end, e.is_directed))
+			self.failUnlessEqual(dict(g[e.name].data), dict(e.data))
+		self.failUnlessEqual(g["a"].data, {"weight": 1})
+		self.failUnlessEqual(self.adjacency(g), self.adjacency(h))
+		self.failUnlessEqual(g["c"]._loops, h["c"]._loops)
+		# and be removed the same way afterwards
+		for graph in (g, h):
+			graph.remove_edge("bc")
+			graph.remove_edge(("a", "b"))
+			graph.remove_node("d")
+		self.failUnlessEqual(self.adjacency(g), self.adjacency(h))
+
+
+class MappedGraphTest(BaseGraphTest):
+
+	def setUp(self):
+		g = self.build_graph()
+		g.add_node("a", color="red", rank=1)
+		g.add_node("b", color="blue", rank=2)
+		g.add_edge("a", "b", "ab", weight=1)
+		g.add_edge("b", "c", "bc", weight=2)
+		g.add_edge("a", "c", "ac", weight=5)
+		g.add_edge("c", "a", "ca", weight=1)
+		g.add_edge("c", "d", is_directed=False)
+		fd, self.path = tempfile.mkstemp()
+		os.close(fd)
+		snapshot.save(g, self.path)
+		self.g = snapshot.MappedGraph(self.path)
+
+	def tearDown(self):
+		if self.g.__dict__: self.g.close()
+		os.remove(self.path)
+
+	def names(self, elements):
+		return set(element.name for element in elements)
+
+	def testReadOnly(self):
+		g = self.g
+		self.failUnlessRaises(TypeError, g.add_node, "e")
+		self.failUnlessRaises(TypeError, g.add_edge, "a", "d")
+		self.failUnlessRaises(TypeError, g.add_nodes_from, ["e"])
+		self.failUnlessRaises(TypeError, g.add_edges_from, [("a", "d")])
+		self.failUnlessRaises(TypeError, g.remove_node, "a")
+		self.failUnlessRaises(TypeError, g.remove_edge, "ab")
+		self.failUnlessRaises(TypeError, g.move_edge, "ab", end="d")
+		self.failUnlessRaises(TypeError, g.transpose)
+		self.failUnlessRaises(TypeError, setattr, g["a"], "color", "green")
+		self.failUnlessRaises(TypeError, delattr, g["ab"], "weight")
+		self.failUnlessEqual((g.order, g.size), (4, 5))
+		self.failUnlessEqual(g["a"].color, "red")
+		# derived graphs can be changed
+		derived = g.snapshot()
+		derived.add_node("e")
+		derived["a"].color = "green"
+		self.failUnlessEqual(g["a"].color, "red")
+		self.failUnlessEqual(g.order, 4)
+
+	def testTraversal(self):
+		g = self.g
+		self.failUnlessEqual(self.names(g["a"].outgoing), set(["ab", "ac"]))
+		self.failUnlessEqual(self.names(g["a"].incoming), set(["ca"]))
+		self.failUnlessEqual(self.names(g["c"].bidirectional), set([frozenset(["c", "d"])]))
+		self.failUnlessEqual([n.name for n in g.depth_first_traversal("a")][0], "a")
+		self.failUnlessEqual(self.names(g.breadth_first_traversal("a")), set(["a", "b", "c", "d"]))
+		weight, path = g.get_shortest_path("a", "c", lambda e: e.weight)
+		self.failUnlessEqual((weight, [e.name for e in path]), (3, ["ab", "bc"]))
+		components = [self.names(c) for c in g.get_strongly_connected()]
+		self.failUnless(set(["a", "b", "c", "d"]) in components)
+
+	def testSearch(self):
+		g = self.g
+		self.failUnlessEqual(self.names(g.search_nodes(color="red")), set(["a"]))
+		self.failUnlessEqual(self.names(g.search_nodes(where("rank") > 1)), set(["b"]))
+		self.failUnlessEqual(self.names(g.search_edges(start="a")), set(["ab", "ac"]))
+		self.failUnlessEqual(self.names(g.search_range("edges", "weight", 2, 5)), set(["bc", "ac"]))
+		self.failUnlessEqual(g.query("edges", weight=1, end="a").first().name, "ca")
+
+	def testClose(self):
+		with snapshot.MappedGraph(self.path) as g:
+			a = g["a"]
+			self.failUnlessEqual(a.color, "red")
+		self.failUnlessEqual(g.__dict__, {})
+		self.g.close()
+		self.failUnlessEqual(self.g.__dict__, {})
+
+
+class CompactNodeCreationTest(NodeCreationTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactEdgeCreationTest(EdgeCreationTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactAdjacencyTest(AdjacencyTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactAdjacencyOrderTest(AdjacencyOrderTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactEdgeViewTest(EdgeViewTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactConnectedComponentsTest(ConnectedComponentsTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactStronglyConnectedTest(StronglyConnectedTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactShortestPathTreeTest(ShortestPathTreeTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactShortestPathTest(ShortestPathTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactAStarTest(AStarTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactMinimumSpanTest(MinimumSpanTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactIndexTest(IndexTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactQueryTest(QueryTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactBulkConstructionTest(BulkConstructionTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactSubgraphViewTest(SubgraphViewTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactSnapshotTest(SnapshotTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+	def testSnapshotElements(self):
+		# views of the snapshot's elements change only the snapshot
+		snap = self.g.snapshot()
+		snap["a"].color = "blue"
+		del snap["ab"].weight
+		self.failUnlessEqual(self.g["a"].color, "red")
+		self.failUnlessEqual(self.g["ab"].weight, 1)
+		self.failUnlessEqual(snap["a"].color, "blue")
+		self.failIf("weight" in snap["ab"].data)
+
+
+class CompactBatchTest(BatchTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactRemovalTest(RemovalTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactOverwriteTest(OverwriteTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactGraphSearchTest(GraphSearchTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactEdgeMovementTest(EdgeMovementTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactTraversalTest(TraversalTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactInductionTest(InductionTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+class CompactGraphCorrectnessTest(GraphCorrectnessTest):
+
+	def build_graph(self):
+		return Graph(backend="compact")
+
+
+#################################################################################################################################
+#                                                          EXTRAS TESTS                                                         #
+#################################################################################################################################
+
+class GraphMLReaderTest(BaseGraphTest):
+
+	document = b"""<?xml version="1.0" encoding="utf-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+<key id="d0" for="node" attr.name="color" attr.type="string"><default>blue</default></key>
+<key id="d1" for="all" attr.name="weight" attr.type="int"><default>1</default></key>
+<graph edgedefault="directed">
+<node id="a"/>
+<edge id="ac" source="a" target="c"/>
+<node id="b"/>
+<node id="c"><data key="d0">red</data></node>
+<edge id="ab" source="a" target="b" directed="false"><data key="d1">5</data></edge>
+</graph>
+</graphml>
+"""
+
+	def read(self, data, **kwargs):
+		return graphml.Reader(**kwargs).read(BytesIO(data))
+
+	def failUnlessDocument(self, g):
+		self.failUnlessEqual(set(node.name for node in g.nodes), set(["a", "b", "c"]))
+		self.failUnlessEqual(set(edge.name for edge in g.edges), set(["ab", "ac"]))
+		self.failUnlessEqual((g["ac"].start.name, g["ac"].end.name), ("a", "c"))
+		self.failIf(g["ab"].is_directed)
+		self.failUnlessEqual(g["c"].color, "red")
+
+	def testBatching(self):
+		# nodes defined after an edge that made them keep the edge
+		for batch_size in (1, 2, 3, 4, 10000):
+			for backend in (None, "compact"):
+				self.failUnlessDocument(self.read(self.document, batch_size=batch_size, backend=backend))
+
+	def testDefaults(self):
+		g = self.read(self.document)
+		self.failUnlessEqual(g["a"].color, "blue")
+		self.failUnlessEqual(g["a"].weight, 1)
+		self.failUnlessEqual(g["c"].weight, 1)
+		self.failUnlessEqual(g["ab"].weight, 5)
+		self.failUnlessEqual(g["ac"].weight, 1)
+		self.failIf("color" in g["ac"].data)
+
+	def testCompressed(self):
+		raw = BytesIO()
+		f = gzip.GzipFile(fileobj=raw, mode="wb")
+		f.write(self.document)
+		f.close()
+		self.failUnlessDocument(self.read(raw.getvalue()))
+		self.failUnlessDocument(self.read(bz2.compress(self.document)))
+		# concatenated streams, as written by pbzip2
+		half = len(self.document) // 2
+		self.failUnlessDocument(self.read(bz2.compress(self.document[:half]) + bz2.compress(self.document[half:])))
+		if graphml.lzma is not None:
+			self.failUnlessDocument(self.read(graphml.lzma.compress(self.document)))
+
+	def testPipes(self):
+		# streams that can't seek, such as pipes, should still be read
+		documents = [self.document, bz2.compress(self.document)]
+		if graphml.lzma is not None:
+			documents.append(graphml.lzma.compress(self.document))
+		if sys.version_info >= (3,):
+			raw = BytesIO()
+			f = gzip.GzipFile(fileobj=raw, mode="wb")
+			f.write(self.document)
+			f.close()
+			documents.append(raw.getvalue())
+		for document in documents:
+			read, write = os.pipe()
+			os.write(write, document)
+			os.close(write)
+			source = os.fdopen(read, "rb")
+			try: self.failUnlessDocument(graphml.Reader().read(source))
+			finally: source.close()
+
+	def testMalformed(self):
+		self.failUnlessRaises(graphml.ParseError, self.read, b'<graphml xmlns="http://graphml.graphdrawing.org/xmlns"/>')
+		bad = self.document.replace(b'<data key="d0">', b'<data key="d9">')
+		self.failUnlessRaises(graphml.ParseError, self.read, bad)
+
+
+class GraphMLWriterTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.g.add_node("a")
+		self.g.add_node("b", label=u"<b> & \"c\" 'd'")
+		# keys that only appear on later elements
+		self.g.add_node("c", rank=3, score=0.25, ok=True)
+		self.g.add_node("d", **{"odd <name> & \"key\"": u"caf\xe9"})
+		self.g.add_edge("a", "b")
+		self.g.add_edge("b", "c", weight=2)
+		self.g.add_edge("c", "d", is_directed=False, note=u"]]> </edge>")
+
+	def round_trip(self, g, **kwargs):
+		out = BytesIO()
+		graphml.store(g, out, **kwargs)
+		return graphml.load(BytesIO(out.getvalue()))
+
+	def failUnlessSameData(self, g, h):
+		# the writer renames nodes, so compare structure and data
+		for describe in (lambda g: [dict(node.data) for node in g.nodes],
+				lambda g: [(dict(e.start.data), dict(e.end.data), e.is_directed, dict(e.data)) for e in g.edges]):
+			theirs = describe(h)
+			for ours in describe(g):
+				self.failUnless(ours in theirs, "%r not in %r" % (ours, theirs))
+				theirs.remove(ours)
+			self.failUnlessEqual(theirs, [])
+
+	def testRoundTrip(self):
+		h = self.round_trip(self.g)
+		self.failUnlessEqual((h.order, h.size), (4, 3))
+		self.failUnlessSameData(self.g, h)
+		self.failUnlessEqual(type(next(h.search_nodes(rank=3)).score), float)
+
+	def testObjects(self):
+		self.g["a"].stuff = (1, 2)
+		self.failUnlessRaises(ValueError, self.round_trip, self.g)
+		h = self.round_trip(self.g, obj_extension=True)
+		self.failUnlessSameData(self.g, h)
+
+	def testStream(self):
+		nodes = ((i, {"label": u"<%d>" % i}) for i in range(5))
+		edges = ((i - 1, i, i % 2 == 0, {"weight": i}) for i in range(1, 5))
+		out = BytesIO()
+		graphml.store_stream(nodes, edges, out, node_keys=[("label", "string")], edge_keys=[("weight", "int")])
+		h = graphml.load(BytesIO(out.getvalue()))
+		self.failUnlessEqual(sorted(node.label for node in h.nodes), [u"<%d>" % i for i in range(5)])
+		self.failUnlessEqual(sorted((edge.weight, edge.is_directed) for edge in h.edges),
+			[(1, False), (2, True), (3, False), (4, True)])
+		# undeclared keys and unwritten nodes are refused
+		out = BytesIO()
+		self.failUnlessRaises(ValueError, graphml.store_stream, [(0, {"label": u"x"})], [], out)
+		self.failUnlessRaises(ValueError, graphml.store_stream, [(0, {})], [(0, 1, True, {})], BytesIO())
+
+
+class DotTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.names = ["plain", "two words", 'say "hi"', "back\\slash", "line\nbreak", "node", "edge", "graph", 7]
+		for name in self.names:
+			self.g.add_node(name, label="same")
+		self.g.add_edge("node", "edge")
+		self.g.add_edge("two words", 'say "hi"', is_directed=False)
+		self.g.add_edge(7, "graph", "strict")
+
+	def unquote(self, line):
+		# the quoted identifiers and values on a line, unescaped
+		values = re.findall(r'"((?:[^"\\]|\\.)*)"', line)
+		return [re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), v) for v in values]
+
+	def testQuote(self):
+		self.failUnlessEqual(dot.quote("node"), '"node"')
+		self.failUnlessEqual(dot.quote("two words"), '"two words"')
+		self.failUnlessEqual(dot.quote('say "hi"'), '"say \\"hi\\""')
+		self.failUnlessEqual(dot.quote("a\\b"), '"a\\\\b"')
+		self.failUnlessEqual(dot.quote("a\nb"), '"a\\nb"')
+		self.failUnlessEqual(dot.quote(("a", 1)), '"(\'a\', 1)"')
+		for name in self.names:
+			self.failUnlessEqual(self.unquote(dot.quote(name)), [str(name)])
+
+	def testIdentifiers(self):
+		text = dot.DotGenerator().draw(self.g, "my graph")
+		lines = text.splitlines()
+		self.failUnlessEqual(lines[0], 'digraph "my graph" {')
+		self.failUnlessEqual(lines[-1], "}")
+		# every node gets its own line, identified by its quoted name
+		ids = [self.unquote(line)[0] for line in lines[1:-1] if " -> " not in line]
+		self.failUnlessEqual(sorted(ids), sorted(str(name) for name in self.names))
+		edges = [line for line in lines[1:-1] if " -> " in line]
+		self.failUnlessEqual(len(edges), 3)
+		self.failUnless('\t"node" -> "edge" [' in text)
+		self.failUnless('\t"7" -> "graph" [' in text)
+		undirected = [line for line in edges if line.startswith('\t"two words"')][0]
+		self.failUnless('dir="none"' in undirected)
+		undirected = dot.DotGenerator(is_directed=False).draw(self.g, "G")
+		self.failUnless(undirected.startswith('graph "G" {'))
+		self.failUnless('\t"node" -- "edge" [' in undirected)
+
+	def testSharedProperties(self):
+		# getters may hand out the same dict for every edge
+		shared = {"color": "red"}
+		text = dot.DotGenerator(edge_property_getter=lambda e: shared).draw(self.g, "G")
+		self.failUnlessEqual(shared, {"color": "red"})
+		directed = [line for line in text.splitlines() if line.startswith('\t"node" -> ')][0]
+		self.failIf("dir=" in directed)
+
+	def testStreaming(self):
+		generator = dot.DotGenerator()
+		whole = generator.draw(self.g, "G")
+		for chunk_size in (1, 10, 100, 65536):
+			chunks = list(generator.generate(self.g, "G", chunk_size))
+			self.failUnlessEqual("".join(chunks), whole)
+			if chunk_size == 65536: self.failUnlessEqual(len(chunks), 1)
+		written = []
+		class Out(object):
+			write = written.append
+		generator.write(self.g, Out(), "G", chunk_size=16)
+		self.failUnlessEqual("".join(written), whole)
+		self.failUnless(len(written) > 1)
+
+
+class ConstructorsTest(BaseGraphTest):
+
+	def describe(self, g):
+		nodes = sorted((repr(n.name), sorted(n.data.items())) for n in g.nodes)
+		edges = sorted((repr(e.name), repr(e.start.name), repr(e.end.name), e.is_directed) for e in g.edges)
+		return nodes, edges
+
+	def generators(self, seed, backend=None):
+		yield constructors.erdos_renyi(40, 0.1, seed=seed, backend=backend)
+		yield constructors.erdos_renyi(40, 0.1, is_directed=True, seed=seed, backend=backend)
+		yield constructors.barabasi_albert(40, 3, seed=seed, backend=backend)
+		yield constructors.random_geometric(40, 0.2, seed=seed, backend=backend)
+
+	def testSeeds(self):
+		first = [self.describe(g) for g in self.generators(42)]
+		self.failUnlessEqual([self.describe(g) for g in self.generators(42)], first)
+		self.failUnlessEqual([self.describe(g) for g in self.generators(42, "compact")], first)
+		self.failIfEqual([self.describe(g) for g in self.generators(43)], first)
+
+	def testErdosRenyi(self):
+		for is_directed in (False, True):
+			g = constructors.erdos_renyi(12, 1, is_directed, seed=1)
+			self.failUnlessEqual(g.size, 12 * 11 // (1 if is_directed else 2))
+			self.failUnlessEqual(constructors.erdos_renyi(12, 0, is_directed, seed=1).size, 0)
+			g = constructors.erdos_renyi(60, 0.3, is_directed, seed=1)
+			for e in g.edges:
+				self.failIfEqual(e.start, e.end)
+				self.failUnlessEqual(e.name, (e.start.name, e.end.name))
+				self.failUnlessEqual(e.is_directed, is_directed)
+				if not is_directed: self.failUnless(e.start.name < e.end.name)
+
+	def testBarabasiAlbert(self):
+		g = constructors.barabasi_albert(50, 3, seed=7)
+		self.failUnlessEqual((g.order, g.size), (50, 47 * 3))
+		for i in range(3, 50):
+			self.failUnlessEqual(len([e for e in g[i].edges if e.start.name == i]), 3)
+		self.failUnlessRaises(ValueError, constructors.barabasi_albert, 3, 3)
+
+	def testRandomGeometric(self):
+		g = constructors.random_geometric(60, 0.25, seed=3)
+		expected = set()
+		for i in range(60):
+			for j in range(i + 1, 60):
+				a, b = g[i].position, g[j].position
+				if sum((x - y) ** 2 for x, y in zip(a, b)) <= 0.25 ** 2:
+					expected.add((i, j))
+		self.failUnlessEqual(set(e.name for e in g.edges), expected)
+
+
+class SnapshotFileTest(BaseGraphTest):
+
+	def setUp(self):
+		self.g = self.build_graph()
+		self.g.add_node(1, count=1, ratio=0.5, flag=True, label=u"one", raw=b"\x00\xff")
+		self.g.add_node((2, "two"), count=2, label=u"caf\xe9", mixed=u"text")
+		self.g.add_node(frozenset(["x", "y"]), mixed=3, big=2**70, flag=False)
+		self.g.add_node("plain", mixed=None)
+		# a default directed name, a default undirected name and explicit ones
+		self.g.add_edge(1, (2, "two"), weight=1.5)
+		self.g.add_edge((2, "two"), "plain", is_directed=False)
+		self.g.add_edge(1, 1, "loop", kind=u"self")
+		self.g.add_edge("plain", "plain", frozenset(["undirected", "loop"]), is_directed=False)
+		# parallel edges
+		self.g.add_edge(1, "plain", "first", weight=1)
+		self.g.add_edge(1, "plain", "second", weight=2)
+		self.g.add_edge("plain", 1, ("back", 3))
+
+	def round_trip(self, g, **kwargs):
+		out = BytesIO()
+		snapshot.save(g, out)
+		return snapshot.load(BytesIO(out.getvalue()), **kwargs)
+
+	def failUnlessSameGraph(self, g, h):
+		self.failUnlessEqual(set(node.name for node in h.nodes), set(node.name for node in g.nodes))
+		self.failUnlessEqual(set(edge.name for edge in h.edges), set(edge.name for edge in g.edges))
+		for node in g.nodes:
+			self.failUnlessEqual(dict(h[node.name].data), dict(node.data))
+			self.failUnlessEqual(set(e.name for e in h[node.name].edges), set(e.name for e in node.edges))
+		for edge in g.edges:
+			other = h[edge.name]
+			self.failUnlessEqual((other.start.name, other.end.name), (edge.start.name, edge.end.name))
+			self.failUnlessEqual(other.is_directed, edge.is_directed)
+			self.failUnlessEqual(dict(other.data), dict(edge.data))
+		# values keep their types, not just compare equal
+		for node in g.nodes:
+			for name, value in node.data.items():
+				self.failUnlessEqual(type(h[node.name].data[name]), type(value))
+
+	def testRoundTrip(self):
+		for backend in (None, "compact"):
+			h = self.round_trip(self.g, backend=backend)
+			self.failUnlessSameGraph(self.g, h)
+			self.failUnlessEqual(type(h).__name__, type(Graph(backend=backend)).__name__)
+
+	def testFromCompact(self):
+		g = self.g | Graph(backend="compact")
+		self.failUnlessSameGraph(self.g, self.round_trip(g))
+
+	def testColumns(self):
+		out = BytesIO()
+		snapshot.save(self.g, out)
+		with snapshot.Snapshot(BytesIO(out.getvalue())) as s:
+			kinds = dict(s.meta["columns"]["node"])
+			self.failUnlessEqual(kinds["count"], "int")
+			self.failUnlessEqual(kinds["ratio"], "float")
+			self.failUnlessEqual(kinds["flag"], "bool")
+			self.failUnlessEqual(kinds["label"], "str")
+			self.failUnlessEqual(kinds["mixed"], "object")
+			self.failUnlessEqual(kinds["big"], "object")
+			# missing values are told apart from stored Nones
+			names = s.node_names()
+			mixed = dict(zip(names, s.rows("node")))
+			self.failUnless("mixed" in mixed["plain"])
+			self.failIf("mixed" in mixed[1])
+
+	def testEmpty(self):
+		for backend in (None, "compact"):
+			h = self.round_trip(self.build_graph(), backend=backend)
+			self.failUnlessEqual((h.order, h.size), (0, 0))
+
+	def testBadFiles(self):
+		out = BytesIO()
+		snapshot.save(self.g, out)
+		data = out.getvalue()
+		self.failUnlessRaises(snapshot.SnapshotError, snapshot.load, BytesIO(b""))
+		self.failUnlessRaises(snapshot.SnapshotError, snapshot.load, BytesIO(b"NOTASNAP" + data[8:]))
+		for length in range(0, len(data), 7):
+			self.failUnlessRaises(snapshot.SnapshotError, snapshot.load, BytesIO(data[:length]))
+		# and through a mapped file
+		fd, path = tempfile.mkstemp()
+		try:
+			for contents in (b"", data[:len(data) // 2]):
+				with open(path, "wb") as out:
+					out.write(contents)
+				self.failUnlessRaises(snapshot.SnapshotError, snapshot.load, path)
+			with open(path, "wb") as out:
+				out.write(data)
+			self.failUnlessSameGraph(self.g, snapshot.load(path))
+		finally:
+			os.close(fd)
+			os.remove(path)
+
+
 #################################################################################################################################
 #                                                       PERFORMANCE TESTS                                                       #
 #################################################################################################################################
@@ -2768,7 +4674,21 @@ if __name__ == "__main__":
 	TraversalTest = unittest.TestLoader().loadTestsFromTestCase(TraversalTest)
 	InductionTest = unittest.TestLoader().loadTestsFromTestCase(InductionTest)
 	ZeroNodeTest = unittest.TestLoader().loadTestsFromTestCase(ZeroNodeTest)
+	ConnectedComponentsTest = unittest.TestLoader().loadTestsFromTestCase(ConnectedComponentsTest)
+	StronglyConnectedTest = unittest.TestLoader().loadTestsFromTestCase(StronglyConnectedTest)
+	ShortestPathTreeTest = unittest.TestLoader().loadTestsFromTestCase(ShortestPathTreeTest)
+	ShortestPathTest = unittest.TestLoader().loadTestsFromTestCase(ShortestPathTest)
+	AStarTest = unittest.TestLoader().loadTestsFromTestCase(AStarTest)
+	MinimumSpanTest = unittest.TestLoader().loadTestsFromTestCase(MinimumSpanTest)
+	IndexTest = unittest.TestLoader().loadTestsFromTestCase(IndexTest)
+	QueryTest = unittest.TestLoader().loadTestsFromTestCase(QueryTest)
+	BulkConstructionTest = unittest.TestLoader().loadTestsFromTestCase(BulkConstructionTest)
+	SubgraphViewTest = unittest.TestLoader().loadTestsFromTestCase(SubgraphViewTest)
+	SnapshotTest = unittest.TestLoader().loadTestsFromTestCase(SnapshotTest)
+	BatchTest = unittest.TestLoader().loadTestsFromTestCase(BatchTest)
 	AdjacencyTest = unittest.TestLoader().loadTestsFromTestCase(AdjacencyTest)
+	AdjacencyOrderTest = unittest.TestLoader().loadTestsFromTestCase(AdjacencyOrderTest)
+	EdgeViewTest = unittest.TestLoader().loadTestsFromTestCase(EdgeViewTest)
 	OneNodeDirectedTest = unittest.TestLoader().loadTestsFromTestCase(OneNodeDirectedTest)
 	OneNodeUndirectedTest = unittest.TestLoader().loadTestsFromTestCase(OneNodeUndirectedTest)
 	OneNodeDoubleUndirectedTest = unittest.TestLoader().loadTestsFromTestCase(OneNodeDoubleUndirectedTest)
@@ -2778,8 +4698,42 @@ if __name__ == "__main__":
 	RemovalTest = unittest.TestLoader().loadTestsFromTestCase(RemovalTest)
 	OverwriteTest = unittest.TestLoader().loadTestsFromTestCase(OverwriteTest)
 	EdgeUnpackTest = unittest.TestLoader().loadTestsFromTestCase(EdgeUnpackTest)
+	CompactGraphTest = unittest.TestLoader().loadTestsFromTestCase(CompactGraphTest)
+	CompactNodeCreationTest = unittest.TestLoader().loadTestsFromTestCase(CompactNodeCreationTest)
+	CompactEdgeCreationTest = unittest.TestLoader().loadTestsFromTestCase(CompactEdgeCreationTest)
+	CompactAdjacencyTest = unittest.TestLoader().loadTestsFromTestCase(CompactAdjacencyTest)
+	CompactAdjacencyOrderTest = unittest.TestLoader().loadTestsFromTestCase(CompactAdjacencyOrderTest)
+	CompactEdgeViewTest = unittest.TestLoader().loadTestsFromTestCase(CompactEdgeViewTest)
+	CompactConnectedComponentsTest = unittest.TestLoader().loadTestsFromTestCase(CompactConnectedComponentsTest)
+	CompactStronglyConnectedTest = unittest.TestLoader().loadTestsFromTestCase(CompactStronglyConnectedTest)
+	CompactShortestPathTreeTest = unittest.TestLoader().loadTestsFromTestCase(CompactShortestPathTreeTest)
+	CompactShortestPathTest = unittest.TestLoader().loadTestsFromTestCase(CompactShortestPathTest)
+	CompactAStarTest = unittest.TestLoader().loadTestsFromTestCase(CompactAStarTest)
+	CompactMinimumSpanTest = unittest.TestLoader().loadTestsFromTestCase(CompactMinimumSpanTest)
+	CompactIndexTest = unittest.TestLoader().loadTestsFromTestCase(CompactIndexTest)
+	CompactQueryTest = unittest.TestLoader().loadTestsFromTestCase(CompactQueryTest)
+	CompactBulkConstructionTest = unittest.TestLoader().loadTestsFromTestCase(CompactBulkConstructionTest)
+	CompactSubgraphViewTest = unittest.TestLoader().loadTestsFromTestCase(CompactSubgraphViewTest)
+	CompactSnapshotTest = unittest.TestLoader().loadTestsFromTestCase(CompactSnapshotTest)
+	CompactBatchTest = unittest.TestLoader().loadTestsFromTestCase(CompactBatchTest)
+	GraphMLReaderTest = unittest.TestLoader().loadTestsFromTestCase(GraphMLReaderTest)
+	GraphMLWriterTest = unittest.TestLoader().loadTestsFromTestCase(GraphMLWriterTest)
+	DotTest = unittest.TestLoader().loadTestsFromTestCase(DotTest)
+	ConstructorsTest = unittest.TestLoader().loadTestsFromTestCase(ConstructorsTest)
+	SnapshotFileTest = unittest.TestLoader().loadTestsFromTestCase(SnapshotFileTest)
+	MappedGraphTest = unittest.TestLoader().loadTestsFromTestCase(MappedGraphTest)
+	CompactRemovalTest = unittest.TestLoader().loadTestsFromTestCase(CompactRemovalTest)
+	CompactOverwriteTest = unittest.TestLoader().loadTestsFromTestCase(CompactOverwriteTest)
+	CompactGraphSearchTest = unittest.TestLoader().loadTestsFromTestCase(CompactGraphSearchTest)
+	CompactEdgeMovementTest = unittest.TestLoader().loadTestsFromTestCase(CompactEdgeMovementTest)
+	CompactTraversalTest = unittest.TestLoader().loadTestsFromTestCase(CompactTraversalTest)
+	CompactInductionTest = unittest.TestLoader().loadTestsFromTestCase(CompactInductionTest)
+	CompactGraphCorrectnessTest = unittest.TestLoader().loadTestsFromTestCase(CompactGraphCorrectnessTest)
 	suites = [GraphCorrectnessTest, GraphCreationTest, NodeCreationTest, EdgeCreationTest, GraphPropertiesTest, GraphSearchTest, EdgeMovementTest, GetElementsTest]
 	suites += [ZeroNodeTest, RemovalTest, OverwriteTest, TraversalTest, InductionTest, GraphFailureTest, AdjacencyTest]
+	suites += [AdjacencyOrderTest, EdgeViewTest, ConnectedComponentsTest, StronglyConnectedTest]
+	suites += [ShortestPathTreeTest, ShortestPathTest, AStarTest, MinimumSpanTest, IndexTest, QueryTest]
+	suites += [BulkConstructionTest, SubgraphViewTest, SnapshotTest, BatchTest]
 	suites += [OneNodeDirectedTest]
 	suites += [OneNodeUndirectedTest]
 	suites += [OneNodeDoubleUndirectedTest]
@@ -2787,5 +4741,13 @@ if __name__ == "__main__":
 	suites += [TwoNodeUnconnectedTest]
 	suites += [ThreeNodeCycleTest]
 	suites += [EdgeUnpackTest]
+	suites += [CompactGraphTest, CompactNodeCreationTest, CompactEdgeCreationTest, CompactAdjacencyTest, CompactRemovalTest]
+	suites += [CompactOverwriteTest, CompactGraphSearchTest, CompactEdgeMovementTest, CompactTraversalTest]
+	suites += [CompactInductionTest, CompactGraphCorrectnessTest, CompactAdjacencyOrderTest, CompactEdgeViewTest]
+	suites += [CompactConnectedComponentsTest, CompactStronglyConnectedTest, CompactShortestPathTreeTest]
+	suites += [CompactShortestPathTest, CompactAStarTest, CompactMinimumSpanTest, CompactIndexTest, CompactQueryTest]
+	suites += [CompactBulkConstructionTest, CompactSubgraphViewTest, CompactSnapshotTest, CompactBatchTest]
+	suites += [MappedGraphTest]
+	suites += [GraphMLReaderTest, GraphMLWriterTest, DotTest, ConstructorsTest, SnapshotFileTest]
 	CorrectnessTest = unittest.TestSuite(suites)
 	unittest.main()
@@ -8,5 +8,5 @@ setup(name='Graphine backport',
     author='Dennis Bunskoek',
     author_email='dbunskoek@leukeleu.nl',
     url='http://www.graphine.org',
-    packages=['graph', 'graph.extras']
+    packages=['graph', 'graph.extras', 'graph.benchmarks']
 )